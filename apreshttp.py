@@ -1,15 +1,36 @@
 # Python wrapper for HTTP API to Control the ApRES Radar
+import asyncio
+import collections
+import concurrent.futures
 import datetime
+import functools
 import http
 import json
 import math
 import os
+import random
 import re
 import requests
+import requests.adapters
+import sqlite3
 import time
 import threading
+import urllib3.connection
+import urllib3.connectionpool
+import urllib3.exceptions
+import numpy
 from numpy import linspace
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class API:
     """
     Entry-point class for Python code to access HTTP ApRES API
@@ -23,7 +44,7 @@ class API:
     key to provided.
     """
 
-    def __init__(self, root):
+    def __init__(self, root, transport = None):
         """
         Initialise a new instance of the API specifying the root URL
 
@@ -38,31 +59,123 @@ class API:
         The root URL is sanitised by API.assignRootURL - see this for
         further information.
 
+        All requests made by the :py:class:`System`, :py:class:`Radar`
+        and :py:class:`Data` objects are routed through a single
+        :py:class:`Transport`, which keeps connections to the radar
+        alive between requests.  A transport with custom pool settings
+        can be provided, otherwise a default one is created.
+
         :param root: Root URL for the API to direct HTTP requests to
         :type root: str
+        :param transport: transport used for all HTTP requests
+        :type transport: :py:class:`Transport` or `None`
         """
 
         # Set root URL
         self.assignRootURL(root)
 
+        #: Persistent HTTP transport shared by all child objects
+        if transport == None:
+            transport = Transport()
+        elif not isinstance(transport, Transport):
+            raise TypeError("transport should be an instance of apreshttp.Transport")
+        self.transport = transport
+
         # Assign root objects
         self.system = System(self)
         self.radar = Radar(self)
         self.data = Data(self)
 
+        self.assignDefaults()
+
+    def assignDefaults(self):
+        """
+        Assign the default settings of a new API
+
+        Shared by :py:class:`API` and :py:class:`AsyncAPI`, and called
+        by their constructors once the root objects are assigned.
+        """
+
         # Assign default repeat requests/timeout
         self.timeout = 30 #: HTTP timeout in seconds
         self.wait = 1 #: wait time between consecutive HTTP requests
 
-        #: Interval between requests for results in seconds
-        self.resultsInterval = 2 
+        #: Interval between requests for results in seconds, if
+        #: :py:attr:`pollingStrategy` is `None`
+        self.resultsInterval = 2
+
+        #: :py:class:`PollingStrategy` used when waiting for results,
+        #: or `None` (the default) to poll every
+        #: :py:attr:`resultsInterval` seconds.  Assign an
+        #: :py:class:`AdaptivePolling` instance to opt in to polling
+        #: driven by the estimated burst completion time.
+        self.pollingStrategy = None
+
+        #: Maximum age in seconds of the cached radar config used
+        #: before bursts, results and config updates.  Defaults to 0,
+        #: which always refreshes; set a positive value (or `math.inf`
+        #: in hot loops) to opt in to the cache.
+        self.configCacheTTL = 0
+
+        #: Size in bytes of chunks written to disk during downloads
+        self.downloadChunkSize = 65536
+
+        #: Floating point dtype of trial burst chirp arrays
+        self.resultsDtype = numpy.float64
+
+        #: Function decoding JSON response bodies from bytes.  Uses
+        #: `orjson` if installed, which is several times faster for
+        #: large trial burst results, otherwise :py:func:`json.loads`
+        self.jsonDecoder = orjson.loads if orjson != None else json.loads
+
+        #: :py:class:`RetryPolicy` applied to failed requests, or `None`
+        self.retryPolicy = RetryPolicy()
+
+        #: :py:class:`CircuitBreaker` of this radar, or `None`
+        self.circuitBreaker = CircuitBreaker()
+
+        #: :py:class:`Catalog` recording status, config, results and
+        #: files read from the radar, or `None`
+        self.catalog = None
 
         # Whether to output debug commands
         self.debugEnable = False
-        self.requestCount = 0;
+        #: Number of requests made (see :py:meth:`nextRequestId`)
+        self.requestCount = 0
+        self.requestCountLock = threading.Lock()
+
+        #: Callables passed a :py:class:`RequestEvent` after each request
+        self.instruments = []
+
+        #: Per-route latency histograms of all requests made
+        self.latency = LatencyRecorder()
+        self.addInstrument(self.latency)
 
         self.apiKey = "INVALID"
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the transport and any pooled connections to the radar
+
+        After calling :py:meth:`close`, subsequent requests will open
+        new connections as required.  The API can also be used as a
+        context manager, in which case :py:meth:`close` is called on
+        exit, i.e.
+
+        .. code-block:: python
+
+            with apreshttp.API("http://radar.localnet") as api:
+                api.system.housekeeping.status()
+        """
+
+        self.transport.close()
+
     def debug(self, *args, **kwargs):
 
         """
@@ -78,6 +191,65 @@ class API:
         if self.debugEnable:
             print(*args, **kwargs)
 
+    def nextRequestId(self):
+        """
+        Increment :py:attr:`requestCount` and return the new value
+
+        The count is incremented under a lock, so that requests made
+        from several threads each receive a unique id.
+
+        :rtype: int
+        """
+
+        with self.requestCountLock:
+            self.requestCount += 1
+            return self.requestCount
+
+    def addInstrument(self, instrument):
+        """
+        Add a callable to be notified of every HTTP request
+
+        After each GET or POST request made by the API (including
+        failed requests) the instrument is called with a single
+        :py:class:`RequestEvent` argument describing the route, status,
+        size and timing of the request, i.e.
+
+        .. code-block:: python
+
+            def logRequest(event):
+                print(event.method, event.route, event.status, event.totalTime)
+
+            api.addInstrument(logRequest)
+
+        Instruments are called in the thread that made the request and
+        should return quickly.
+
+        :param instrument: callable accepting a :py:class:`RequestEvent`
+        :type instrument: callable
+        :raises TypeError: if `instrument` is not callable
+        """
+
+        if not callable(instrument):
+            raise TypeError("instrument should be callable")
+        self.instruments.append(instrument)
+
+    def removeInstrument(self, instrument):
+        """
+        Remove an instrument added with :py:meth:`addInstrument`
+
+        :raises ValueError: if the instrument was not added
+        """
+
+        self.instruments.remove(instrument)
+
+    def reportRequest(self, event):
+        """
+        Pass a :py:class:`RequestEvent` to each of the instruments
+        """
+
+        for instrument in self.instruments:
+            instrument(event)
+
     def setKey(self, key):
         """
         Sets the API key to be used during POST requests
@@ -131,13 +303,206 @@ class API:
 
         self.root = root
 
+class ConnectionTiming(threading.local):
+    """
+    Connection time of the current thread's request
+
+    Written by :py:class:`TimedHTTPConnection` when a new connection
+    is opened, and reset by :py:class:`APIChild` before each request.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        #: Seconds spent resolving the host name and opening the connection
+        self.connectTime = 0.0
+        #: Whether a new connection was opened (rather than reused)
+        self.newConnection = False
+
+class ConnectionTimer:
+    """
+    Mixin for urllib3 connections which times opening the connection
+
+    The public `connect` method is timed, so the time covers resolving
+    the host name, opening the TCP connection and any TLS handshake.
+    Times are written to the :py:class:`ConnectionTiming` passed by
+    the connection pool as the `connectionTiming` keyword argument.
+    """
+
+    def __init__(self, *args, connectionTiming = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connectionTiming = connectionTiming
+
+    def connect(self):
+
+        timing = self.connectionTiming
+        if timing == None:
+            return super().connect()
+
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            timing.connectTime += time.perf_counter() - start
+            timing.newConnection = True
+
+class TimedHTTPConnection(ConnectionTimer, urllib3.connection.HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(ConnectionTimer, urllib3.connection.HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(urllib3.connectionpool.HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(urllib3.connectionpool.HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter whose connections record their connection times
+
+    Times are written to `connectionTiming`.
+    """
+
+    def __init__(self, connectionTiming, *args, **kwargs):
+        #: :py:class:`ConnectionTiming` written by new connections
+        self.connectionTiming = connectionTiming
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Extra pool arguments are passed on to new connections
+        self.poolmanager.pool_classes_by_scheme = {
+            "http" : functools.partial(TimedHTTPConnectionPool, connectionTiming = self.connectionTiming),
+            "https" : functools.partial(TimedHTTPSConnectionPool, connectionTiming = self.connectionTiming)
+        }
+
+class Transport:
+    """
+    Persistent HTTP transport with a keep-alive connection pool
+
+    The Transport class wraps a :py:class:`requests.Session` so that
+    TCP connections to the radar are reused between consecutive GET
+    and POST requests, rather than a new connection being opened for
+    every status poll or directory page.
+
+    The `poolConnections` parameter sets the number of hosts for which
+    connection pools are cached, while `poolMaxSize` sets the maximum
+    number of connections kept alive to each host.  If `poolBlock` is
+    enabled then requests wait for a free connection rather than
+    opening a connection beyond `poolMaxSize`, which limits the load
+    on the radar's embedded web server.
+
+    Connection times of new connections, including the DNS lookup,
+    are recorded in :py:attr:`connectionTiming` for
+    :py:class:`RequestEvent` reports.
+    """
+
+    def __init__(self, poolConnections = 1, poolMaxSize = 4, poolBlock = False):
+        """
+        Create a new transport with the given pool settings
+
+        :param poolConnections: number of per-host connection pools to cache
+        :type poolConnections: int
+        :param poolMaxSize: maximum number of connections kept alive per host
+        :type poolMaxSize: int
+        :param poolBlock: block when no pooled connection is free, rather than open a new one
+        :type poolBlock: boolean
+        :raises ValueError: if the pool sizes are not positive integers
+        """
+
+        if not isinstance(poolConnections, int) or poolConnections < 1:
+            raise ValueError("poolConnections should be a positive int")
+        if not isinstance(poolMaxSize, int) or poolMaxSize < 1:
+            raise ValueError("poolMaxSize should be a positive int")
+
+        #: Number of per-host connection pools to cache
+        self.poolConnections = poolConnections
+        #: Maximum number of connections kept alive per host
+        self.poolMaxSize = poolMaxSize
+        #: Whether requests block waiting for a free pooled connection
+        self.poolBlock = bool(poolBlock)
+        #: :py:class:`ConnectionTiming` of the current thread's request
+        self.connectionTiming = ConnectionTiming()
+
+        self.lock = threading.Lock()
+        self.session = None
+        self.open()
+
+    def open(self):
+        """
+        Create the underlying session and mount the pooled adapter
+
+        Called automatically by the constructor, and by :py:meth:`get`
+        or :py:meth:`post` if the transport has been closed.
+        """
+
+        adapter = TimedHTTPAdapter(
+            self.connectionTiming,
+            pool_connections = self.poolConnections,
+            pool_maxsize = self.poolMaxSize,
+            pool_block = self.poolBlock
+        )
+
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.session = session
+
+    def close(self):
+        """
+        Close all pooled connections held by the transport
+        """
+
+        with self.lock:
+            if self.session != None:
+                self.session.close()
+                self.session = None
+
+    def currentSession(self):
+        """
+        Return the session, opening it if the transport was closed
+
+        The session is shared by all threads using the transport, and
+        is opened under a lock so that only one session is created.
+
+        :rtype: :py:class:`requests.Session`
+        """
+
+        with self.lock:
+            if self.session == None:
+                self.open()
+            return self.session
+
+    def get(self, url, *args, **kwargs):
+        """
+        Perform a GET request using the pooled session
+
+        Arguments are passed to :py:meth:`requests.Session.get`.
+        """
+
+        return self.currentSession().get(url, *args, **kwargs)
+
+    def post(self, url, *args, **kwargs):
+        """
+        Perform a POST request using the pooled session
+
+        Arguments are passed to :py:meth:`requests.Session.post`.
+        """
+
+        return self.currentSession().post(url, *args, **kwargs)
+
 class APIChild:
     """
     APIChild objects provide wrappers for POST and GET requests
 
-    APIChild objects wrap the :py:func:`requests.get` and
-    :py:func:`requests.post` methods to build classes to support the
-    implementation of calls of GET and POST API methods.
+    APIChild objects wrap the :py:meth:`Transport.get` and
+    :py:meth:`Transport.post` methods to build classes to support the
+    implementation of calls of GET and POST API methods.  All children
+    of the same :py:class:`API` object share its transport.
     """
 
     def __init__(self, api_obj):
@@ -195,17 +560,19 @@ class APIChild:
         elif "apikey" not in data_obj.keys():
             data_obj["apikey"] = self.api.apiKey
 
-        self.api.requestCount = self.api.requestCount + 1;
+        requestId = self.api.nextRequestId()
 
         if self.api.debugEnable:
-            data_obj["requestid"] = self.api.requestCount
+            data_obj["requestid"] = requestId
 
         self.api.debug("POST request to [{url:s}] with data:".format(url=completeUrl))
         self.api.debug(data_obj)
 
         # Create request object
         if files_obj == None:
-            response = requests.post(
+            response = self.sendRequest(
+                "POST",
+                url,
                 completeUrl,
                 data = data_obj,
                 timeout = self.api.timeout,
@@ -214,7 +581,9 @@ class APIChild:
             )
         else:
         # If files is set then add that
-            response = requests.post(
+            response = self.sendRequest(
+                "POST",
+                url,
                 completeUrl,
                 data = data_obj,
                 files = files_obj,
@@ -262,19 +631,23 @@ class APIChild:
         if data_obj == None:
             data_obj = dict()
 
-        self.api.requestCount += 1;
+        requestId = self.api.nextRequestId()
 
         if self.api.debugEnable:
-            data_obj["requestid"] = self.api.requestCount
+            data_obj["requestid"] = requestId
 
         self.api.debug("GET request to [{url:s}] with data:".format(url=completeUrl))
         self.api.debug(data_obj)
 
         # Create request object
-        response = requests.get(
+        response = self.sendRequest(
+            "GET",
+            url,
             completeUrl,
             params = data_obj,
-            timeout = self.api.timeout
+            timeout = self.api.timeout,
+            *args,
+            **kwargs
         )
 
         self.api.debug(response.url)
@@ -285,6 +658,119 @@ class APIChild:
 
         return response
 
+    def sendRequest(self, method, route, completeUrl, *args, **kwargs):
+        """
+        Make a request through the transport, retrying if it fails
+
+        Failed requests are retried as allowed by
+        :py:attr:`API.retryPolicy`, and are refused without being
+        made while the :py:attr:`API.circuitBreaker` is open.  A
+        :py:class:`RequestEvent` is passed to
+        :py:meth:`API.reportRequest` for each attempt, whether or not
+        it succeeds.  Arguments after `completeUrl` are passed to
+        :py:meth:`Transport.get` or :py:meth:`Transport.post`.
+
+        :param method: HTTP method, "GET" or "POST"
+        :type method: str
+        :param route: API route, i.e. radar/results
+        :type route: str
+        :param completeUrl: URL formed by :py:meth:`formCompleteURL`
+        :type completeUrl: str
+        :raises CircuitOpenException: if the circuit breaker is open
+        :rtype: :py:class:`requests.Response`
+        """
+
+        policy = self.api.retryPolicy
+        breaker = self.api.circuitBreaker
+        attempt = 0
+
+        while True:
+
+            if breaker != None:
+                breaker.check()
+
+            try:
+                response = self.__attempt(method, route, completeUrl, attempt, *args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if breaker != None:
+                    # Only a failure to connect or respond counts towards
+                    # opening the breaker
+                    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+                        breaker.recordFailure()
+                    else:
+                        breaker.release()
+                if policy == None or not policy.shouldRetry(method, attempt, exception = e):
+                    raise
+                delay = policy.delay(attempt)
+            except BaseException:
+                if breaker != None:
+                    breaker.release()
+                raise
+            else:
+                if breaker != None:
+                    breaker.recordSuccess()
+                if policy == None or not policy.shouldRetry(method, attempt, status = response.status_code):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+
+            self.api.debug("{} {} failed, retrying in {:.2f}s".format(method, route, delay))
+            time.sleep(delay)
+            attempt += 1
+
+    def __attempt(self, method, route, completeUrl, attempt, *args, **kwargs):
+        """
+        Make a single request and report it to instruments
+        """
+
+        event = RequestEvent(route, method, completeUrl)
+        event.streamed = kwargs.get("stream", False)
+        event.retries = attempt
+        timing = self.api.transport.connectionTiming
+        timing.reset()
+
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                response = self.api.transport.post(completeUrl, *args, **kwargs)
+            else:
+                response = self.api.transport.get(completeUrl, *args, **kwargs)
+        except Exception as e:
+            event.error = e
+            raise
+        else:
+            event.load(response)
+        finally:
+            event.totalTime = time.perf_counter() - start
+            event.connectTime = timing.connectTime
+            event.newConnection = timing.newConnection
+            if event.error == None:
+                event.waitTime = max(0.0, event.headersTime - event.connectTime)
+                event.transferTime = max(0.0, event.totalTime - event.headersTime)
+            self.api.reportRequest(event)
+
+        return response
+
+    def readJSON(self, response):
+        """
+        Return the decoded JSON body of a response, decoding it only once
+
+        The body is decoded by :py:attr:`API.jsonDecoder` and the
+        decoded object is stored on the response as `parsedJSON`, so
+        that :py:meth:`validateResponse` and the methods reading the
+        response share a single decode of the body.
+
+        :param response: response returned from :py:meth:`getRequest` or :py:meth:`postRequest`
+        :type response: request.response object
+        :raises ValueError: if the body is not valid JSON
+        """
+
+        try:
+            return response.parsedJSON
+        except AttributeError:
+            response.parsedJSON = self.api.jsonDecoder(response.content)
+            return response.parsedJSON
+
     def validateResponse(self, response):
         """
         Takes a `requests.response` object and handles common errors
@@ -305,7 +791,7 @@ class APIChild:
         # Check  we have a JSON object
         if "Content-Type" in response.headers.keys() and response.headers["Content-Type"] == "application/json":
             # Default checking GET and POST requests
-            response_json = response.json()
+            response_json = self.readJSON(response)
             if "errorCode" in response_json or "errorMessage" in response_json:
                 if response_json['errorCode'] == 401:
                     raise InvalidAPIKeyException(response_json['errorMessage'])
@@ -333,136 +819,672 @@ class APIChild:
         return self.api.root + "/api/" + url_part
 
 ################################################################################
-# SYSTEM
+# RETRIES
 ################################################################################
 
-class System(APIChild):
+class RetryPolicy:
+    """
+    Policy for retrying failed requests with exponential backoff
+
+    GET requests are idempotent, so they are retried after any
+    connection error or timeout, and after a response with one of the
+    `retryStatus` codes (i.e. 503 when the radar is busy).  POST
+    requests start bursts and change settings, so by default they are
+    only retried if the connection could not be opened, in which case
+    the request cannot have reached the radar.  Enable `retryPost` to
+    retry POST requests in the same way as GET requests.
+
+    The delay before retry `n` (counting from 0) is
+    `backoff * 2 ** n`, limited to `maxBackoff` and reduced by a
+    random fraction of up to `jitter` so that many clients do not
+    retry in step.  A `Retry-After` header is honoured up to
+    `maxBackoff`.
+
+    Assign an instance to :py:attr:`API.retryPolicy`, or `None` to
+    disable retries.
     """
-    System wraps system-related API methods
 
-    System provides a wrapper for the system-related functions exposed
-    by the ApRES HTTP API.  This includes
+    def __init__(self, retries = 2, backoff = 0.5, maxBackoff = 10, jitter = 0.5, retryPost = False, retryStatus = (502, 503, 504)):
+        """
+        :param retries: maximum number of retries of each request
+        :type retries: int
+        :param backoff: delay before the first retry in seconds
+        :type backoff: float
+        :param maxBackoff: longest delay between retries in seconds
+        :type maxBackoff: float
+        :param jitter: largest fraction by which each delay is randomly reduced
+        :type jitter: float
+        :param retryPost: retry POST requests which may have reached the radar
+        :type retryPost: boolean
+        :param retryStatus: HTTP status codes after which GET requests are retried
+        :type retryStatus: tuple
+        :raises ValueError: if any of the arguments are out of range
+        """
 
-    * system/reset
-    * system/housekeeping/config
-    * system/housekeeping/status
-    """
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError("retries should be a non-negative int")
+        if backoff < 0 or maxBackoff < backoff:
+            raise ValueError("Require 0 <= backoff <= maxBackoff")
+        if jitter < 0 or jitter > 1:
+            raise ValueError("jitter should be in the range [0, 1]")
+
+        #: Maximum number of retries of each request
+        self.retries = retries
+        #: Delay before the first retry in seconds
+        self.backoff = backoff
+        #: Longest delay between retries in seconds
+        self.maxBackoff = maxBackoff
+        #: Largest fraction by which each delay is randomly reduced
+        self.jitter = jitter
+        #: Whether POST requests which may have reached the radar are retried
+        self.retryPost = retryPost
+        #: HTTP status codes after which GET requests are retried
+        self.retryStatus = tuple(retryStatus)
+
+    def shouldRetry(self, method, attempt, exception = None, status = None):
+        """
+        Decide whether to retry a request
+
+        :param method: HTTP method, "GET" or "POST"
+        :type method: str
+        :param attempt: number of retries already made
+        :type attempt: int
+        :param exception: exception raised by the request, if any
+        :type exception: Exception
+        :param status: HTTP status code of the response, if any
+        :type status: int
+        :rtype: boolean
+        """
 
-    def __init__(self, api_obj):
-        # Call super constructor
-        super().__init__(api_obj)
+        if attempt >= self.retries:
+            return False
 
-        # Create housekeeping sub object
-        self.housekeeping = self.Housekeeping(api_obj)
+        idempotent = method == "GET" or self.retryPost
 
-    # System reset
-    def reset(self):
-        """
-        Reset the ApRES
+        if exception != None:
+            return idempotent or not self.requestSent(exception)
 
-        Requires a valid API key to be assigned to the API object to
-        perform the reset operation.
+        return idempotent and status in self.retryStatus
 
-        No guarantee of a reset can be made, but upon successful
-        reception of the request a
-        :py:class:`apreshttp.System.ResetMessage` object is returned.
+    def requestSent(self, exception):
+        """
+        Check whether a failed request may have reached the radar
 
-        :raises BadResponseException: If the response is malformed or unexpected.
+        Returns `False` only if the connection could not be opened.
+
+        :rtype: boolean
         """
 
-        # Get response
-        response = self.postRequest("system/reset")
-        # Check the status code is 202 (i.e. don't wait...)
-        if response.status_code != 202:
-            raise SystemResetException
-        else:
-            # Strip message and time from response
-            response_json = response.json()
+        if isinstance(exception, requests.exceptions.ConnectTimeout):
+            return False
 
-            if not "message" in response_json:
-                raise BadResponseException("No message key in response.")
-            msg = response_json["message"]
+        if isinstance(exception, requests.exceptions.ConnectionError):
+            reason = exception.args[0] if len(exception.args) > 0 else None
+            reason = getattr(reason, "reason", reason)
+            return not isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
 
-            if not "time" in response_json:
-                raise BadResponseException("No time key in response.")
-            time = datetime.datetime.strptime(
-                response_json["time"],
-                "%Y-%m-%d %H:%M:%S"
-            )
+        if aiohttp != None and isinstance(exception, aiohttp.ClientConnectorError):
+            return False
 
-        return self.ResetMessage(msg, time)
+        return True
 
-    class ResetMessage:
-        """
-        Utility class to contain message and time from reset action
+    def delay(self, attempt, retryAfter = None):
         """
-        def __init__(self, msg, time):
-            #: Reset message, including timestamp.
-            self.message = (msg)
-            #: Datetime object representing time of reset
-            self.time = (time)
+        Return the delay in seconds before retry number `attempt`
 
-    class Housekeeping(APIChild):
+        :param attempt: number of retries already made
+        :type attempt: int
+        :param retryAfter: value of a Retry-After response header, if any
+        :type retryAfter: str
+        :rtype: float
         """
-        Housekeeping encapsulates system config and status methods
 
-        The Housekeeping object should be a child of the System object
-        and exposes methods to download the configuration file, upload
-        and new configuration file or retrieve the radar system status,
-        packaged in a :py:class:apreshttp.System.Housekeeping` object.
+        delay = min(self.maxBackoff, self.backoff * 2 ** attempt)
+        delay *= 1 - self.jitter * random.random()
+
+        if retryAfter != None:
+            try:
+                delay = max(delay, min(self.maxBackoff, float(retryAfter)))
+            except ValueError:
+                pass
+
+        return delay
+
+class CircuitBreaker:
+    """
+    Fail fast while a radar is unreachable
+
+    After `failureThreshold` consecutive requests fail to connect or
+    time out, the breaker opens and requests raise a
+    :py:class:`CircuitOpenException` immediately, rather than each
+    waiting up to :py:attr:`API.timeout` seconds.  After
+    `resetTimeout` seconds a single trial request is allowed through
+    (the breaker is "half-open"); if it succeeds the breaker closes,
+    otherwise it opens again.  A request which ends any other way,
+    i.e. with an unrelated error or by being interrupted, is neither
+    a success nor a failure, and is passed to :py:meth:`release` so
+    that a new trial can be made.
+
+    Each :py:class:`API` has its own breaker, assigned to
+    :py:attr:`API.circuitBreaker` (or `None` to disable it).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
 
+    def __init__(self, failureThreshold = 5, resetTimeout = 30):
+        """
+        :param failureThreshold: consecutive failures after which the breaker opens
+        :type failureThreshold: int
+        :param resetTimeout: seconds after opening before a trial request is allowed
+        :type resetTimeout: float
+        :raises ValueError: if failureThreshold is not a positive int
         """
 
-        def __init__(self, api_obj):
-            self.api = api_obj
-            self.config = self.Config(api_obj)
+        if not isinstance(failureThreshold, int) or failureThreshold < 1:
+            raise ValueError("failureThreshold should be a positive int")
 
-        def status(self):
-            """
-            Request an update on the ApRES battery, tiem, GPS, etc.
+        #: Consecutive failures after which the breaker opens
+        self.failureThreshold = failureThreshold
+        #: Seconds after opening before a trial request is allowed
+        self.resetTimeout = resetTimeout
 
-            Perform a GET request to system/housekeeping/status and
-            wrap the response as a
-            :py:class:`apreshttp.System.Housekeeping.Status` object.
+        #: Current state, :py:attr:`CLOSED`, :py:attr:`OPEN` or :py:attr:`HALF_OPEN`
+        self.state = self.CLOSED
+        #: Number of consecutive failed requests
+        self.failures = 0
 
-            :raises BadResponseException: if the response is malformed or missing information.
-            :return: If valid a :py:class:`apreshttp.System.Housekeeping.Status` object is returned
+        self.openedAt = None
+        self.lock = threading.Lock()
 
-            """
-            # Get response
-            response = self.getRequest("system/housekeeping/status")
-            # Check that the status code is 200
-            if response.status_code != 200:
-                raise SystemHousekeepingException(
-                "Unexpected status code: {stat:d}".format(stat=response.status_code))
-            else:
-                # Convert response body to JSON
-                response_json = response.json()
+    def __repr__(self):
+        return "CircuitBreaker(state = {}, failures = {:d})".format(self.state, self.failures)
 
-                self.api.debug(response.text)
+    def check(self):
+        """
+        Check whether a request may be made
 
-                # Check response has valid components
-                if not "batteryVoltage" in response_json:
-                    raise BadResponseException("No batteryVoltage key in response.")
-                if not "timeGPS" in response_json:
-                    raise BadResponseException("No timeGPS key in response.")
-                if not "timeVAB" in response_json:
-                    raise BadResponseException("No timeVAB key in response.")
-                if not "latitude" in response_json:
-                    raise BadResponseException("No latitude key in response.")
-                if not "longitude" in response_json:
-                    raise BadResponseException("No longitude key in response.")
+        :raises CircuitOpenException: if the breaker is open, or a trial request is already in progress
+        """
 
-                return self.Status(
-                    response_json["batteryVoltage"],
-                    response_json["timeGPS"],
-                    response_json["timeVAB"],
-                    response_json["latitude"],
-                    response_json["longitude"],
+        with self.lock:
+            if self.state == self.CLOSED:
+                return
+
+            if self.state == self.OPEN and time.monotonic() - self.openedAt >= self.resetTimeout:
+                # Allow this request through as a trial
+                self.state = self.HALF_OPEN
+                return
+
+            raise CircuitOpenException(
+                "Radar unreachable after {:d} failed requests, retrying in {:.0f}s".format(
+                    self.failures, max(0, self.resetTimeout - (time.monotonic() - self.openedAt))
                 )
+            )
 
-        class Status:
-            """
+    def recordSuccess(self):
+        """
+        Record a request which received a response, closing the breaker
+        """
+
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.openedAt = None
+
+    def recordFailure(self):
+        """
+        Record a request which failed to connect or timed out
+        """
+
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failureThreshold:
+                self.state = self.OPEN
+                self.openedAt = time.monotonic()
+
+    def release(self):
+        """
+        Record a request which neither connected nor failed to
+
+        If the request was the half-open trial, the breaker opens
+        again without restarting the reset timeout, so the next
+        request is allowed through as a new trial.
+        """
+
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def reset(self):
+        """
+        Close the breaker, allowing requests to be made again
+        """
+
+        self.recordSuccess()
+
+################################################################################
+# INSTRUMENTATION
+################################################################################
+
+class RequestEvent:
+    """
+    Description of a single HTTP request, passed to API instruments
+
+    Times are in seconds and are `None` if they were not measured,
+    i.e. for failed requests or those made by :py:class:`AsyncAPI`.
+    For a request made on a reused connection the connection time is
+    zero.  `waitTime` covers sending the request and
+    waiting for the response headers, and `transferTime` covers
+    reading the response body (which is not included for streamed
+    downloads).
+    """
+
+    def __init__(self, route, method, url):
+
+        #: API route, i.e. radar/results
+        self.route = route
+        #: HTTP method, "GET" or "POST"
+        self.method = method
+        #: Complete URL requested
+        self.url = url
+        #: Time at which the request was made (seconds since the epoch)
+        self.timestamp = time.time()
+
+        #: HTTP status code, or `None` if no response was received
+        self.status = None
+        #: Size of the request body in bytes
+        self.requestBytes = None
+        #: Size of the response body in bytes
+        self.responseBytes = None
+        #: Whether the response body was streamed rather than read
+        self.streamed = False
+
+        #: Whether a new connection was opened for the request
+        self.newConnection = None
+        #: Time spent resolving the radar host name and opening a connection
+        self.connectTime = None
+        #: Time until the response headers were received
+        self.headersTime = None
+        #: Time spent sending the request and waiting for the headers
+        self.waitTime = None
+        #: Time spent reading the response body
+        self.transferTime = None
+        #: Total time of the request
+        self.totalTime = None
+
+        #: Number of times the request was retried
+        self.retries = 0
+        #: Exception raised by the request, if any
+        self.error = None
+
+    def __repr__(self):
+        return "RequestEvent({} {}, status = {}, totalTime = {})".format(
+            self.method, self.route, self.status, self.totalTime
+        )
+
+    def load(self, response):
+        """
+        Read the status, sizes and header time from a response
+
+        :param response: response to the request
+        :type response: :py:class:`requests.Response`
+        """
+
+        self.status = response.status_code
+        self.headersTime = response.elapsed.total_seconds()
+
+        body = response.request.body
+        if body == None:
+            self.requestBytes = 0
+        elif isinstance(body, str):
+            self.requestBytes = len(body.encode("utf-8"))
+        else:
+            self.requestBytes = len(body)
+
+        if self.streamed:
+            length = response.headers.get("Content-Length")
+            self.responseBytes = int(length) if length != None else None
+        else:
+            self.responseBytes = len(response.content)
+
+class LatencyHistogram:
+    """
+    Histogram of request durations with logarithmically spaced bins
+
+    Bin upper bounds double from 1 ms up to about 65 s, with a final
+    bin for anything longer.  Percentiles are estimated as the upper
+    bound of the bin containing the percentile, limited to the
+    largest duration recorded.
+    """
+
+    #: Upper bound of each bin in seconds
+    BOUNDS = tuple(0.001 * 2 ** i for i in range(17))
+
+    def __init__(self):
+        #: Number of durations in each bin (the last bin is unbounded)
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        #: Number of durations recorded
+        self.count = 0
+        #: Sum of durations recorded
+        self.total = 0.0
+        #: Shortest duration recorded
+        self.min = None
+        #: Longest duration recorded
+        self.max = None
+
+    def __repr__(self):
+        return "LatencyHistogram(count = {:d}, mean = {}, p95 = {})".format(
+            self.count, self.mean, self.percentile(95)
+        )
+
+    @property
+    def mean(self):
+        """Mean duration in seconds, or `None` if empty"""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def copy(self):
+        """
+        Return an independent copy of the histogram
+
+        :rtype: :py:class:`LatencyHistogram`
+        """
+
+        histogram = LatencyHistogram()
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.total = self.total
+        histogram.min = self.min
+        histogram.max = self.max
+        return histogram
+
+    def add(self, seconds):
+        """
+        Record a duration in seconds
+        """
+
+        index = 0
+        while index < len(self.BOUNDS) and seconds > self.BOUNDS[index]:
+            index += 1
+        self.counts[index] += 1
+
+        self.count += 1
+        self.total += seconds
+        if self.min == None or seconds < self.min:
+            self.min = seconds
+        if self.max == None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """
+        Estimate the `p` th percentile duration in seconds
+
+        :param p: percentile in the range 0 to 100
+        :type p: float
+        :return: estimated duration, or `None` if empty
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                break
+
+        if index < len(self.BOUNDS):
+            return min(self.BOUNDS[index], self.max)
+        return self.max
+
+class LatencyRecorder:
+    """
+    Instrument recording a :py:class:`LatencyHistogram` for each route
+
+    An instance is added to every :py:class:`API` as
+    :py:attr:`API.latency`, so per-route statistics are always
+    available, i.e.
+
+    .. code-block:: python
+
+        for route, stats in api.latency.summary().items():
+            print(route, stats["count"], stats["totalTime"], stats["bytes"])
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, event):
+        with self.lock:
+            if not event.route in self.histograms:
+                self.histograms[event.route] = LatencyHistogram()
+                self.bytes[event.route] = 0
+                self.errors[event.route] = 0
+
+            if event.error != None:
+                self.errors[event.route] += 1
+            else:
+                self.histograms[event.route].add(event.totalTime)
+                self.bytes[event.route] += (event.requestBytes or 0) + (event.responseBytes or 0)
+
+    def reset(self):
+        """
+        Discard all recorded requests
+        """
+
+        with self.lock:
+            #: Dictionary of :py:class:`LatencyHistogram` keyed by route
+            self.histograms = dict()
+            #: Dictionary of request and response body bytes keyed by route
+            self.bytes = dict()
+            #: Dictionary of failed request counts keyed by route
+            self.errors = dict()
+
+    def histogram(self, route):
+        """
+        Return a copy of the :py:class:`LatencyHistogram` of a route
+
+        The copy is taken under the lock, so it is consistent and is
+        not changed by requests made afterwards.
+
+        :return: histogram, or `None` if no requests were made to the route
+        """
+
+        with self.lock:
+            histogram = self.histograms.get(route)
+            if histogram == None:
+                return None
+            return histogram.copy()
+
+    def summary(self):
+        """
+        Return a dictionary of request statistics keyed by route
+
+        Each value is a dictionary with the keys count, errors,
+        totalTime, mean, p50, p95, max and bytes, with durations in
+        seconds.  Routes are ordered by decreasing total time.
+        """
+
+        with self.lock:
+            summary = dict()
+            for route, hist in self.histograms.items():
+                summary[route] = {
+                    "count" : hist.count,
+                    "errors" : self.errors[route],
+                    "totalTime" : hist.total,
+                    "mean" : hist.mean,
+                    "p50" : hist.percentile(50),
+                    "p95" : hist.percentile(95),
+                    "max" : hist.max,
+                    "bytes" : self.bytes[route]
+                }
+
+        return dict(sorted(summary.items(), key = lambda item: -item[1]["totalTime"]))
+
+################################################################################
+# SYSTEM
+################################################################################
+
+class System(APIChild):
+    """
+    System wraps system-related API methods
+
+    System provides a wrapper for the system-related functions exposed
+    by the ApRES HTTP API.  This includes
+
+    * system/reset
+    * system/housekeeping/config
+    * system/housekeeping/status
+    """
+
+    def __init__(self, api_obj):
+        # Call super constructor
+        super().__init__(api_obj)
+
+        # Create housekeeping sub object
+        self.housekeeping = self.Housekeeping(api_obj)
+
+    # System reset
+    def reset(self):
+        """
+        Reset the ApRES
+
+        Requires a valid API key to be assigned to the API object to
+        perform the reset operation.
+
+        No guarantee of a reset can be made, but upon successful
+        reception of the request a
+        :py:class:`apreshttp.System.ResetMessage` object is returned.
+
+        :raises BadResponseException: If the response is malformed or unexpected.
+        """
+
+        # Get response
+        response = self.postRequest("system/reset")
+        self.api.radar.config.invalidate()
+        return self.readResetMessage(response)
+
+    def readResetMessage(self, response):
+        """
+        Read a response to system/reset into a ResetMessage
+
+        :raises SystemResetException: If the status code is not 202.
+        :raises BadResponseException: If the response is malformed or unexpected.
+        :rtype: :py:class:`apreshttp.System.ResetMessage`
+        """
+
+        # Check the status code is 202 (i.e. don't wait...)
+        if response.status_code != 202:
+            raise SystemResetException
+        else:
+            # Strip message and time from response
+            response_json = self.readJSON(response)
+
+            if not "message" in response_json:
+                raise BadResponseException("No message key in response.")
+            msg = response_json["message"]
+
+            if not "time" in response_json:
+                raise BadResponseException("No time key in response.")
+            time = datetime.datetime.strptime(
+                response_json["time"],
+                "%Y-%m-%d %H:%M:%S"
+            )
+
+        return self.ResetMessage(msg, time)
+
+    class ResetMessage:
+        """
+        Utility class to contain message and time from reset action
+        """
+        def __init__(self, msg, time):
+            #: Reset message, including timestamp.
+            self.message = (msg)
+            #: Datetime object representing time of reset
+            self.time = (time)
+
+    class Housekeeping(APIChild):
+        """
+        Housekeeping encapsulates system config and status methods
+
+        The Housekeeping object should be a child of the System object
+        and exposes methods to download the configuration file, upload
+        and new configuration file or retrieve the radar system status,
+        packaged in a :py:class:apreshttp.System.Housekeeping` object.
+
+        """
+
+        def __init__(self, api_obj):
+            self.api = api_obj
+            self.config = self.Config(api_obj)
+
+        def status(self):
+            """
+            Request an update on the ApRES battery, tiem, GPS, etc.
+
+            Perform a GET request to system/housekeeping/status and
+            wrap the response as a
+            :py:class:`apreshttp.System.Housekeeping.Status` object.
+
+            :raises BadResponseException: if the response is malformed or missing information.
+            :return: If valid a :py:class:`apreshttp.System.Housekeeping.Status` object is returned
+
+            """
+            # Get response
+            response = self.getRequest("system/housekeeping/status")
+            return self.readStatus(response)
+
+        def readStatus(self, response):
+            """
+            Read a response to system/housekeeping/status into a Status
+
+            :raises SystemHousekeepingException: if the status code is not 200.
+            :raises BadResponseException: if the response is malformed or missing information.
+            :return: :py:class:`apreshttp.System.Housekeeping.Status` object
+            """
+            # Check that the status code is 200
+            if response.status_code != 200:
+                raise SystemHousekeepingException(
+                "Unexpected status code: {stat:d}".format(stat=response.status_code))
+            else:
+                # Convert response body to JSON
+                response_json = self.readJSON(response)
+
+                if self.api.debugEnable:
+                    self.api.debug(response.text)
+
+                # Check response has valid components
+                if not "batteryVoltage" in response_json:
+                    raise BadResponseException("No batteryVoltage key in response.")
+                if not "timeGPS" in response_json:
+                    raise BadResponseException("No timeGPS key in response.")
+                if not "timeVAB" in response_json:
+                    raise BadResponseException("No timeVAB key in response.")
+                if not "latitude" in response_json:
+                    raise BadResponseException("No latitude key in response.")
+                if not "longitude" in response_json:
+                    raise BadResponseException("No longitude key in response.")
+
+                status = self.Status(
+                    response_json["batteryVoltage"],
+                    response_json["timeGPS"],
+                    response_json["timeVAB"],
+                    response_json["latitude"],
+                    response_json["longitude"],
+                )
+
+                if self.api.catalog != None:
+                    self.api.catalog.recordStatus(self.api.root, status)
+
+                return status
+
+        class Status:
+            """
             Utility class for representing the ApRES system status.
             """
             def __init__(self, batVoltage, timeGPS, timeVAB, lat, long):
@@ -615,6 +1637,7 @@ class System(APIChild):
                         data_obj = None,
                         files_obj = fileDict
                     )
+                    self.api.radar.config.invalidate()
 
                     if response.status_code == 400:
                         raise NoFileUploadedError
@@ -636,8 +1659,16 @@ class Radar(APIChild):
 
     VALID_BURST_STATUS_CODE = 303;
 
+    #: Maximum number of threads shared by all results polls made with `wait = False`
+    RESULTS_WORKERS = 16
+
+    resultsExecutor = None
+    resultsExecutorLock = threading.Lock()
+
     def __init__(self, api_obj):
         super().__init__(api_obj);
+        #: Type of the last burst started, "trial", "burst" or `None`
+        self.burstType = None
         # Create child of type Config
         #: Instance of a Radar.Config object which gets and sets the radar chirp config.
         self.config = self.Config(api_obj)
@@ -681,7 +1712,7 @@ class Radar(APIChild):
         :type param: callable
         :param updateCallback: callback function executed on each results request (to provide progress updates)
         :type updateCallback: callable
-        :param wait: If callback is provided, should the function halt execution or wait in a seperate thread
+        :param wait: If False, return a :py:class:`concurrent.futures.Future` of the results immediately (see :py:meth:`results`)
         :type wait: boolean
         :raises NoChirpStartedException: Raised if the API returns a 403 indicating the radar cannot start the burst and no data is available, i.e. the radar state is idle.
         :raises RadarBusyException:  Raised if the burst could not be started because the radar is already performing a burst.
@@ -691,30 +1722,19 @@ class Radar(APIChild):
             raise TypeError("Argument 'callback' should be callable.")
 
         # Update config locally
-        self.config.get()
+        self.config.get(self.api.configCacheTTL)
 
-        try:
         # Make a POST request to trial burst
-            response = self.postRequest("radar/trial-burst", allow_redirects=False)
-        except (requests.exceptions.ConnectionError) as e:
-                raise RadarBusyException
+        response = self.postRequest("radar/trial-burst", allow_redirects=False)
 
         # Check whether the burst started (any other status codes )
-        self.api.debug("Received {rsp:d} response".format(rsp=response.status_code))
-
-        if response.status_code != self.VALID_BURST_STATUS_CODE:
+        self.checkBurstResponse(response)
+        self.burstType = "trial"
 
-            # Get response
-            response_json = response.json()
-            if "errorMessage" in response_json:
-                raise RadarBusyException(response_json["errorMessage"])
-            else:
-                raise RadarBusyException
-
-        if callback != None or updateCallback != None:
+        if callback != None or updateCallback != None or not wait:
             return self.results(callback, updateCallback, wait)
 
-    def results(self, callback = None, updateCallback = None, wait = True):        
+    def results(self, callback = None, updateCallback = None, wait = True, maxAge = None):
         """
         Wait for results to be returned by the radar
 
@@ -723,6 +1743,26 @@ class Radar(APIChild):
         then this works as a blocking function until the radar results
         are ready.
 
+        If `wait` is disabled the results are polled for by a thread
+        shared with other radars, and a
+        :py:class:`concurrent.futures.Future` is returned immediately.
+        Calling :py:meth:`~concurrent.futures.Future.result` on the
+        future blocks until the results are ready (or raises the
+        exception raised by the poll), and calling
+        :py:meth:`~concurrent.futures.Future.cancel` stops polling.
+        Futures from several radars can be combined using
+        :py:func:`concurrent.futures.wait` or
+        :py:func:`concurrent.futures.as_completed`, i.e.
+
+        .. code-block:: python
+
+            futures = [api.radar.trialBurst(wait = False) for api in apis]
+            for future in concurrent.futures.as_completed(futures, timeout = 60):
+                results = future.result()
+
+        The future is not reported as running until the poll has
+        finished, so that it can be cancelled at any point.
+
         If the `ResultsTimeoutException` is raised, it is a good
         indication that the radar should be reset.
 
@@ -732,11 +1772,14 @@ class Radar(APIChild):
         :param updateCallback: callback function executed on each results request (to provide progress updates)
         :type updateCallback: callable
 
-        :param wait: If False, the request for results takes place in a new thread.
+        :param wait: If False, the request for results takes place in a shared background thread.
         :type wait: boolean
 
-        :return: If wait = False, returns the thread instance executing the results code.  Otherwise, returns a results object if the results are obtained.
-        :rtype: :py:class:`threading.Thread`     
+        :param maxAge: maximum age in seconds of the cached configuration to use (see :py:meth:`Radar.Config.get`), or `None` for :py:attr:`API.configCacheTTL`
+        :type maxAge: float
+
+        :return: If wait = False, returns a future of the results.  Otherwise, returns a results object if the results are obtained.
+        :rtype: :py:class:`concurrent.futures.Future` or :py:class:`apreshttp.Radar.Results`
 
         :raises NoChirpStartedException: If the radar state is idle, no data is returned.
         :raises ResultsTimeoutException: Raised if the timeout period is exceeded and no results are returned within this period.
@@ -745,67 +1788,247 @@ class Radar(APIChild):
         if callback != None and not callable(callback):
             raise TypeError("Argument 'callback' should be callable.")
 
+        if maxAge == None:
+            maxAge = self.api.configCacheTTL
+
         # If waiting, run in the same thread
         if wait:
-            return self.__getResults(callback, updateCallback) 
-        # Otherwise create a new thread and start it
-        else:
-            self.api.debug(self.__getResults)
-            resultsThread = threading.Thread(target=self.__getResults, args=(callback, updateCallback))
-            resultsThread.start()
-            return resultsThread
+            return self.__getResults(callback, updateCallback, maxAge)
 
+        # Otherwise poll in the shared executor, reporting to a future
+        future = concurrent.futures.Future()
+        cancelled = threading.Event()
+        future.add_done_callback(lambda f: cancelled.set())
 
-    def __getResults(self, callback, updateCallback = None):
-        """
-        Nothing to see here...
+        self.sharedExecutor().submit(
+            self.__resolveResults, future, cancelled, callback, updateCallback, maxAge
+        )
+        return future
+
+    @classmethod
+    def sharedExecutor(cls):
         """
+        Return the thread pool shared by all background results polls
 
-        # Update config
-        self.config.get()
+        :rtype: :py:class:`concurrent.futures.ThreadPoolExecutor`
+        """
 
-        # Define initiation time
-        init_time = datetime.datetime.now()
+        with cls.resultsExecutorLock:
+            if cls.resultsExecutor == None:
+                cls.resultsExecutor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers = cls.RESULTS_WORKERS,
+                    thread_name_prefix = "apreshttp-results"
+                )
+            return cls.resultsExecutor
 
-        nTx = sum(self.config.txAntenna)
-        nRx = sum(self.config.rxAntenna)
+    def __resolveResults(self, future, cancelled, callback, updateCallback, maxAge):
+        """
+        Poll for results and pass the outcome to `future`
+        """
 
-        # Calculate timeout (allow 2 seconds for each chirp)
-        timeoutSeconds = (nTx * nRx) * (self.config.nSubBursts + self.config.nAverages) * \
-                         self.config.nAttenuators * 2 + self.api.timeout
+        try:
+            results = self.__getResults(callback, updateCallback, maxAge, cancelled)
+        except Exception as e:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(e)
+        else:
+            if future.set_running_or_notify_cancel():
+                future.set_result(results)
+
+    def __getResults(self, callback, updateCallback = None, maxAge = 0, cancelled = None):
+        """
+        Nothing to see here...
+        """
+
+        # Update config
+        self.config.get(maxAge)
+
+        # Define initiation time
+        init_time = time.monotonic()
+
+        nChirps = self.expectedChirps()
+        timeoutSeconds = self.resultsTimeout()
 
         self.api.debug("Getting results [Timeout = {timeout:f}".format(
             timeout=timeoutSeconds
         ))
 
-        timeout = datetime.timedelta(seconds = timeoutSeconds)
-
         # Loop until we timeout
-        while (datetime.datetime.now() - init_time < timeout):
+        while (time.monotonic() - init_time < timeoutSeconds):
 
             # Make GET request to results
             response = self.getRequest("radar/results")
-            response_json = response.json()
 
             # Check if a chirp was requested
-            if response_json["status"] == "idle":
-                # No chirp was started so break
-                raise NoChirpStartedException
-
-            elif response_json["status"] == "finished":
+            if self.resultsFinished(response):
+                results = self.readResults(response)
                 if callback != None:
-                    callback(self.Results(response))
-                return self.Results(response)
+                    callback(results)
+                return results
 
             if updateCallback != None:
                 updateCallback(response)
 
-            # wait until next timeout
-            time.sleep(self.api.resultsInterval)
+            # wait until next poll, stopping early if cancelled
+            interval = self.pollInterval(nChirps, time.monotonic() - init_time, response)
+            if cancelled == None:
+                time.sleep(interval)
+            elif cancelled.wait(interval):
+                return None
 
         raise ResultsTimeoutException
 
-    def burst(self, filename = None, userData = None, callback = None, updateCallback = None, wait = True):
+    def expectedChirps(self):
+        """
+        Estimate the number of chirps in the current burst
+
+        Uses the current configuration (:py:attr:`config` should be up
+        to date) and the type of the last burst started by this
+        object.  If the type is unknown, enough chirps for either a
+        trial burst or a full burst are assumed.
+
+        :return: number of chirps
+        :rtype: int
+        """
+
+        with self.config.lock:
+            nTx = sum(self.config.txAntenna)
+            nRx = sum(self.config.rxAntenna)
+
+            if self.burstType == "trial":
+                nRepeats = self.config.nAverages
+            elif self.burstType == "burst":
+                nRepeats = self.config.nSubBursts
+            else:
+                nRepeats = self.config.nSubBursts + self.config.nAverages
+
+            return (nTx * nRx) * nRepeats * self.config.nAttenuators
+
+    def resultsTimeout(self):
+        """
+        Calculate the timeout in seconds when waiting for results
+
+        Allows 2 seconds for each chirp in the current configuration
+        (:py:attr:`config` should be up to date), plus the HTTP
+        timeout, unless the :py:attr:`API.pollingStrategy` specifies
+        otherwise.
+
+        :return: timeout in seconds
+        :rtype: float
+        """
+
+        nChirps = self.expectedChirps()
+
+        if self.api.pollingStrategy == None:
+            return nChirps * 2 + self.api.timeout
+
+        return self.api.pollingStrategy.timeout(nChirps, self.api.timeout)
+
+    def pollInterval(self, nChirps, elapsed, response):
+        """
+        Return the time to wait before the next radar/results request
+
+        Delegates to :py:attr:`API.pollingStrategy`, passing the
+        progress reported in the response if available.  The radar
+        reports progress of full bursts as a sub-burst count in
+        `chirpNumber`, which is converted to a number of chirps.
+        Progress is ignored if the type of burst is unknown, since
+        `nChirps` then covers both a trial burst and a full burst.
+        If no strategy is set, :py:attr:`API.resultsInterval` is used.
+
+        :return: interval in seconds
+        :rtype: float
+        """
+
+        if self.api.pollingStrategy == None:
+            return self.api.resultsInterval
+
+        chirpNumber = self.readJSON(response).get("chirpNumber")
+
+        if self.burstType == None:
+            chirpNumber = None
+        elif chirpNumber != None and self.burstType == "burst" and self.config.nSubBursts:
+            chirpNumber = chirpNumber * nChirps / self.config.nSubBursts
+
+        return self.api.pollingStrategy.interval(nChirps, elapsed, chirpNumber)
+
+    def resultsFinished(self, response):
+        """
+        Check a response to radar/results for completion
+
+        :raises NoChirpStartedException: If the radar state is idle.
+        :return: `True` if the results are ready, otherwise `False`
+        :rtype: boolean
+        """
+
+        response_json = self.readJSON(response)
+
+        if response_json["status"] == "idle":
+            # No chirp was started so break
+            raise NoChirpStartedException
+
+        return response_json["status"] == "finished"
+
+    def readResults(self, response):
+        """
+        Read a finished response to radar/results into a Results object
+
+        The results are recorded in :py:attr:`API.catalog`, if set.
+
+        :raises BadResponseException: if the response is malformed or missing information.
+        :rtype: :py:class:`apreshttp.Radar.Results`
+        """
+
+        # Decode the body with the API decoder, once, before the
+        # Results object reads it
+        self.readJSON(response)
+        results = self.Results(response, self.api.resultsDtype)
+
+        if self.api.catalog != None:
+            self.api.catalog.recordResults(self.api.root, results)
+
+        return results
+
+    def checkBurstResponse(self, response):
+        """
+        Check the response to a radar/trial-burst or radar/burst request
+
+        :raises RadarBusyException: if the burst did not start
+        """
+
+        self.api.debug("Received {rsp:d} response".format(rsp=response.status_code))
+
+        if response.status_code != self.VALID_BURST_STATUS_CODE:
+
+            # Get response
+            response_json = self.readJSON(response)
+            if "errorMessage" in response_json:
+                raise RadarBusyException(response_json["errorMessage"])
+            else:
+                raise RadarBusyException
+
+    def burstData(self, filename = None, userData = None):
+        """
+        Validate burst arguments and form the radar/burst HTTP args
+
+        :raises ValueError: if filename is not of type 'str'
+        :return: name-value pairs for the burst request
+        :rtype: dict
+        """
+
+        if filename != None and not isinstance(filename, str):
+            raise ValueError("filename parameter should be of type 'str'.")
+
+        data_obj = {
+            "filename" : filename
+        }
+
+        if isinstance(userData, str):
+            data_obj["userData"] = userData
+
+        return data_obj
+
+    def burst(self, filename = None, userData = None, callback = None, updateCallback = None, wait = True, maxAge = None):
         """
         Perform a measurement radar burst using the current config
 
@@ -828,42 +2051,34 @@ class Radar(APIChild):
         :param updateCallback: callback function executed on each results request (to provide progress updates)
         :type updateCallback: callable
 
-        :param wait: If False, the request for results takes place in a new thread.
+        :param wait: If False, return a :py:class:`concurrent.futures.Future` of the results immediately (see :py:meth:`results`)
         :type wait: boolean
 
+        :param maxAge: maximum age in seconds of the cached configuration to use (see :py:meth:`Radar.Config.get`), or `None` for :py:attr:`API.configCacheTTL`
+        :type maxAge: float
+
         :raises NoChirpStartedException: Raised if the API returns a 403 indicating the radar cannot start the burst and no data is available, i.e. the radar state is idle.
         :raises RadarBusyException:  Raised if the burst could not be started because the radar is already performing a burst.
         """
 
-        # Update config locally
-        self.config.get()
-
-        if filename != None and not isinstance(filename, str):
-            raise ValueError("filename parameter should be of type 'str'.")
+        if maxAge == None:
+            maxAge = self.api.configCacheTTL
 
-        data_obj = {
-            "filename" : filename
-        }
+        # Update config locally
+        self.config.get(maxAge)
 
-        if isinstance(userData, str):
-            data_obj["userData"] = userData
+        data_obj = self.burstData(filename, userData)
 
         # Make a POST request to trial burst
         response = self.postRequest("radar/burst", data_obj, allow_redirects=False)
 
         # Check whether the burst started (any other status codes )
-        if response.status_code != self.VALID_BURST_STATUS_CODE:
-
-            # Get response
-            response_json = response.json()
-            if "errorMessage" in response_json:
-                raise RadarBusyException(response_json["errorMessage"])
-            else:
-                raise RadarBusyException
+        self.checkBurstResponse(response)
+        self.burstType = "burst"
 
         # If callback is available then use that
-        if callback != None:
-            return self.results(callback, wait)
+        if callback != None or updateCallback != None or not wait:
+            return self.results(callback, updateCallback, wait, maxAge)
 
     class Results:
         """
@@ -872,10 +2087,32 @@ class Radar(APIChild):
         The `type` parameter can be used to determine whether the
         results arise from trial burst or a full burst, and the
         parameters will depend on this.
+
+        Trial burst chirp and histogram data are stored as 2-D
+        :py:class:`numpy.ndarray` objects with one row per attenuator
+        setting, so `chirp[i]` gives the samples of the i-th
+        attenuator setting as before.  The floating point type of the
+        chirp voltages is set by `dtype` (see
+        :py:attr:`API.resultsDtype`).
         """
-        def __init__(self, response):
 
-            response_json = response.json()
+        #: Scale factor converting ADC counts to volts
+        VOLTS_PER_COUNT = 2.5 / 65536
+
+        def __init__(self, response, dtype = numpy.float64):
+
+            #: Floating point type of :py:attr:`chirp`
+            self.dtype = numpy.dtype(dtype)
+
+            if not self.dtype in (numpy.float32, numpy.float64):
+                raise ValueError("dtype should be numpy.float32 or numpy.float64")
+
+            # Use the body already decoded by Radar.readResults, and
+            # only decode it here if constructed directly
+            try:
+                response_json = response.parsedJSON
+            except AttributeError:
+                response_json = response.json()
 
             if not "type" in response_json:
                 raise BadResponseException("No key 'type' found in results.")
@@ -926,18 +2163,18 @@ class Radar(APIChild):
             #: Number of averages used to compute the response
             self.nAverages = int(response_json["nAverages"])
 
-            #: histogram counts for each attenuator setting (list of lists)
-            self.histogram = [];
-            self.histogramVoltage = linspace(0, 2.5, 50)
-            #: chirp data for each attenuator setting (list of lists)
-            self.chirp = [];
+            try:
+                #: histogram counts for each attenuator setting (ndarray of shape (nAttenuators, nBins))
+                self.histogram = numpy.array(response_json["histogram"], dtype=numpy.int64, ndmin=2)
+                #: chirp voltages for each attenuator setting (ndarray of shape (nAttenuators, nSamples))
+                self.chirp = numpy.array(response_json["chirp"], dtype=self.dtype, ndmin=2)
+            except ValueError as e:
+                raise BadResponseException("Malformed chirp or histogram in results: " + str(e))
 
-            # Iterate over number of attenuators and assign chirps/histogram
-            for hist in response_json["histogram"]:
-                self.histogram.append(hist)
+            self.histogramVoltage = linspace(0, 2.5, 50, dtype=self.dtype)
 
-            for chirp in response_json["chirp"]:
-                self.chirp.append([v / 65536 * 2.5 for v in chirp])
+            # Convert ADC counts to volts in place
+            self.chirp *= self.VOLTS_PER_COUNT
 
         def __loadBurstParameters(self, response_json):
 
@@ -964,6 +2201,13 @@ class Radar(APIChild):
 
         By default, instance variables are initialised to `None` until
         a :py:meth:`get` request is made.
+
+        Before bursts, results requests and updates, the
+        :py:class:`Radar` methods reuse the cached configuration if it
+        is younger than :py:attr:`API.configCacheTTL` seconds, which
+        is disabled by default.  The cache is refreshed by every :py:meth:`get` and :py:meth:`set`,
+        and invalidated by :py:meth:`System.reset` and
+        :py:meth:`System.Housekeeping.Config.upload`.
         """
 
         def __init__(self, api_obj):
@@ -978,6 +2222,16 @@ class Radar(APIChild):
             self.afGain = []
             #: AF gain settings (list of float)
             self.rfAttn = []
+            #: 32-char string representing the current radar task (str)
+            self.userData = None
+            #: Enabled transmit antennas (8-element tuple of 0 or 1)
+            self.txAntenna = None
+            #: Enabled receive antennas (8-element tuple of 0 or 1)
+            self.rxAntenna = None
+            #: Time the configuration was last read, from :py:func:`time.monotonic`
+            self.lastUpdated = None
+            #: Re-entrant lock held while the configuration is read or updated
+            self.lock = threading.RLock()
 
         def __repr__(self):
             str = "Radar.Config <0x{:x}>\n\n".format(id(self))
@@ -989,27 +2243,82 @@ class Radar(APIChild):
             str += "\tuserData     : {}\n".format(self.userData)
             return str
 
-        def get(self):
+        def get(self, maxAge = 0):
             """
             Retrieve the latest radar burst configuration
 
+            If `maxAge` is greater than zero and the configuration was
+            last read from the radar less than `maxAge` seconds ago
+            (and has not been invalidated), no request is made.  By
+            default the configuration is always requested.
+
+            The configuration is locked during the request, so threads
+            sharing the API wait for a single refresh of the cache
+            rather than each making a request.
+
+            :param maxAge: maximum age in seconds of the cached configuration
+            :type maxAge: float
+
             :return: Returns `self`
 
             :raises BadResponseException: Raised in the event of an unexpected error code or missing JSON keys.
             """
 
-            # Get response
+            with self.lock:
+                if self.isFresh(maxAge):
+                    return self
+
+                response = self.getRequest("radar/config", self.getData())
+                return self.readGetResponse(response)
+
+        def getData(self):
+            """
+            Form the HTTP args of a :py:meth:`get` request
+
+            :rtype: dict
+            """
+
             if self.api.debugEnable:
-                response = self.getRequest("radar/config", data={"debug":1})
-            else:
-                response = self.getRequest("radar/config")
-            #
+                return {"debug" : 1}
+            return dict()
+
+        def readGetResponse(self, response):
+            """
+            Read the response to a :py:meth:`get` request
+
+            :raises BadResponseException: Raised in the event of an unexpected error code or missing JSON keys.
+            :return: Returns `self`
+            """
+
             if response.status_code != 200:
                 raise BadResponseException(
                 "Unexpected status code: {stat:d}".format(stat=response.status_code))
-            else:
-                self.readResponse(response)
-                return self
+
+            self.readResponse(response)
+            return self
+
+        def isFresh(self, maxAge):
+            """
+            Check whether the cached configuration is younger than `maxAge`
+
+            :param maxAge: maximum age in seconds
+            :type maxAge: float
+            :rtype: boolean
+            """
+
+            return self.lastUpdated != None and maxAge > 0 \
+                and time.monotonic() - self.lastUpdated < maxAge
+
+        def invalidate(self):
+            """
+            Mark the cached configuration as stale
+
+            The next call to :py:meth:`get` will request the
+            configuration from the radar regardless of `maxAge`.
+            """
+
+            with self.lock:
+                self.lastUpdated = None
 
         def readResponse(self, response):
             """
@@ -1018,9 +2327,10 @@ class Radar(APIChild):
             :raises BadResponseException: Raised if there are missing fields from the radar configuration JSON response.
             """
             # Convert response body to JSON
-            response_json = response.json()
+            response_json = self.readJSON(response)
 
-            self.api.debug(response.text)
+            if self.api.debugEnable:
+                self.api.debug(response.text)
 
             # Check response has valid components
             if not "nSubBursts" in response_json:
@@ -1040,26 +2350,34 @@ class Radar(APIChild):
             if not "rxAntenna" in response_json:
                 raise BadResponseException("No rxAntenna key in response.")
 
-            self.nAttenuators = response_json["nAttenuators"]
-            self.nSubBursts = response_json["nSubBursts"]
-            self.nAverages = response_json["nAverages"]
-            self.userData = response_json["userData"]
-            # Create empty AF gain and RF attenuation arrays
+            self.api.debug("NAtts: {}\nN(rfAttn): {}\nN(afGain): {}\n".format(
+                response_json["nAttenuators"], len(response_json["rfAttn"]), len(response_json["afGain"])))
 
-            self.rfAttn = response_json["rfAttn"]
-            self.afGain = response_json["afGain"]
+            # Sanity check we have the correct number of attenuators
+            if len(response_json["rfAttn"]) != response_json["nAttenuators"] \
+            or len(response_json["afGain"]) != response_json["nAttenuators"]:
+                raise BadResponseException("Number of attenuator settings did not match nAttenuators in response.")
 
-            self.txAntenna = tuple(response_json["txAntenna"])
-            self.rxAntenna = tuple(response_json["rxAntenna"])
+            # Update all values together, so other threads never see a
+            # partially updated configuration
+            with self.lock:
+                self.nAttenuators = response_json["nAttenuators"]
+                self.nSubBursts = response_json["nSubBursts"]
+                self.nAverages = response_json["nAverages"]
+                self.userData = response_json["userData"]
 
-            self.api.debug("NAtts: {}\nN(rfAttn): {}\nN(afGain): {}\n".format(self.nAttenuators, len(self.rfAttn), len(self.afGain)))
+                self.rfAttn = response_json["rfAttn"]
+                self.afGain = response_json["afGain"]
 
-            # Sanity check we have the correct number of attenuators
-            if len(self.rfAttn) == self.nAttenuators \
-            and len(self.afGain) == self.nAttenuators:
-                return self
-            else:
-                raise BadResponseException("Number of attenuator settings did not match nAttenuators in response.")
+                self.txAntenna = tuple(response_json["txAntenna"])
+                self.rxAntenna = tuple(response_json["rxAntenna"])
+
+                self.lastUpdated = time.monotonic()
+
+                if self.api.catalog != None:
+                    self.api.catalog.recordConfig(self.api.root, self)
+
+            return self
 
         def set(
             self, nAtts=None, nAverages = None, nBursts=None, rfAttnSet=None, afGainSet=None,
@@ -1084,8 +2402,13 @@ class Radar(APIChild):
             :raises BadResponseException: If an unexpected status code was returned
             :raises DidNotUpdateException: If the config settings were not updated
 
-            **NOTE**: Calling :py:meth:`set` will incur a call to
-            :py:meth:`get` to retrieve the latest configuration.
+            **NOTE**: If the cached configuration is younger than
+            :py:attr:`API.configCacheTTL`, only values which differ
+            from it are sent, and no request is made if nothing has
+            changed.  Otherwise all supplied values are sent.  A call
+            to :py:meth:`get` is only made if RF attenuator or AF gain
+            values are provided without `nAtts` and the cached
+            configuration is not fresh.
 
             To update the number of attenuators
 
@@ -1150,8 +2473,68 @@ class Radar(APIChild):
 
             """
 
-            # Update parameters
-            self.get()
+            # Hold the lock so the changes are computed against the
+            # configuration the radar is updated from
+            with self.lock:
+                # Only read the config if it is needed to validate arguments
+                known = self.isFresh(self.api.configCacheTTL)
+                if not known and self.setNeedsConfig(nAtts, rfAttnSet, afGainSet):
+                    self.get()
+                    known = True
+
+                data_obj, valid_rf, valid_af = self.setRequestData(
+                    known, nAtts, nAverages, nBursts, rfAttnSet, afGainSet, txAnt, rxAnt, userData
+                )
+                if data_obj == None:
+                    return self
+
+                # Now deal with the request
+                response = self.postRequest("radar/config", data_obj)
+
+                return self.readSetResponse(response, nAtts, nBursts, valid_rf, valid_af)
+
+        def setRequestData(
+            self, known, nAtts=None, nAverages = None, nBursts=None, rfAttnSet=None, afGainSet=None,
+            txAnt=None, rxAnt=None, userData = None
+        ):
+            """
+            Form the HTTP args of a :py:meth:`set` request
+
+            Arguments are validated by :py:meth:`setData`.  If the
+            current configuration is `known`, only values which differ
+            from it are kept (see :py:meth:`changedFields`).
+
+            :raises ValueError: if any of the arguments are invalid
+            :return: tuple as returned by :py:meth:`setData`, with `None` in place of the name-value pairs if nothing has changed
+            :rtype: tuple
+            """
+
+            data_obj, valid_rf, valid_af = self.setData(
+                nAtts, nAverages, nBursts, rfAttnSet, afGainSet, txAnt, rxAnt, userData
+            )
+
+            # Only send values which differ from the known config
+            if known:
+                data_obj = self.changedFields(data_obj)
+                if len(data_obj) == 0:
+                    self.api.debug("Config unchanged, no request made.")
+                    return None, valid_rf, valid_af
+
+            return data_obj, valid_rf, valid_af
+
+        def setData(
+            self, nAtts=None, nAverages = None, nBursts=None, rfAttnSet=None, afGainSet=None,
+            txAnt=None, rxAnt=None, userData = None
+        ):
+            """
+            Validate :py:meth:`set` arguments and form the HTTP args
+
+            Arguments are as described for :py:meth:`set`.
+
+            :raises ValueError: if any of the arguments are invalid
+            :return: tuple of the request name-value pairs and the validated RF attenuator and AF gain settings (or `None`)
+            :rtype: tuple
+            """
 
             # Create an empty dictionary to hold data for post request
             data_obj = dict()
@@ -1230,12 +2613,73 @@ class Radar(APIChild):
                 else:
                     ValueError("userData should be of type str")
 
-            # Now deal with the request
-            response = self.postRequest("radar/config", data_obj)
+            return data_obj, valid_rf, valid_af
+
+        def setNeedsConfig(self, nAtts, rfAttnSet, afGainSet):
+            """
+            Check whether :py:meth:`set` arguments require the current config
+
+            RF attenuator and AF gain values are validated against the
+            number of attenuators, which must be read from the radar if
+            it is not provided.  Callers only use this when the cached
+            config is not fresh, as another client may have changed
+            the number of attenuators since it was read.
+
+            :rtype: boolean
+            """
+
+            return nAtts == None and (rfAttnSet != None or afGainSet != None)
+
+        def changedFields(self, data_obj):
+            """
+            Remove values matching the current config from HTTP args
+
+            Compares the name-value pairs formed by :py:meth:`setData`
+            against the attributes of this object.  If the number of
+            attenuators is changing, all RF attenuator and AF gain
+            values are kept.
+
+            :param data_obj: name-value pairs for a radar/config request
+            :type data_obj: dict
+            :return: name-value pairs which differ from the current config
+            :rtype: dict
+            """
+
+            current = {
+                "nAttenuators" : self.nAttenuators,
+                "nSubBursts" : self.nSubBursts,
+                "nAverages" : self.nAverages,
+                "userData" : self.userData
+            }
+
+            if self.txAntenna != None:
+                current["txAntenna"] = ",".join([str(x) for x in self.txAntenna])
+            if self.rxAntenna != None:
+                current["rxAntenna"] = ",".join([str(x) for x in self.rxAntenna])
+
+            if not "nAttenuators" in data_obj or data_obj["nAttenuators"] == self.nAttenuators:
+                for i in range(len(self.rfAttn)):
+                    current["rfAttn" + str(i + 1)] = self.rfAttn[i]
+                for i in range(len(self.afGain)):
+                    current["afGain" + str(i + 1)] = self.afGain[i]
+
+            return {
+                key : value for key, value in data_obj.items()
+                if not (key in current and current[key] == value)
+            }
+
+        def readSetResponse(self, response, nAtts, nBursts, valid_rf, valid_af):
+            """
+            Read the response to a radar/config POST and check values
+
+            :raises BadResponseException: If an unexpected status code was returned
+            :raises DidNotUpdateException: If the config settings were not updated
+            :return: Returns `self`
+            """
 
             # Need to check status codes in response
             if response.status_code == 400:
-                response_json = response.json()
+                response_json = self.readJSON(response)
                 raise BadResponseException(response_json['errorMessage'])
 
             elif response.status_code == 200:
@@ -1288,7 +2732,7 @@ class Radar(APIChild):
                 # Value is singular - current nAtts should be 1 and
                 # updating value empty, or updating value should be 1
                 if (nAtts != None and nAtts == 1) or \
-                   (nAtts == None and self.nAtts == 1):
+                   (nAtts == None and self.nAttenuators == 1):
                    # Assign value to rfAttn1 or afGain1
                    resp[type + "1"] = arg
                 else:
@@ -1297,7 +2741,7 @@ class Radar(APIChild):
             elif isinstance(arg, list):
                 # If the argument is a list, it should have the same
                 # number of elements as nAtts or nAttenuators
-                if ((nAtts != None and len(arg) == nAtts) or (nAtts == None and len(arg) == self.nAtts)):
+                if ((nAtts != None and len(arg) == nAtts) or (nAtts == None and len(arg) == self.nAttenuators)):
                    # len(arg) must be valid, therefore iterate
                    for i in range(len(arg)):
                        # Check that the value is numeric
@@ -1335,12 +2779,134 @@ class Radar(APIChild):
             return resp
 
 
+class PollingStrategy:
+    """
+    Fixed-interval strategy for polling radar/results
+
+    A polling strategy decides how long :py:meth:`Radar.results` waits
+    between consecutive radar/results requests, and how long to wait
+    in total before raising a :py:class:`ResultsTimeoutException`.
+
+    Custom strategies should subclass PollingStrategy and override
+    :py:meth:`interval` and/or :py:meth:`timeout`, then be assigned
+    to :py:attr:`API.pollingStrategy`.  Strategies hold no per-burst
+    state, so one instance can be shared between radars.  No strategy
+    is set by default, in which case results are polled every
+    :py:attr:`API.resultsInterval` seconds.
+    """
+
+    def __init__(self, interval = 2, timeoutPerChirp = 2):
+        """
+        :param interval: interval between requests in seconds
+        :type interval: float
+        :param timeoutPerChirp: seconds allowed for each chirp before timing out
+        :type timeoutPerChirp: float
+        """
+
+        #: Interval between requests in seconds
+        self.pollInterval = interval
+        #: Seconds allowed for each chirp before timing out
+        self.timeoutPerChirp = timeoutPerChirp
+
+    def interval(self, nChirps, elapsed, chirpNumber = None):
+        """
+        Return the time to wait before the next request
+
+        :param nChirps: expected number of chirps in the burst
+        :type nChirps: int
+        :param elapsed: seconds since polling started
+        :type elapsed: float
+        :param chirpNumber: number of chirps reported complete by the radar, if available
+        :type chirpNumber: float or `None`
+        :return: interval in seconds
+        :rtype: float
+        """
+
+        return self.pollInterval
+
+    def timeout(self, nChirps, httpTimeout):
+        """
+        Return the total time to wait for results in seconds
+
+        :param nChirps: expected number of chirps in the burst
+        :type nChirps: int
+        :param httpTimeout: HTTP timeout of the API in seconds
+        :type httpTimeout: float
+        :rtype: float
+        """
+
+        return nChirps * self.timeoutPerChirp + httpTimeout
+
+class AdaptivePolling(PollingStrategy):
+    """
+    Polling strategy driven by the estimated burst completion time
+
+    The completion time is first estimated from the expected number
+    of chirps and `chirpDuration`, then refined from the `chirpNumber`
+    progress reported by the radar.  Each interval is a `fraction`
+    of the estimated time remaining, so requests are sparse at the
+    start of a long burst and dense near its expected end.  Once the
+    estimate has passed, the interval backs off in proportion to how
+    overdue the results are.  Intervals are limited to between
+    `minInterval` and `maxInterval`.
+    """
+
+    def __init__(self, chirpDuration = 1.0, minInterval = 0.2, maxInterval = 10, fraction = 0.5, timeoutPerChirp = 2):
+        """
+        :param chirpDuration: initial estimate of the seconds taken per chirp
+        :type chirpDuration: float
+        :param minInterval: shortest interval between requests in seconds
+        :type minInterval: float
+        :param maxInterval: longest interval between requests in seconds
+        :type maxInterval: float
+        :param fraction: fraction of the remaining (or overdue) time to wait
+        :type fraction: float
+        :param timeoutPerChirp: seconds allowed for each chirp before timing out
+        :type timeoutPerChirp: float
+        """
+
+        if minInterval <= 0 or maxInterval < minInterval:
+            raise ValueError("Require 0 < minInterval <= maxInterval")
+        if fraction <= 0 or fraction > 1:
+            raise ValueError("fraction should be in the range (0, 1]")
+
+        super().__init__(minInterval, timeoutPerChirp)
+
+        #: Initial estimate of the seconds taken per chirp
+        self.chirpDuration = chirpDuration
+        #: Shortest interval between requests in seconds
+        self.minInterval = minInterval
+        #: Longest interval between requests in seconds
+        self.maxInterval = maxInterval
+        #: Fraction of the remaining (or overdue) time to wait
+        self.fraction = fraction
+
+    def estimate(self, nChirps, elapsed, chirpNumber = None):
+        """
+        Estimate the total duration of the burst in seconds
+        """
+
+        if chirpNumber != None and chirpNumber > 0 and elapsed > 0:
+            return elapsed / chirpNumber * nChirps
+
+        return nChirps * self.chirpDuration
+
+    def interval(self, nChirps, elapsed, chirpNumber = None):
+
+        remaining = self.estimate(nChirps, elapsed, chirpNumber) - elapsed
+        interval = abs(remaining) * self.fraction
+
+        return min(self.maxInterval, max(self.minInterval, interval))
+
 ################################################################################
 # DATA
 ################################################################################
 
 class Data(APIChild):
 
+    #: Suffix of the temporary file written to during a download
+    PARTIAL_SUFFIX = ".part"
+
     def __init__(self, api_obj):
         super().__init__(api_obj);
 
@@ -1381,6 +2947,18 @@ class Data(APIChild):
 
         response = self.getRequest("data", data_obj)
 
+        return self.readDirectoryListing(response, path)
+
+    def readDirectoryListing(self, response, path):
+        """
+        Read a response to a data request into a DirectoryListing
+
+        :raises NotFoundException: if the path is not found on the ApRES file system
+        :raises NotADirectoryError: if the path does not point to a directory
+        :raises InternalRadarErrorException: if an internal radar error has occured.
+        :rtype: :py:class:`apreshttp.Data.DirectoryListing`
+        """
+
         if response.status_code == 404:
             
             raise NotFoundException(path)
@@ -1397,11 +2975,16 @@ class Data(APIChild):
             )
 
         # Now we can parse the response
-        response_json = response.json()
+        response_json = self.readJSON(response)
+
+        listing = self.DirectoryListing(response_json)
+
+        if self.api.catalog != None:
+            self.api.catalog.recordListing(self.api.root, listing)
 
-        return self.DirectoryListing(response_json)
+        return listing
         
-    def download(self, path, dst_path=None):
+    def download(self, path, dst_path=None, chunkSize=None, resume=False, size=None, progressCallback=None):
         """
         Download a file to the working dir or the destination path
 
@@ -1416,47 +2999,830 @@ class Data(APIChild):
         Providing a `dst_path` value that refers to a file will
         download the file to that path.
 
-        **NOTE**: If the destination filepath already exists, a
-        `FileExistsException` will be thrown.
+        The file is streamed to disk in chunks of `chunkSize` bytes
+        (defaulting to :py:attr:`API.downloadChunkSize`) so memory use
+        does not depend on the file size.  Chunks are written to a
+        temporary file with a `.part` suffix, which is renamed to the
+        destination once the download completes, so a partially
+        downloaded file never appears at the destination path.
+
+        If `resume` is enabled, an interrupted download leaves its
+        `.part` file in place and the next call requests only the
+        missing bytes using a HTTP Range header.  If `size` is known,
+        an existing, smaller file at the destination is also treated
+        as a partial download, while one matching `size` is left
+        untouched.  If the radar ignores the Range header, or returns
+        a different range, the download restarts from zero.
+
+        If `size` is provided (or reported by the radar), the size of
+        the downloaded file is checked against it.
+
+        **NOTE**: If the destination filepath already exists and
+        `resume` is not enabled, a `FileExistsException` will be
+        thrown.
 
         :param path: path on the ApRES filesystem of the file to download
         :type path: str
         :param dst_path: destination path to download file to
         :type dst_path: str
-
-        :raises FileExistsException: if the file already exists at `dst_path`
+        :param chunkSize: size in bytes of chunks written to disk
+        :type chunkSize: int
+        :param resume: resume a previous partial download of the file
+        :type resume: boolean
+        :param size: expected size of the file in bytes (see :py:attr:`apreshttp.Data.FileObject.size`)
+        :type size: int
+        :param progressCallback: callback function executed with the number of bytes in each chunk written to disk
+        :type progressCallback: callable
+
+        :raises FileExistsException: if the file already exists at `dst_path` and `resume` is not enabled
+        :raises IncompleteDownloadException: if the size of the downloaded file does not match the expected size
+
+        :return: local filename of the downloaded file
+        :rtype: str
         """
         
-        filename = os.path.basename(path)
+        filename = self.downloadFilename(path, dst_path, existOk=resume)
+        partname = filename + self.PARTIAL_SUFFIX
 
-        if dst_path != None:
-            if os.path.isdir(dst_path):
-                filename = os.path.join(dst_path, filename)
-            else:
-                filename = dst_path
+        if chunkSize == None:
+            chunkSize = self.api.downloadChunkSize
 
-        if os.path.exists(filename):
-            raise FileExistsError(filename)
+        offset = 0
+        if resume:
+            offset = self.resumeOffset(filename, size)
+            if offset == None:
+                # Nothing left to download
+                return filename
+            self.api.debug("Resuming {} from byte {:d}".format(path, offset))
 
         data_obj = {
             "path" : path
         }
 
-        # Get response
-        response = self.getRequest("data/download", data_obj)
+        # Get response, without reading the body into memory
+        response = self.getRequest(
+            "data/download",
+            data_obj,
+            stream=True,
+            headers=self.rangeHeaders(offset)
+        )
 
-        # Write file
-        with open(filename, 'wb') as fh:
-            fh.write(response.text.encode("utf-8"))
-        
+        if not self.rangeMatches(response, offset):
+            # The radar returned a different range, so start again
+            self.api.debug("Restarting {} from byte 0".format(path))
+            response.close()
+            offset = 0
+            response = self.getRequest("data/download", data_obj, stream=True)
 
-    class DirectoryListing:
-        """
-        Represents files stored on the ApRES SD card
+        try:
+            mode, size = self.readDownloadHeaders(response, offset, size)
+
+            if mode != None:
+                # Write file
+                with open(partname, mode) as fh:
+                    for chunk in response.iter_content(chunkSize):
+                        fh.write(chunk)
+                        if progressCallback != None:
+                            progressCallback(len(chunk))
+
+            return self.finishDownload(filename, size, path)
+
+        except BaseException:
+            if not resume:
+                self.removePartial(partname)
+            raise
+        finally:
+            response.close()
+
+    def downloadMany(self, files, dst_path=None, maxWorkers=2, retries=2, resume=True, chunkSize=None, progressCallback=None, keepTree=False):
         """
+        Download many files using a bounded pool of worker threads
+
+        Each item in `files` may be a path on the ApRES filesystem or
+        a :py:class:`apreshttp.Data.FileObject`, in which case the
+        downloaded size is checked against :py:attr:`FileObject.size`.
+        Files are downloaded to `dst_path` (or the current working
+        directory), which is created if it does not exist.  If
+        `keepTree` is enabled, the directory structure of the ApRES
+        filesystem is recreated beneath `dst_path`; otherwise files are
+        downloaded by name, and any file whose name clashes with an
+        earlier file is recorded as a failure rather than downloaded.
+
+        The number of simultaneous downloads is limited to
+        `maxWorkers`, and never exceeds the
+        :py:attr:`Transport.poolMaxSize` of the API transport, so the
+        radar's embedded web server is not overwhelmed.  A failed file
+        is retried up to `retries` times, waiting :py:attr:`API.wait`
+        seconds between attempts and resuming from the partial file if
+        `resume` is enabled.  Failures are recorded in the returned
+        summary rather than raised.
 
-        def __init__(self, resp_json):
-            """
+        .. code-block:: python
+
+            listing = api.data.dir("Survey/2021-05-26")
+            summary = api.data.downloadMany(listing.files, "bursts")
+            print(summary)
+
+        :param files: paths or file objects to download
+        :type files: list
+        :param dst_path: destination directory to download files to
+        :type dst_path: str
+        :param maxWorkers: maximum number of simultaneous downloads
+        :type maxWorkers: int
+        :param retries: number of times to retry each failed file
+        :type retries: int
+        :param resume: resume partial downloads and skip complete files
+        :type resume: boolean
+        :param chunkSize: size in bytes of chunks written to disk
+        :type chunkSize: int
+        :param progressCallback: callback function executed with the :py:class:`apreshttp.Data.DownloadSummary` each time a chunk is written or a file completes
+        :type progressCallback: callable
+        :param keepTree: recreate the ApRES directory structure beneath `dst_path`
+        :type keepTree: boolean
+
+        :raises ValueError: if maxWorkers or retries are invalid
+        :raises FileExistsError: if `dst_path` exists and is not a directory
+        :rtype: :py:class:`apreshttp.Data.DownloadSummary`
+        """
+
+        if progressCallback != None and not callable(progressCallback):
+            raise TypeError("Argument 'progressCallback' should be callable.")
+        if not isinstance(maxWorkers, int) or maxWorkers < 1:
+            raise ValueError("maxWorkers should be a positive int")
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError("retries should be a non-negative int")
+
+        files = list(files)
+        summary = self.DownloadSummary(len(files))
+
+        if len(files) == 0:
+            summary.finish()
+            return summary
+
+        if dst_path != None:
+            os.makedirs(dst_path, exist_ok=True)
+
+        # Fail files which would be downloaded to the same local file
+        # as an earlier one, rather than overwrite it or share its
+        # partial download
+        claimed = dict()
+        downloads = []
+        for file in files:
+            path = file.path if isinstance(file, Data.FileObject) else file
+            if keepTree:
+                try:
+                    filename = self.localPath(path, dst_path)
+                except ValueError as e:
+                    summary.addFailure(path, e)
+                    continue
+            else:
+                filename = os.path.join(dst_path or "", os.path.basename(path))
+            filename = os.path.normcase(os.path.abspath(filename))
+            if filename in claimed:
+                summary.addFailure(path, FileExistsError(
+                    "{} and {} would both be downloaded to {}".format(
+                        claimed[filename], path, filename
+                    )
+                ))
+            else:
+                claimed[filename] = path
+                downloads.append(file)
+
+        if len(downloads) == 0:
+            summary.finish()
+            return summary
+
+        nWorkers = min(maxWorkers, self.api.transport.poolMaxSize, len(downloads))
+        self.api.debug("Downloading {:d} files with {:d} workers".format(len(downloads), nWorkers))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = nWorkers) as pool:
+            for file in downloads:
+                pool.submit(
+                    self.__downloadWithRetry,
+                    file, dst_path, retries, resume, chunkSize,
+                    summary, progressCallback, keepTree
+                )
+
+        summary.finish()
+        return summary
+
+    def __downloadWithRetry(self, file, dst_path, retries, resume, chunkSize, summary, progressCallback, keepTree):
+        """
+        Download a single file for :py:meth:`downloadMany`
+        """
+
+        if isinstance(file, Data.FileObject):
+            path, size = file.path, file.size
+        else:
+            path, size = file, None
+
+        if keepTree:
+            dst_path = self.localPath(path, dst_path)
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+
+        # Transient errors after which the file is retried
+        retryExceptions = (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            IncompleteDownloadException,
+            RadarBusyException
+        )
+
+        def chunkWritten(nBytes):
+            summary.addBytes(nBytes)
+            if progressCallback != None:
+                progressCallback(summary)
+
+        attempt = 0
+        while True:
+            try:
+                filename = self.download(path, dst_path, chunkSize, resume, size, chunkWritten)
+                summary.addCompleted(path, filename)
+                break
+            except CircuitOpenException as e:
+                # The radar is unreachable, so waiting will not help
+                summary.addFailure(path, e)
+                break
+            except retryExceptions as e:
+                if attempt >= retries:
+                    summary.addFailure(path, e)
+                    break
+                attempt = attempt + 1
+                self.api.debug("Retrying {} ({:d}/{:d}): {}".format(path, attempt, retries, e))
+                time.sleep(self.api.wait)
+            except Exception as e:
+                summary.addFailure(path, e)
+                break
+
+        if progressCallback != None:
+            progressCallback(summary)
+
+    def walk(self, path="", recursive=True, listSize=16, prefetch=True):
+        """
+        Iterate over the files beneath a directory on the ApRES
+
+        Requests each page of the directory listing in turn and yields
+        a :py:class:`apreshttp.Data.FileObject` for each file, so that
+        the caller never has to calculate `startIndex` values.  If
+        `recursive` is enabled, subdirectories are walked once all of
+        the pages of the current directory have been requested.
+
+        If `prefetch` is enabled, the next page is requested in a
+        background thread while the files of the current page are
+        being consumed.  Larger values of `listSize` reduce the
+        number of requests at the cost of larger responses.
+
+        .. code-block:: python
+
+            for file in api.data.walk("Survey", listSize=64):
+                print(file.path, file.size)
+
+        :param path: directory on the ApRES filesystem to walk
+        :type path: str
+        :param recursive: whether to walk subdirectories
+        :type recursive: boolean
+        :param listSize: number of objects requested per page
+        :type listSize: int
+        :param prefetch: request the next page in the background
+        :type prefetch: boolean
+        :raises ValueError: if listSize is not a positive int
+        :rtype: generator of :py:class:`apreshttp.Data.FileObject`
+        """
+
+        if not isinstance(listSize, int) or listSize < 1:
+            raise ValueError("listSize should be a positive int")
+
+        # Pages still to be requested, as (path, startIndex) tuples
+        pending = collections.deque([(path, 0)])
+
+        executor = None
+        if prefetch:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+
+        try:
+            page = pending.popleft()
+            future = None
+            if executor != None:
+                future = executor.submit(self.dir, page[0], page[1], listSize)
+
+            while page != None:
+                pagePath, startIndex = page
+
+                if future != None:
+                    listing = future.result()
+                else:
+                    listing = self.dir(pagePath, startIndex, listSize)
+
+                # Queue the next page of this directory before subdirectories
+                nextIndex = startIndex + listSize
+                if listing.numObjectsInList > 0 and nextIndex < listing.numObjectsInDir:
+                    pending.appendleft((pagePath, nextIndex))
+                if recursive:
+                    pending.extend((d.path, 0) for d in listing.directories)
+
+                # Start the next request before handing over this page
+                page = None
+                future = None
+                if len(pending) > 0:
+                    page = pending.popleft()
+                    if executor != None:
+                        future = executor.submit(self.dir, page[0], page[1], listSize)
+
+                for file in listing.files:
+                    yield file
+        finally:
+            if executor != None:
+                executor.shutdown(wait = False, cancel_futures = True)
+
+    def sync(self, path="", dst_path=None, dryRun=False, manifestName=None, listSize=16, **kwargs):
+        """
+        Mirror a directory on the ApRES to the local filesystem
+
+        Walks the directory at `path` and downloads only the files
+        which are new, or whose size or timestamp has changed, since
+        the last sync.  The ApRES directory structure is recreated
+        beneath `dst_path` (or the current working directory).
+
+        A manifest recording the path, size and timestamp of each
+        synchronised file is kept in `dst_path` (see
+        :py:class:`apreshttp.Data.Manifest`), so a repeated sync only
+        costs a walk of the directory.  Files whose local copy has
+        been removed are downloaded again, and files no longer on the
+        ApRES are removed from the manifest.  A file whose path would
+        escape `dst_path` is recorded as a failure.
+
+        If `dryRun` is enabled then nothing is downloaded and the
+        returned :py:class:`apreshttp.Data.SyncResult` describes the
+        files which would be downloaded.
+
+        Further keyword arguments are passed to :py:meth:`downloadMany`.
+
+        .. code-block:: python
+
+            plan = api.data.sync("Survey", "mirror", dryRun=True)
+            print(plan)
+            result = api.data.sync("Survey", "mirror")
+
+        :param path: directory on the ApRES filesystem to mirror
+        :type path: str
+        :param dst_path: local directory to mirror files into
+        :type dst_path: str
+        :param dryRun: only plan the sync, without downloading
+        :type dryRun: boolean
+        :param manifestName: filename of the manifest within `dst_path`
+        :type manifestName: str
+        :param listSize: number of objects requested per directory page (see :py:meth:`walk`)
+        :type listSize: int
+        :rtype: :py:class:`apreshttp.Data.SyncResult`
+        """
+
+        if dst_path == None:
+            dst_path = os.getcwd()
+
+        if manifestName == None:
+            manifestName = self.Manifest.DEFAULT_NAME
+
+        manifest = self.Manifest(os.path.join(dst_path, manifestName))
+
+        result = self.SyncResult()
+
+        # Local filename of each file, keyed by ApRES path
+        localFiles = dict()
+
+        for file in self.walk(path, listSize=listSize):
+            try:
+                localFiles[file.path] = self.localPath(file.path, dst_path)
+            except ValueError:
+                # Recorded as a failure by downloadMany
+                result.toDownload.append(file)
+                continue
+            if manifest.isCurrent(file, localFiles[file.path]):
+                result.upToDate.append(file)
+            else:
+                result.toDownload.append(file)
+
+        # Forget files which are no longer on the ApRES
+        nPruned = manifest.prune(path, localFiles)
+
+        self.api.debug("Sync: {:d} files to download, {:d} up to date".format(
+            len(result.toDownload), len(result.upToDate)
+        ))
+
+        if dryRun:
+            return result
+
+        if len(result.toDownload) > 0:
+            # Remove stale local copies so changed files are downloaded in full
+            for file in result.toDownload:
+                filename = localFiles.get(file.path)
+                if file.path in manifest.entries and filename != None \
+                and os.path.isfile(filename):
+                    os.remove(filename)
+
+            result.summary = self.downloadMany(result.toDownload, dst_path, keepTree=True, **kwargs)
+
+            for file in result.toDownload:
+                if file.path in result.summary.completed:
+                    manifest.update(file)
+
+        if len(result.toDownload) > 0 or nPruned > 0:
+            manifest.save()
+
+        return result
+
+    def localPath(self, path, dst_path=None):
+        """
+        Return the local path of an ApRES file mirrored into `dst_path`
+
+        :raises ValueError: if `path` would resolve to a file outside `dst_path`
+        :rtype: str
+        """
+
+        if dst_path == None:
+            dst_path = os.getcwd()
+
+        parts = []
+        for part in path.replace("\\", "/").split("/"):
+            if part in ("", "."):
+                continue
+            if part == ".." or os.path.isabs(part) or len(os.path.splitdrive(part)[0]) > 0:
+                raise ValueError("Path {} escapes the destination directory".format(path))
+            parts.append(part)
+
+        if len(parts) == 0:
+            raise ValueError("Path {} does not name a file".format(path))
+
+        return os.path.join(dst_path, *parts)
+
+    def resumeOffset(self, filename, size = None):
+        """
+        Find the byte offset from which to resume a download
+
+        Only an existing partial download is resumed.  A file already
+        at `filename` is left in place (and overwritten once the
+        download completes) unless `size` is known: a file matching
+        `size` is complete, while a smaller one is taken as the
+        partial download if it is longer than any existing partial.
+        A partial download larger than `size` is discarded.
+
+        :return: number of bytes already downloaded, or `None` if the file at `filename` is already complete.
+        :rtype: int
+        """
+
+        partname = filename + self.PARTIAL_SUFFIX
+
+        if size != None and os.path.isfile(filename):
+            fileSize = os.path.getsize(filename)
+            if fileSize == size:
+                return None
+            # Treat a smaller existing file as a partial download
+            if fileSize < size and (not os.path.isfile(partname) \
+            or os.path.getsize(partname) < fileSize):
+                os.replace(filename, partname)
+
+        if not os.path.isfile(partname):
+            return 0
+
+        offset = os.path.getsize(partname)
+        if size != None and offset > size:
+            os.remove(partname)
+            return 0
+
+        return offset
+
+    def removePartial(self, partname):
+        """
+        Remove a partial download, if it exists
+        """
+
+        if os.path.isfile(partname):
+            os.remove(partname)
+
+    def rangeHeaders(self, offset):
+        """
+        Return HTTP headers requesting bytes from `offset` onwards
+
+        :rtype: dict
+        """
+
+        if offset > 0:
+            return {"Range" : "bytes={:d}-".format(offset)}
+        return {}
+
+    def rangeStart(self, response):
+        """
+        Return the first byte of a partial content response
+
+        :return: start of the `Content-Range`, or `None` if the response is not partial content
+        :rtype: int
+        """
+
+        if response.status_code != 206:
+            return None
+
+        # Content-Range: bytes start-end/total
+        match = re.match(r"bytes (\d+)-", response.headers.get("Content-Range", ""))
+        if match == None:
+            raise InternalRadarErrorException(
+                "Radar returned partial content without a valid Content-Range"
+            )
+        return int(match.group(1))
+
+    def rangeMatches(self, response, offset):
+        """
+        Check that a partial content response starts at `offset`
+
+        :return: `False` if the radar returned partial content starting anywhere other than `offset`
+        :rtype: bool
+        """
+
+        start = self.rangeStart(response)
+        return start == None or start == offset
+
+    def readDownloadHeaders(self, response, offset, size = None):
+        """
+        Interpret the response to a (possibly ranged) download request
+
+        :return: tuple of the file mode for writing the body (or `None` if there is nothing to write) and the expected total file size (or `None` if unknown)
+        :rtype: tuple
+        """
+
+        if response.status_code == 416 and offset > 0:
+            # Requested range is beyond the end of the file, so the
+            # partial download is already complete
+            return None, size
+
+        if response.status_code == 206:
+            if self.rangeStart(response) != offset:
+                raise InternalRadarErrorException(
+                    "Radar returned bytes from {:d}, expected {:d}".format(
+                        self.rangeStart(response), offset
+                    )
+                )
+            mode = 'ab' if offset > 0 else 'wb'
+            # Content-Range: bytes start-end/total
+            match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+            if size == None and match != None:
+                size = int(match.group(1))
+        elif response.status_code == 200:
+            # Range not supported, start from the beginning
+            mode = 'wb'
+            if size == None and "Content-Length" in response.headers:
+                size = int(response.headers["Content-Length"])
+        else:
+            raise InternalRadarErrorException(
+                "Radar returned unexpected status code " +
+                str(response.status_code)
+            )
+
+        return mode, size
+
+    def finishDownload(self, filename, size = None, path = None):
+        """
+        Check the size of a partial download and move it into place
+
+        If `path` is given, the download is recorded in
+        :py:attr:`API.catalog`, if set.
+
+        :raises IncompleteDownloadException: if the partial download does not match `size`
+        :return: local filename of the downloaded file
+        :rtype: str
+        """
+
+        partname = filename + self.PARTIAL_SUFFIX
+
+        if size != None and os.path.getsize(partname) != size:
+            raise IncompleteDownloadException(
+                "Downloaded {:d} of {:d} bytes to {}".format(
+                    os.path.getsize(partname), int(size), partname
+                )
+            )
+
+        os.replace(partname, filename)
+
+        if path != None and self.api.catalog != None:
+            self.api.catalog.recordDownload(self.api.root, path, filename)
+
+        return filename
+
+    def downloadFilename(self, path, dst_path=None, existOk=False):
+        """
+        Resolve the local filename for a file download
+
+        See :py:meth:`download` for how `dst_path` is interpreted.
+
+        :raises FileExistsError: if the file already exists at the resolved path and `existOk` is not enabled
+        :return: local filename to download to
+        :rtype: str
+        """
+
+        filename = os.path.basename(path)
+
+        if dst_path != None:
+            if os.path.isdir(dst_path):
+                filename = os.path.join(dst_path, filename)
+            else:
+                filename = dst_path
+
+        if os.path.exists(filename) and not existOk:
+            raise FileExistsError(filename)
+
+        return filename
+
+    class DownloadSummary:
+        """
+        Aggregate progress and outcome of :py:meth:`Data.downloadMany`
+
+        The summary is updated from the worker threads as files are
+        downloaded, so it can be inspected from a progress callback.
+        """
+
+        def __init__(self, numFiles):
+
+            self.__lock = threading.Lock()
+            #: Number of files requested
+            self.numFiles = numFiles
+            #: Dictionary of local filenames keyed by ApRES path for completed files
+            self.completed = dict()
+            #: Dictionary of exceptions keyed by ApRES path for failed files
+            self.failures = dict()
+            #: Number of bytes written to disk
+            self.bytesDownloaded = 0
+            #: Time the downloads started, from :py:func:`time.monotonic`
+            self.startTime = time.monotonic()
+            #: Time the downloads finished, or `None` if in progress
+            self.endTime = None
+
+        def __repr__(self):
+            str = "DownloadSummary <0x{:x}>\n\n".format(id(self))
+            str += "\tFiles      : {} of {} completed, {} failed\n".format(len(self.completed), self.numFiles, len(self.failures))
+            str += "\tBytes      : {}\n".format(self.bytesDownloaded)
+            str += "\tElapsed    : {:.2f} s\n".format(self.elapsed)
+            str += "\tThroughput : {:.0f} bytes/s\n".format(self.throughput)
+            for path, e in self.failures.items():
+                str += "\tFailed     : {} ({})\n".format(path, repr(e))
+            return str
+
+        @property
+        def elapsed(self):
+            """Seconds elapsed since the downloads started"""
+            endTime = self.endTime if self.endTime != None else time.monotonic()
+            return endTime - self.startTime
+
+        @property
+        def throughput(self):
+            """Average download rate in bytes per second"""
+            elapsed = self.elapsed
+            if elapsed <= 0:
+                return 0.0
+            return self.bytesDownloaded / elapsed
+
+        @property
+        def numRemaining(self):
+            """Number of files neither completed nor failed"""
+            return self.numFiles - len(self.completed) - len(self.failures)
+
+        def addBytes(self, nBytes):
+            with self.__lock:
+                self.bytesDownloaded += nBytes
+
+        def addCompleted(self, path, filename):
+            with self.__lock:
+                self.completed[path] = filename
+
+        def addFailure(self, path, exception):
+            with self.__lock:
+                self.failures[path] = exception
+
+        def finish(self):
+            self.endTime = time.monotonic()
+
+    class Manifest:
+        """
+        Local index of files mirrored by :py:meth:`Data.sync`
+
+        The manifest is a JSON file mapping each ApRES path to the
+        size and timestamp of the file when it was last downloaded.
+        """
+
+        #: Default manifest filename
+        DEFAULT_NAME = ".apreshttp-manifest.json"
+
+        def __init__(self, filename):
+            #: Path of the manifest file
+            self.filename = filename
+            #: Dictionary of {"size", "timestamp"} entries keyed by ApRES path
+            self.entries = dict()
+
+            if os.path.isfile(filename):
+                with open(filename, 'r') as fh:
+                    self.entries = json.load(fh)
+
+        def isCurrent(self, file, localFilename):
+            """
+            Check whether a file is unchanged since it was last synced
+
+            :param file: file on the ApRES filesystem
+            :type file: :py:class:`apreshttp.Data.FileObject`
+            :param localFilename: path of the local copy of the file
+            :type localFilename: str
+            :rtype: boolean
+            """
+
+            if not file.path in self.entries:
+                return False
+
+            entry = self.entries[file.path]
+
+            return entry["size"] == file.size \
+                and entry["timestamp"] == file.date.strftime("%Y-%m-%d %H:%M:%S") \
+                and os.path.isfile(localFilename) \
+                and os.path.getsize(localFilename) == file.size
+
+        def update(self, file):
+            """
+            Record a file as synced
+            """
+
+            self.entries[file.path] = {
+                "size" : file.size,
+                "timestamp" : file.date.strftime("%Y-%m-%d %H:%M:%S")
+            }
+
+        def prune(self, path, paths):
+            """
+            Remove entries beneath `path` which are not in `paths`
+
+            :param path: directory on the ApRES filesystem which was walked
+            :type path: str
+            :param paths: ApRES paths of the files found by the walk
+            :type paths: collection
+            :return: number of entries removed
+            :rtype: int
+            """
+
+            prefix = path.strip("/")
+            if len(prefix) > 0:
+                prefix = prefix + "/"
+
+            seen = set(p.strip("/") for p in paths)
+            stale = [
+                key for key in self.entries
+                if key.strip("/").startswith(prefix)
+                and not key.strip("/") in seen
+            ]
+
+            for key in stale:
+                del self.entries[key]
+
+            return len(stale)
+
+        def save(self):
+            """
+            Write the manifest to disk, replacing it atomically
+            """
+
+            directory = os.path.dirname(self.filename)
+            if len(directory) > 0:
+                os.makedirs(directory, exist_ok=True)
+
+            tmpname = self.filename + Data.PARTIAL_SUFFIX
+            with open(tmpname, 'w') as fh:
+                json.dump(self.entries, fh, indent=1, sort_keys=True)
+            os.replace(tmpname, self.filename)
+
+    class SyncResult:
+        """
+        Plan and outcome of :py:meth:`Data.sync`
+        """
+
+        def __init__(self):
+            #: Files which are new or changed (:py:class:`apreshttp.Data.FileObject`)
+            self.toDownload = []
+            #: Files which are unchanged since the last sync
+            self.upToDate = []
+            #: :py:class:`apreshttp.Data.DownloadSummary`, or `None` if nothing was downloaded
+            self.summary = None
+
+        def __repr__(self):
+            str = "SyncResult <0x{:x}> with {} files to download and {} up to date\n\n".format(id(self), len(self.toDownload), len(self.upToDate))
+            if len(self.toDownload) > 0:
+                str += "\tTo download\n"
+                for fil in self.toDownload:
+                    str += "\t\t{} [{} bytes, last modified {}]\n".format(fil.path, fil.size, fil.date)
+                str += "\n"
+            if self.summary != None:
+                str += repr(self.summary)
+            return str
+
+    class DirectoryListing:
+        """
+        Represents files stored on the ApRES SD card
+        """
+
+        def __init__(self, resp_json):
+            """
             Create a new DirectoryListing from parsed JSON data
             """
 
@@ -1549,57 +3915,1561 @@ class Data(APIChild):
             self.date = datetimeobj
 
 
-        def download(self, api, dst_path=None):
+        def download(self, api, dst_path=None, chunkSize=None, resume=False):
             """
             Download the file to the working dir or the destination path
 
-            See the documentation for :py:meth:`apreshttp.Data.download`
+            See the documentation for :py:meth:`apreshttp.Data.download`.
+            The downloaded file is checked against :py:attr:`size`.
             
             :param api: instance of the apreshttp API
             :type api: apreshttp.API
             
             :param dst_path: destination path to download file to
             :type dst_path: str
+
+            :param chunkSize: size in bytes of chunks written to disk
+            :type chunkSize: int
+
+            :param resume: resume a previous partial download of the file
+            :type resume: boolean
+
+            :return: local filename of the downloaded file
+            :rtype: str
             """
 
-            api.data.download(self.path, dst_path)
+            return api.data.download(self.path, dst_path, chunkSize, resume, self.size)
 
 
 
     
 
 ################################################################################
-# Exceptions
+# CATALOG
+################################################################################
 
-class InvalidAPIKeyException(Exception):
-    pass
+class Catalog:
+    """
+    Local SQLite history of radar status, configuration, results and files
 
-class InternalRadarErrorException(Exception):
-    pass
+    When assigned to :py:attr:`API.catalog`, every housekeeping
+    status, radar configuration, burst result, directory listing and
+    completed download read through the API is recorded, keyed by the
+    root URL of the radar.  A catalog can be shared by many APIs (for
+    example those of a :py:class:`Fleet`) and between threads.
 
-class RadarBusyException(Exception):
-    pass
+    .. code-block:: python
 
-class NotFoundException(Exception):
-    pass
+        catalog = apreshttp.Catalog("apres.db")
+        api.catalog = catalog
 
-class SystemResetException(Exception):
-    pass
+        # Index the SD card once, then download what is missing
+        list(api.data.walk("Survey"))
+        for file in catalog.notDownloaded(api.root, "Survey"):
+            api.data.download(file["path"], "bursts", size = file["size"])
 
-class SystemHousekeepingException(Exception):
-    pass
+    Queries return lists of dictionaries, one per row, in time (or
+    path) order.  Times are stored as seconds since the epoch, except
+    file modification times, which are stored as reported by the radar
+    in :py:attr:`TIME_FORMAT`.  `start` and `end` arguments may be given
+    as :py:class:`datetime.datetime` objects or seconds since the epoch.
+    """
 
-class BadResponseException(Exception):
-    pass
+    #: Tables and indexes created in a new catalog
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS status (
+            root TEXT NOT NULL,
+            time REAL NOT NULL,
+            batteryVoltage REAL,
+            latitude REAL,
+            longitude REAL,
+            timeGPS TEXT,
+            timeVAB TEXT
+        );
+        CREATE INDEX IF NOT EXISTS statusTime ON status (root, time);
+
+        CREATE TABLE IF NOT EXISTS config (
+            root TEXT NOT NULL,
+            time REAL NOT NULL,
+            nAttenuators INTEGER,
+            nSubBursts INTEGER,
+            nAverages INTEGER,
+            rfAttn TEXT,
+            afGain TEXT,
+            txAntenna TEXT,
+            rxAntenna TEXT,
+            userData TEXT
+        );
+        CREATE INDEX IF NOT EXISTS configTime ON config (root, time);
+
+        CREATE TABLE IF NOT EXISTS results (
+            root TEXT NOT NULL,
+            time REAL NOT NULL,
+            type TEXT NOT NULL,
+            nAttenuators INTEGER,
+            startFrequency REAL,
+            stopFrequency REAL,
+            period REAL,
+            nAverages INTEGER,
+            filename TEXT,
+            chirpMean TEXT,
+            chirpStd TEXT,
+            chirpMin TEXT,
+            chirpMax TEXT
+        );
+        CREATE INDEX IF NOT EXISTS resultsTime ON results (root, time);
+        CREATE INDEX IF NOT EXISTS resultsFilename ON results (root, filename);
+
+        CREATE TABLE IF NOT EXISTS files (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            name TEXT,
+            directory INTEGER NOT NULL,
+            size INTEGER,
+            modified TEXT,
+            seen REAL NOT NULL,
+            PRIMARY KEY (root, path)
+        );
+        CREATE INDEX IF NOT EXISTS filesModified ON files (root, modified);
+
+        CREATE TABLE IF NOT EXISTS downloads (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            size INTEGER,
+            time REAL NOT NULL,
+            PRIMARY KEY (root, path)
+        );
+    """
 
-class NoFileUploadedError(Exception):
-    pass
+    #: Format of file modification times in the catalog
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-class NoChirpStartedException(Exception):
-    pass
+    def __init__(self, filename = ":memory:"):
+        """
+        Open a catalog, creating it if it does not exist
 
-class ResultsTimeoutException(Exception):
-    pass
+        :param filename: path of the SQLite database, or ":memory:" for a temporary catalog
+        :type filename: str
+        """
 
-class DidNotUpdateException(Exception):
+        #: Path of the SQLite database
+        self.filename = filename
+        #: Lock held while the database is used
+        self.lock = threading.Lock()
+        #: Paths recorded so far from each directory being listed page by page
+        self.listed = dict()
+
+        self.connection = sqlite3.connect(filename, check_same_thread = False, isolation_level = None)
+        self.connection.row_factory = sqlite3.Row
+
+        with self.lock:
+            if filename != ":memory:":
+                # Allow other processes to read while the catalog is written
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the database connection
+        """
+
+        with self.lock:
+            self.connection.close()
+
+    def __execute(self, sql, parameters = ()):
+        with self.lock:
+            return self.connection.execute(sql, parameters)
+
+    def __query(self, sql, parameters = ()):
+        with self.lock:
+            return [dict(row) for row in self.connection.execute(sql, parameters)]
+
+    def __timeRange(self, column, start, end):
+        """
+        Return an SQL condition and parameters for a time range
+        """
+
+        condition = ""
+        parameters = []
+        if start != None:
+            condition += " AND {} >= ?".format(column)
+            parameters.append(self.timestamp(start))
+        if end != None:
+            condition += " AND {} < ?".format(column)
+            parameters.append(self.timestamp(end))
+        return condition, parameters
+
+    @staticmethod
+    def timestamp(value):
+        """
+        Convert a :py:class:`datetime.datetime` to seconds since the epoch
+        """
+
+        if isinstance(value, datetime.datetime):
+            return value.timestamp()
+        return float(value)
+
+    @classmethod
+    def modifiedTime(cls, value):
+        """
+        Convert a :py:class:`datetime.datetime` or seconds since the epoch
+        to a file modification time in :py:attr:`TIME_FORMAT`
+
+        Seconds since the epoch are converted to local time, as used by
+        the radar clock.
+        """
+
+        if not isinstance(value, datetime.datetime):
+            value = datetime.datetime.fromtimestamp(float(value))
+        return value.strftime(cls.TIME_FORMAT)
+
+    @staticmethod
+    def pathPrefix(path):
+        """
+        Return the range of catalog paths within a directory
+
+        :return: (lowest, highest) paths
+        :rtype: tuple
+        """
+
+        path = path.strip("/")
+        if len(path) == 0:
+            return "", "\U0010ffff"
+        return path + "/", path + "/\U0010ffff"
+
+    def recordStatus(self, root, status, when = None):
+        """
+        Record a housekeeping status
+
+        :param root: root URL of the radar
+        :type root: str
+        :param status: housekeeping status
+        :type status: :py:class:`System.Housekeeping.Status`
+        :param when: time the status was read, or `None` for now
+        """
+
+        self.__execute(
+            "INSERT INTO status VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                root,
+                self.timestamp(when) if when != None else time.time(),
+                status.batteryVoltage,
+                status.latitude,
+                status.longitude,
+                status.timeGPS.strftime(self.TIME_FORMAT) if status.timeGPS != None else None,
+                status.timeVAB.strftime(self.TIME_FORMAT) if status.timeVAB != None else None
+            )
+        )
+
+    def recordConfig(self, root, config, when = None):
+        """
+        Record a snapshot of the radar burst configuration
+
+        :param root: root URL of the radar
+        :type root: str
+        :param config: radar configuration
+        :type config: :py:class:`Radar.Config`
+        :param when: time the configuration was read, or `None` for now
+        """
+
+        self.__execute(
+            "INSERT INTO config VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                root,
+                self.timestamp(when) if when != None else time.time(),
+                config.nAttenuators,
+                config.nSubBursts,
+                config.nAverages,
+                json.dumps(config.rfAttn),
+                json.dumps(config.afGain),
+                json.dumps(config.txAntenna),
+                json.dumps(config.rxAntenna),
+                config.userData
+            )
+        )
+
+    def recordResults(self, root, results, when = None):
+        """
+        Record a summary of trial or burst results
+
+        For trial bursts the mean, standard deviation, minimum and
+        maximum chirp voltage of each attenuator setting are stored,
+        rather than the chirps themselves.  For bursts the filename
+        is stored.
+
+        :param root: root URL of the radar
+        :type root: str
+        :param results: burst results
+        :type results: :py:class:`Radar.Results`
+        :param when: time the results were read, or `None` for now
+        """
+
+        summary = [None] * 4
+        if results.type == "trial" and results.chirp.size > 0:
+            summary = [
+                json.dumps(numpy.asarray(values, dtype = numpy.float64).tolist()) for values in (
+                    results.chirp.mean(axis = -1),
+                    results.chirp.std(axis = -1),
+                    results.chirp.min(axis = -1),
+                    results.chirp.max(axis = -1)
+                )
+            ]
+
+        self.__execute(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                root,
+                self.timestamp(when) if when != None else time.time(),
+                results.type,
+                results.nAttenuators,
+                results.startFrequency,
+                results.stopFrequency,
+                results.period,
+                getattr(results, "nAverages", None),
+                getattr(results, "filename", None)
+            ] + summary
+        )
+
+    def recordListing(self, root, listing, when = None):
+        """
+        Record the files and directories of a directory listing
+
+        Existing entries for the same paths are replaced.  Once every
+        page of a directory has been recorded, starting from the first,
+        entries no longer in the directory (and anything beneath them)
+        are removed, so files deleted from the SD card are dropped from
+        the index.
+
+        :param root: root URL of the radar
+        :type root: str
+        :param listing: directory listing
+        :type listing: :py:class:`Data.DirectoryListing`
+        :param when: time the listing was read, or `None` for now
+        """
+
+        seen = self.timestamp(when) if when != None else time.time()
+        path = (listing.path if listing.path != None else "").strip("/")
+        rows = [
+            (
+                root,
+                file.path.strip("/"),
+                file.name,
+                int(directory),
+                file.size,
+                file.date.strftime(self.TIME_FORMAT),
+                seen
+            )
+            for directory, files in ((False, listing.files), (True, listing.directories))
+            for file in files
+        ]
+
+        with self.lock:
+            # Collect the paths listed on each page of the directory
+            if listing.index == 0:
+                self.listed[(root, path)] = set()
+            listed = self.listed.get((root, path))
+            if listed != None:
+                listed.update(row[1] for row in rows)
+            complete = listing.index + listing.numObjectsInList >= listing.numObjectsInDir
+
+            with self.connection:
+                self.connection.execute("BEGIN")
+                self.connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+                if listed != None and complete:
+                    del self.listed[(root, path)]
+                    lowest, highest = self.pathPrefix(path)
+                    stale = [
+                        (root, file) for (file,) in self.connection.execute(
+                            "SELECT path FROM files WHERE root = ? AND path >= ? AND path < ?",
+                            (root, lowest, highest)
+                        )
+                        if lowest + file[len(lowest):].split("/", 1)[0] not in listed
+                    ]
+                    self.connection.executemany("DELETE FROM files WHERE root = ? AND path = ?", stale)
+
+    def recordDownload(self, root, path, filename, size = None, when = None):
+        """
+        Record a completed download
+
+        :param root: root URL of the radar
+        :type root: str
+        :param path: path of the file on the ApRES filesystem
+        :type path: str
+        :param filename: local filename of the download
+        :type filename: str
+        :param size: size of the file in bytes, or `None` to use the local file size
+        :type size: int
+        :param when: time the download finished, or `None` for now
+        """
+
+        if size == None:
+            size = os.path.getsize(filename)
+
+        self.__execute(
+            "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?, ?)",
+            (
+                root,
+                path.strip("/"),
+                os.path.abspath(filename),
+                size,
+                self.timestamp(when) if when != None else time.time()
+            )
+        )
+
+    def radars(self):
+        """
+        Return the root URLs of every radar in the catalog
+
+        :rtype: list of str
+        """
+
+        rows = self.__query(
+            "SELECT root FROM status UNION SELECT root FROM config "
+            "UNION SELECT root FROM results UNION SELECT root FROM files ORDER BY root"
+        )
+        return [row["root"] for row in rows]
+
+    def status(self, root, start = None, end = None):
+        """
+        Return housekeeping status samples recorded between `start` and `end`
+
+        :param root: root URL of the radar
+        :type root: str
+        :rtype: list of dict
+        """
+
+        condition, parameters = self.__timeRange("time", start, end)
+        return self.__query(
+            "SELECT * FROM status WHERE root = ?" + condition + " ORDER BY time",
+            [root] + parameters
+        )
+
+    def config(self, root, start = None, end = None):
+        """
+        Return configuration snapshots recorded between `start` and `end`
+
+        Attenuator and antenna settings are decoded to lists.
+
+        :param root: root URL of the radar
+        :type root: str
+        :rtype: list of dict
+        """
+
+        condition, parameters = self.__timeRange("time", start, end)
+        rows = self.__query(
+            "SELECT * FROM config WHERE root = ?" + condition + " ORDER BY time",
+            [root] + parameters
+        )
+        for row in rows:
+            for key in ("rfAttn", "afGain", "txAntenna", "rxAntenna"):
+                row[key] = json.loads(row[key])
+        return rows
+
+    def results(self, root, start = None, end = None, type = None):
+        """
+        Return results summaries recorded between `start` and `end`
+
+        :param root: root URL of the radar
+        :type root: str
+        :param type: "trial" or "burst" to return only that type of results
+        :type type: str
+        :rtype: list of dict
+        """
+
+        condition, parameters = self.__timeRange("time", start, end)
+        if type != None:
+            condition += " AND type = ?"
+            parameters.append(type)
+
+        rows = self.__query(
+            "SELECT * FROM results WHERE root = ?" + condition + " ORDER BY time",
+            [root] + parameters
+        )
+        for row in rows:
+            for key in ("chirpMean", "chirpStd", "chirpMin", "chirpMax"):
+                if row[key] != None:
+                    row[key] = json.loads(row[key])
+        return rows
+
+    def bursts(self, root, start = None, end = None):
+        """
+        Return the results of bursts recorded between `start` and `end`
+
+        :param root: root URL of the radar
+        :type root: str
+        :rtype: list of dict
+        """
+
+        return self.results(root, start, end, "burst")
+
+    def files(self, root, path = "", start = None, end = None, directories = False):
+        """
+        Return indexed files beneath a directory
+
+        :param root: root URL of the radar
+        :type root: str
+        :param path: directory on the ApRES filesystem, searched recursively
+        :type path: str
+        :param start: only return files modified at or after this time
+        :type start: :py:class:`datetime.datetime` or float
+        :param end: only return files modified before this time
+        :type end: :py:class:`datetime.datetime` or float
+        :param directories: whether to include directories
+        :type directories: bool
+        :rtype: list of dict
+        """
+
+        lowest, highest = self.pathPrefix(path)
+        condition = ""
+        parameters = [root, lowest, highest]
+        if start != None:
+            condition += " AND modified >= ?"
+            parameters.append(self.modifiedTime(start))
+        if end != None:
+            condition += " AND modified < ?"
+            parameters.append(self.modifiedTime(end))
+        if not directories:
+            condition += " AND directory = 0"
+
+        return self.__query(
+            "SELECT * FROM files WHERE root = ? AND path >= ? AND path < ?" + condition + " ORDER BY path",
+            parameters
+        )
+
+    def downloads(self, root, path = ""):
+        """
+        Return recorded downloads of files beneath a directory
+
+        :param root: root URL of the radar
+        :type root: str
+        :param path: directory on the ApRES filesystem, searched recursively
+        :type path: str
+        :rtype: list of dict
+        """
+
+        lowest, highest = self.pathPrefix(path)
+        return self.__query(
+            "SELECT * FROM downloads WHERE root = ? AND path >= ? AND path < ? ORDER BY path",
+            (root, lowest, highest)
+        )
+
+    def notDownloaded(self, root, path = "", extension = None):
+        """
+        Return indexed files which have not been downloaded
+
+        Files whose size has changed since they were downloaded are
+        included.
+
+        :param root: root URL of the radar
+        :type root: str
+        :param path: directory on the ApRES filesystem, searched recursively
+        :type path: str
+        :param extension: if given, only return files with this extension, i.e. ".dat"
+        :type extension: str
+        :rtype: list of dict
+        """
+
+        lowest, highest = self.pathPrefix(path)
+        condition = ""
+        parameters = [root, lowest, highest]
+        if extension != None:
+            condition += " AND files.name LIKE ?"
+            parameters.append("%" + extension)
+
+        return self.__query(
+            "SELECT files.* FROM files LEFT JOIN downloads "
+            "ON downloads.root = files.root AND downloads.path = files.path "
+            "WHERE files.root = ? AND files.path >= ? AND files.path < ? AND files.directory = 0"
+            " AND (downloads.path IS NULL OR downloads.size != files.size)"
+            + condition + " ORDER BY files.path",
+            parameters
+        )
+
+################################################################################
+# FLEET
+################################################################################
+
+class Fleet:
+    """
+    Group of radars which can be operated on concurrently
+
+    A Fleet holds many :py:class:`API` instances, keyed by name, and
+    fans operations out across them using a bounded pool of worker
+    threads, so a fleet-wide status sweep takes about as long as the
+    slowest radar rather than the sum of all of them.  The result of
+    each operation, or the exception it raised, is collected per
+    radar in a :py:class:`Fleet.Result` rather than raised.
+
+    .. code-block:: python
+
+        with apreshttp.Fleet(maxWorkers = 8) as fleet:
+            for host in ["radar1.localnet", "radar2.localnet"]:
+                api = apreshttp.API(host)
+                api.setKey(...)
+                fleet.add(api)
+
+            status = fleet.status()
+            for name, error in status.errors.items():
+                print(name, "failed:", error)
+
+            fleet.burst(wait = True)
+            fleet.sync("Survey", "mirror")
+    """
+
+    def __init__(self, apis = None, maxWorkers = 8):
+        """
+        Create a fleet, optionally from a list of API instances
+
+        :param apis: API instances to add, named as in :py:meth:`add`
+        :type apis: list or `None`
+        :param maxWorkers: maximum number of radars operated on at once
+        :type maxWorkers: int
+        :raises ValueError: if maxWorkers is not a positive int
+        """
+
+        if not isinstance(maxWorkers, int) or maxWorkers < 1:
+            raise ValueError("maxWorkers should be a positive int")
+
+        #: Maximum number of radars operated on at once
+        self.maxWorkers = maxWorkers
+        #: Ordered dictionary of :py:class:`API` instances keyed by name
+        self.radars = collections.OrderedDict()
+
+        self.executor = None
+
+        if apis != None:
+            for api in apis:
+                self.add(api)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.radars)
+
+    def __iter__(self):
+        return iter(self.radars.values())
+
+    def __getitem__(self, name):
+        return self.radars[name]
+
+    def add(self, api, name = None):
+        """
+        Add a radar to the fleet
+
+        :param api: API instance of the radar
+        :type api: :py:class:`API`
+        :param name: name of the radar, defaulting to its host, i.e. radar.localnet
+        :type name: str
+        :raises TypeError: if `api` is not an :py:class:`API` instance
+        :raises KeyError: if a radar with the same name is already in the fleet
+        :return: the name of the radar
+        :rtype: str
+        """
+
+        if not isinstance(api, API):
+            raise TypeError("api should be an instance of apreshttp.API")
+
+        if name == None:
+            name = api.root[len("http://"):]
+        if name in self.radars:
+            raise KeyError("Radar '" + name + "' is already in the fleet")
+
+        self.radars[name] = api
+        return name
+
+    def remove(self, name):
+        """
+        Remove a radar from the fleet, returning its API instance
+        """
+
+        return self.radars.pop(name)
+
+    def close(self):
+        """
+        Shut down the worker threads and close the transport of each radar
+        """
+
+        if self.executor != None:
+            self.executor.shutdown(wait = True)
+            self.executor = None
+
+        for api in self.radars.values():
+            api.close()
+
+    def map(self, func, names = None, timeout = None):
+        """
+        Call `func` with the API of each radar concurrently
+
+        :param func: function accepting an :py:class:`API` instance
+        :type func: callable
+        :param names: names of the radars to operate on (defaults to all)
+        :type names: list or `None`
+        :param timeout: seconds to wait for all radars; radars which have not finished are recorded with a :py:class:`concurrent.futures.TimeoutError`
+        :type timeout: float or `None`
+        :rtype: :py:class:`Fleet.Result`
+        """
+
+        if not callable(func):
+            raise TypeError("Argument 'func' should be callable.")
+
+        return self.__fanOut(lambda name, api: func(api), names, timeout)
+
+    def __fanOut(self, func, names, timeout):
+        """
+        Call `func` with the name and API of each radar concurrently
+        """
+
+        if names == None:
+            names = list(self.radars.keys())
+
+        result = self.Result()
+
+        if self.executor == None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers = self.maxWorkers,
+                thread_name_prefix = "apreshttp-fleet"
+            )
+
+        futures = dict()
+        for name in names:
+            futures[self.executor.submit(func, name, self.radars[name])] = name
+
+        done, pending = concurrent.futures.wait(futures, timeout)
+
+        for future in pending:
+            future.cancel()
+            result.errors[futures[future]] = concurrent.futures.TimeoutError(
+                "Radar did not respond within {} seconds".format(timeout)
+            )
+
+        for future in done:
+            name = futures[future]
+            try:
+                result.results[name] = future.result()
+            except Exception as e:
+                result.errors[name] = e
+
+        result.finish()
+        return result
+
+    def status(self, names = None, timeout = None):
+        """
+        Read the housekeeping status of each radar
+
+        :return: result whose values are :py:class:`System.Housekeeping.Status` objects
+        :rtype: :py:class:`Fleet.Result`
+        """
+
+        return self.map(lambda api: api.system.housekeeping.status(), names, timeout)
+
+    def setConfig(self, names = None, timeout = None, **kwargs):
+        """
+        Update the burst configuration of each radar
+
+        Keyword arguments are passed to :py:meth:`Radar.Config.set`.
+
+        :return: result whose values are :py:class:`Radar.Config` objects
+        :rtype: :py:class:`Fleet.Result`
+        """
+
+        return self.map(lambda api: api.radar.config.set(**kwargs), names, timeout)
+
+    def burst(self, filename = None, userData = None, wait = True, names = None, timeout = None):
+        """
+        Start a burst on each radar at (nearly) the same time
+
+        The configuration of each radar is refreshed first, and the
+        burst requests then reuse it without a further refresh, so
+        they are sent as close together as possible.  Radars which
+        fail to refresh are not asked to burst.  If `wait` is enabled
+        the results of every started burst are then collected
+        concurrently, again reusing the refreshed configuration.
+
+        :param filename: filename used by each radar for the burst
+        :type filename: str
+        :param userData: user data stored with each burst
+        :type userData: str
+        :param wait: wait for the results of the bursts
+        :type wait: boolean
+        :return: result whose values are :py:class:`Radar.Results` objects if `wait` is enabled, otherwise `None`
+        :rtype: :py:class:`Fleet.Result`
+        """
+
+        prepared = self.map(lambda api: api.radar.config.get(api.configCacheTTL), names, timeout)
+        # Trust the configuration just read, however old it becomes
+        started = self.map(
+            lambda api: api.radar.burst(filename, userData, maxAge = math.inf),
+            [name for name in self.radars if name in prepared.results],
+            timeout
+        )
+
+        if wait:
+            finished = self.map(lambda api: api.radar.results(maxAge = math.inf), list(started.results), timeout)
+        else:
+            finished = started
+
+        finished.errors.update(prepared.errors)
+        finished.errors.update(started.errors)
+        finished.startTime = prepared.startTime
+        finished.finish()
+        return finished
+
+    def sync(self, path = "", dst_path = None, names = None, timeout = None, **kwargs):
+        """
+        Mirror a directory from each radar into its own local directory
+
+        Files from each radar are mirrored into a subdirectory of
+        `dst_path` (or the current working directory) named after
+        the radar, with any ":" replaced by "_".  Keyword arguments are
+        passed to :py:meth:`Data.sync`.
+
+        :return: result whose values are :py:class:`Data.SyncResult` objects
+        :rtype: :py:class:`Fleet.Result`
+        """
+
+        if dst_path == None:
+            dst_path = os.getcwd()
+
+        def syncRadar(name, api):
+            radarPath = os.path.join(dst_path, name.replace(":", "_").replace("/", "_"))
+            return api.data.sync(path, radarPath, **kwargs)
+
+        return self.__fanOut(syncRadar, names, timeout)
+
+    class Result:
+        """
+        Results and errors of an operation across a fleet
+        """
+
+        def __init__(self):
+            #: Dictionary of return values keyed by radar name
+            self.results = dict()
+            #: Dictionary of raised exceptions keyed by radar name
+            self.errors = dict()
+            #: Monotonic time at which the operation started
+            self.startTime = time.monotonic()
+            #: Duration of the operation in seconds
+            self.elapsed = None
+
+        def __repr__(self):
+            return "Fleet.Result({:d} succeeded, {:d} failed in {:.3f}s)".format(
+                len(self.results), len(self.errors), self.elapsed or 0
+            )
+
+        @property
+        def ok(self):
+            """`True` if the operation succeeded on every radar"""
+            return len(self.errors) == 0
+
+        def finish(self):
+            self.elapsed = time.monotonic() - self.startTime
+
+################################################################################
+# ASYNCIO
+################################################################################
+
+class AsyncAPI:
+    """
+    Entry-point class for asyncio access to the HTTP ApRES API
+
+    The AsyncAPI class mirrors :py:class:`API`, exposing the system,
+    radar and data elements of the ApRES HTTP API as coroutines so
+    that many radars can be supervised from a single event loop.  The
+    same :py:class:`apreshttp.System.Housekeeping.Status`,
+    :py:class:`apreshttp.Radar.Results` and
+    :py:class:`apreshttp.Data.DirectoryListing` objects are returned.
+
+    Requests are made through an :py:class:`AsyncTransport`, which
+    requires the `aiohttp` package to be installed.
+
+    .. code-block:: python
+
+        async def main():
+            async with apreshttp.AsyncAPI("http://radar.localnet") as api:
+                api.setKey(...)
+                status = await api.system.housekeeping.status()
+                results = await api.radar.trialBurst(wait = True)
+    """
+
+    setKey = API.setKey
+    assignRootURL = API.assignRootURL
+    assignDefaults = API.assignDefaults
+    debug = API.debug
+    nextRequestId = API.nextRequestId
+    addInstrument = API.addInstrument
+    removeInstrument = API.removeInstrument
+    reportRequest = API.reportRequest
+
+    def __init__(self, root, transport = None):
+        """
+        Initialise a new instance of the AsyncAPI specifying the root URL
+
+        See :py:meth:`API.__init__` for a description of `root`.
+
+        :param root: Root URL for the API to direct HTTP requests to
+        :type root: str
+        :param transport: transport used for all HTTP requests
+        :type transport: :py:class:`AsyncTransport` or `None`
+        """
+
+        # Set root URL
+        self.assignRootURL(root)
+
+        #: Persistent asyncio HTTP transport shared by all child objects
+        if transport == None:
+            transport = AsyncTransport()
+        elif not isinstance(transport, AsyncTransport):
+            raise TypeError("transport should be an instance of apreshttp.AsyncTransport")
+        self.transport = transport
+
+        # Assign root objects
+        self.system = AsyncSystem(self)
+        self.radar = AsyncRadar(self)
+        self.data = AsyncData(self)
+
+        self.assignDefaults()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the transport and any pooled connections to the radar
+        """
+
+        await self.transport.close()
+
+class AsyncTransport:
+    """
+    Persistent asyncio HTTP transport with a keep-alive connection pool
+
+    Wraps an :py:class:`aiohttp.ClientSession`, which is created on
+    first use within the running event loop.  `limit` caps the total
+    number of open connections and `limitPerHost` caps the number of
+    connections to each radar.
+    """
+
+    def __init__(self, limit = 100, limitPerHost = 4):
+        """
+        Create a new asyncio transport with the given pool limits
+
+        :param limit: maximum number of simultaneous connections
+        :type limit: int
+        :param limitPerHost: maximum number of simultaneous connections per host
+        :type limitPerHost: int
+        :raises ImportError: if `aiohttp` is not installed
+        :raises ValueError: if the limits are not positive integers
+        """
+
+        if aiohttp == None:
+            raise ImportError("AsyncTransport requires the 'aiohttp' package.")
+
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("limit should be a positive int")
+        if not isinstance(limitPerHost, int) or limitPerHost < 1:
+            raise ValueError("limitPerHost should be a positive int")
+
+        #: Maximum number of simultaneous connections
+        self.limit = limit
+        #: Maximum number of simultaneous connections per host
+        self.limitPerHost = limitPerHost
+
+        self.session = None
+
+    def open(self):
+        """
+        Create the underlying session in the running event loop
+        """
+
+        connector = aiohttp.TCPConnector(
+            limit = self.limit,
+            limit_per_host = self.limitPerHost
+        )
+        self.session = aiohttp.ClientSession(connector = connector)
+
+    async def close(self):
+        """
+        Close all pooled connections held by the transport
+        """
+
+        if self.session != None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, url, params = None, data = None, headers = None, timeout = None, allow_redirects = True, stream = False):
+        """
+        Perform a HTTP request and return an :py:class:`AsyncResponse`
+
+        Unless `stream` is enabled, the response body is read before
+        returning.  Streamed responses must be released by calling
+        :py:meth:`AsyncResponse.release`.
+        """
+
+        if self.session == None or self.session.closed:
+            self.open()
+
+        response = await self.session.request(
+            method,
+            url,
+            params = params,
+            data = data,
+            headers = headers,
+            # Like requests, the timeout applies to connecting and to
+            # each read, so long streamed downloads are not cut off
+            timeout = aiohttp.ClientTimeout(total = None, sock_connect = timeout, sock_read = timeout),
+            allow_redirects = allow_redirects
+        )
+
+        asyncResponse = AsyncResponse(response)
+        # JSON bodies are always read so that they can be validated
+        if not stream or asyncResponse.isJSON():
+            await asyncResponse.read()
+        return asyncResponse
+
+class AsyncResponse:
+    """
+    Response returned by :py:class:`AsyncTransport` requests
+
+    Exposes the subset of the :py:class:`requests.Response` interface
+    used by the response handling in :py:class:`APIChild` and its
+    subclasses, so the same parsing code serves both clients.
+    """
+
+    def __init__(self, response):
+
+        self.raw = response
+        #: HTTP status code
+        self.status_code = response.status
+        #: Case-insensitive dictionary of response headers
+        self.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        #: Requested URL
+        self.url = str(response.url)
+        #: Response body (`None` until read)
+        self.content = None
+        #: Function decoding the JSON body (see :py:attr:`API.jsonDecoder`)
+        self.jsonDecoder = json.loads
+
+    def isJSON(self):
+        """
+        Check whether the response body is JSON
+        """
+
+        return self.headers.get("Content-Type") == "application/json"
+
+    async def read(self):
+        """
+        Read the complete response body and release the connection
+        """
+
+        try:
+            self.content = await self.raw.read()
+        finally:
+            self.raw.release()
+        return self.content
+
+    async def iterContent(self, chunkSize):
+        """
+        Asynchronously iterate over the response body in chunks
+        """
+
+        async for chunk in self.raw.content.iter_chunked(chunkSize):
+            yield chunk
+
+    def release(self):
+        """
+        Release the connection back to the pool
+        """
+
+        self.raw.release()
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return self.jsonDecoder(self.content)
+
+class AsyncAPIChild(APIChild):
+    """
+    AsyncAPIChild objects provide awaitable POST and GET requests
+
+    AsyncAPIChild mirrors :py:class:`APIChild`, routing requests
+    through the :py:class:`AsyncTransport` of the parent
+    :py:class:`AsyncAPI` object.
+    """
+
+    async def postRequest(self, url, data_obj = None, stream = False, **kwargs):
+        """
+        Perform a POST request to the URL, passing an API key and data
+
+        See :py:meth:`APIChild.postRequest`.  File uploads are not
+        supported.
+        """
+
+        # Form complete URL
+        completeUrl = self.formCompleteURL(url)
+
+        if data_obj == None:
+            data_obj = dict()
+        else:
+            # Drop unset values (requests does this implicitly)
+            data_obj = {k : v for k, v in data_obj.items() if v != None}
+
+        if "apikey" not in data_obj.keys():
+            data_obj["apikey"] = self.api.apiKey
+
+        requestId = self.api.nextRequestId()
+
+        if self.api.debugEnable:
+            data_obj["requestid"] = requestId
+
+        self.api.debug("POST request to [{url:s}] with data:".format(url=completeUrl))
+        self.api.debug(data_obj)
+
+        response = await self.sendRequest(
+            "POST",
+            url,
+            completeUrl,
+            data = data_obj,
+            timeout = self.api.timeout,
+            stream = stream,
+            **kwargs
+        )
+
+        self.api.debug("Validating...")
+        self.validateResponse(response)
+        self.api.debug("Passed.")
+
+        return response
+
+    async def getRequest(self, url, data_obj = None, stream = False, **kwargs):
+        """
+        Perform a GET request to the URL, passing data as HTTP args
+
+        See :py:meth:`APIChild.getRequest`.  If `stream` is enabled,
+        non-JSON response bodies are not read before returning.
+        """
+
+        # Form complete URL
+        completeUrl = self.formCompleteURL(url)
+
+        # If data object is empty, convert into an empty dict
+        if data_obj == None:
+            data_obj = dict()
+
+        requestId = self.api.nextRequestId()
+
+        if self.api.debugEnable:
+            data_obj["requestid"] = requestId
+
+        self.api.debug("GET request to [{url:s}] with data:".format(url=completeUrl))
+        self.api.debug(data_obj)
+
+        response = await self.sendRequest(
+            "GET",
+            url,
+            completeUrl,
+            params = data_obj,
+            timeout = self.api.timeout,
+            stream = stream,
+            **kwargs
+        )
+
+        self.api.debug(response.url)
+
+        self.api.debug("Validating...")
+        self.validateResponse(response)
+        self.api.debug("Passed.")
+
+        return response
+
+    async def sendRequest(self, method, route, completeUrl, **kwargs):
+        """
+        Make a request through the transport, retrying if it fails
+
+        See :py:meth:`APIChild.sendRequest`.  Only the total time of
+        each attempt is measured.
+        """
+
+        policy = self.api.retryPolicy
+        breaker = self.api.circuitBreaker
+        attempt = 0
+
+        while True:
+
+            if breaker != None:
+                breaker.check()
+
+            try:
+                response = await self.__attempt(method, route, completeUrl, attempt, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if breaker != None:
+                    if isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+                        breaker.recordFailure()
+                    else:
+                        breaker.release()
+                if policy == None or not policy.shouldRetry(method, attempt, exception = e):
+                    raise
+                delay = policy.delay(attempt)
+            except BaseException:
+                # Including cancellation of the task
+                if breaker != None:
+                    breaker.release()
+                raise
+            else:
+                if breaker != None:
+                    breaker.recordSuccess()
+                if policy == None or not policy.shouldRetry(method, attempt, status = response.status_code):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                response.release()
+
+            self.api.debug("{} {} failed, retrying in {:.2f}s".format(method, route, delay))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __attempt(self, method, route, completeUrl, attempt, **kwargs):
+        """
+        Make a single request and report it to instruments
+        """
+
+        event = RequestEvent(route, method, completeUrl)
+        event.streamed = kwargs.get("stream", False)
+        event.retries = attempt
+
+        start = time.perf_counter()
+        try:
+            response = await self.api.transport.request(method, completeUrl, **kwargs)
+        except Exception as e:
+            event.error = e
+            raise
+        else:
+            response.jsonDecoder = self.api.jsonDecoder
+            event.status = response.status_code
+            if response.content != None:
+                event.responseBytes = len(response.content)
+            elif "Content-Length" in response.headers:
+                event.responseBytes = int(response.headers["Content-Length"])
+        finally:
+            event.totalTime = time.perf_counter() - start
+            self.api.reportRequest(event)
+
+        return response
+
+class AsyncSystem(AsyncAPIChild, System):
+    """
+    Asyncio version of :py:class:`System`
+    """
+
+    async def reset(self):
+        """
+        Reset the ApRES, see :py:meth:`System.reset`
+        """
+
+        response = await self.postRequest("system/reset")
+        self.api.radar.config.invalidate()
+        return self.readResetMessage(response)
+
+    class Housekeeping(AsyncAPIChild, System.Housekeeping):
+        """
+        Asyncio version of :py:class:`System.Housekeeping`
+
+        Only :py:meth:`status` is provided; config.ini up/download
+        should use the synchronous :py:class:`API`.
+        """
+
+        def __init__(self, api_obj):
+            self.api = api_obj
+
+        async def status(self):
+            """
+            Request an update on the ApRES battery, time, GPS, etc.
+
+            See :py:meth:`System.Housekeeping.status`.
+            """
+
+            response = await self.getRequest("system/housekeeping/status")
+            return self.readStatus(response)
+
+class AsyncRadar(AsyncAPIChild, Radar):
+    """
+    Asyncio version of :py:class:`Radar`
+
+    Results are awaited directly rather than collected in a separate
+    thread; use :py:func:`asyncio.create_task` to poll several radars
+    concurrently.
+    """
+
+    async def trialBurst(self, callback = None, updateCallback = None, wait = True):
+        """
+        Perform a trial burst using the current configuration
+
+        See :py:meth:`Radar.trialBurst`.  If `wait` is enabled, or a
+        callback is provided, the results are awaited and returned.
+        """
+
+        if callback != None and not callable(callback):
+            raise TypeError("Argument 'callback' should be callable.")
+
+        # Update config locally
+        await self.config.get(self.api.configCacheTTL)
+
+        response = await self.postRequest("radar/trial-burst", allow_redirects=False)
+
+        self.checkBurstResponse(response)
+        self.burstType = "trial"
+
+        if wait or callback != None or updateCallback != None:
+            return await self.results(callback, updateCallback)
+
+    async def burst(self, filename = None, userData = None, callback = None, updateCallback = None, wait = True, maxAge = None):
+        """
+        Perform a measurement radar burst using the current config
+
+        See :py:meth:`Radar.burst`.  If `wait` is enabled, or a
+        callback is provided, the results are awaited and returned.
+        """
+
+        if maxAge == None:
+            maxAge = self.api.configCacheTTL
+
+        # Update config locally
+        await self.config.get(maxAge)
+
+        data_obj = self.burstData(filename, userData)
+
+        response = await self.postRequest("radar/burst", data_obj, allow_redirects=False)
+
+        self.checkBurstResponse(response)
+        self.burstType = "burst"
+
+        if wait or callback != None or updateCallback != None:
+            return await self.results(callback, updateCallback, maxAge)
+
+    async def results(self, callback = None, updateCallback = None, maxAge = None):
+        """
+        Wait for results to be returned by the radar
+
+        See :py:meth:`Radar.results`.
+
+        :raises NoChirpStartedException: If the radar state is idle, no data is returned.
+        :raises ResultsTimeoutException: Raised if the timeout period is exceeded and no results are returned within this period.
+        :rtype: :py:class:`apreshttp.Radar.Results`
+        """
+
+        if callback != None and not callable(callback):
+            raise TypeError("Argument 'callback' should be callable.")
+
+        if maxAge == None:
+            maxAge = self.api.configCacheTTL
+
+        # Update config
+        await self.config.get(maxAge)
+
+        loop = asyncio.get_running_loop()
+        startTime = loop.time()
+        nChirps = self.expectedChirps()
+        deadline = startTime + self.resultsTimeout()
+
+        while loop.time() < deadline:
+
+            response = await self.getRequest("radar/results")
+
+            if self.resultsFinished(response):
+                results = self.readResults(response)
+                if callback != None:
+                    callback(results)
+                return results
+
+            if updateCallback != None:
+                updateCallback(response)
+
+            await asyncio.sleep(self.pollInterval(nChirps, loop.time() - startTime, response))
+
+        raise ResultsTimeoutException
+
+    class Config(AsyncAPIChild, Radar.Config):
+        """
+        Asyncio version of :py:class:`Radar.Config`
+        """
+
+        async def get(self, maxAge = 0):
+            """
+            Retrieve the latest radar burst configuration
+
+            See :py:meth:`Radar.Config.get`.
+            """
+
+            if self.isFresh(maxAge):
+                return self
+
+            response = await self.getRequest("radar/config", self.getData())
+            return self.readGetResponse(response)
+
+        async def set(
+            self, nAtts=None, nAverages = None, nBursts=None, rfAttnSet=None, afGainSet=None,
+            txAnt=None, rxAnt=None, userData = None
+        ):
+            """
+            Updates the radar burst configuration with the given parameters
+
+            See :py:meth:`Radar.Config.set`.
+            """
+
+            known = self.isFresh(self.api.configCacheTTL)
+            if not known and self.setNeedsConfig(nAtts, rfAttnSet, afGainSet):
+                await self.get()
+                known = True
+
+            data_obj, valid_rf, valid_af = self.setRequestData(
+                known, nAtts, nAverages, nBursts, rfAttnSet, afGainSet, txAnt, rxAnt, userData
+            )
+            if data_obj == None:
+                return self
+
+            response = await self.postRequest("radar/config", data_obj)
+
+            return self.readSetResponse(response, nAtts, nBursts, valid_rf, valid_af)
+
+class AsyncData(AsyncAPIChild, Data):
+    """
+    Asyncio version of :py:class:`Data`
+    """
+
+    async def dir(self, path="", startIndex=0, listSize=16):
+        """
+        Get a directory listing from the path specified
+
+        See :py:meth:`Data.dir`.
+
+        :rtype: :py:class:`apreshttp.Data.DirectoryListing`
+        """
+
+        if not isinstance(path, str):
+            raise ValueError("path should be of type 'str'")
+
+        data_obj = {
+            "path" : path,
+            "index" : startIndex,
+            "list" : listSize
+        }
+
+        response = await self.getRequest("data", data_obj)
+
+        return self.readDirectoryListing(response, path)
+
+    async def download(self, path, dst_path=None, chunkSize=None, resume=False, size=None, progressCallback=None):
+        """
+        Download a file to the working dir or the destination path
+
+        See :py:meth:`Data.download`.  File operations are run in a
+        worker thread, so they never block the event loop.
+        """
+
+        filename = await asyncio.to_thread(self.downloadFilename, path, dst_path, resume)
+        partname = filename + self.PARTIAL_SUFFIX
+
+        if chunkSize == None:
+            chunkSize = self.api.downloadChunkSize
+
+        offset = 0
+        if resume:
+            offset = await asyncio.to_thread(self.resumeOffset, filename, size)
+            if offset == None:
+                return filename
+
+        response = await self.getRequest(
+            "data/download",
+            {"path" : path},
+            stream = True,
+            headers = self.rangeHeaders(offset)
+        )
+
+        if not self.rangeMatches(response, offset):
+            # The radar returned a different range, so start again
+            response.release()
+            offset = 0
+            response = await self.getRequest(
+                "data/download",
+                {"path" : path},
+                stream = True
+            )
+
+        try:
+            mode, size = self.readDownloadHeaders(response, offset, size)
+
+            if mode != None:
+                fh = await asyncio.to_thread(open, partname, mode)
+                try:
+                    async for chunk in response.iterContent(chunkSize):
+                        await asyncio.to_thread(fh.write, chunk)
+                        if progressCallback != None:
+                            progressCallback(len(chunk))
+                finally:
+                    await asyncio.to_thread(fh.close)
+
+            return await asyncio.to_thread(self.finishDownload, filename, size, path)
+
+        except BaseException:
+            if not resume:
+                await asyncio.to_thread(self.removePartial, partname)
+            raise
+        finally:
+            response.release()
+
+################################################################################
+# Exceptions
+
+class InvalidAPIKeyException(Exception):
+    pass
+
+class InternalRadarErrorException(Exception):
+    pass
+
+class RadarBusyException(Exception):
+    pass
+
+class NotFoundException(Exception):
+    pass
+
+class SystemResetException(Exception):
+    pass
+
+class SystemHousekeepingException(Exception):
+    pass
+
+class BadResponseException(Exception):
+    pass
+
+class NoFileUploadedError(Exception):
+    pass
+
+class NoChirpStartedException(Exception):
+    pass
+
+class ResultsTimeoutException(Exception):
+    pass
+
+class DidNotUpdateException(Exception):
+    pass
+
+class CircuitOpenException(requests.exceptions.ConnectionError):
+    pass
+
+class IncompleteDownloadException(Exception):
     pass
@@ -0,0 +1,914 @@
+# Offline stand-in for the ApRES HTTP API, for tests and benchmarks
+import datetime
+import email.parser
+import email.policy
+import http.server
+import json
+import math
+import threading
+import time
+import urllib.parse
+
+import numpy
+
+class MockRadar:
+    """
+    In-process HTTP server emulating the ApRES HTTP API
+
+    MockRadar implements the routes used by :py:mod:`apreshttp`, so the
+    client can be exercised and benchmarked without radar hardware:
+
+    * system/reset
+    * system/housekeeping/status
+    * system/housekeeping/config
+    * radar/config
+    * radar/trial-burst
+    * radar/burst
+    * radar/results
+    * data
+    * data/download
+
+    Bursts take `chirpDuration` seconds per chirp, during which the
+    radar reports itself as chirping and refuses further bursts.  Full
+    bursts write a synthetic `.dat` file to the emulated SD card, and
+    arbitrarily large burst files can be added with
+    :py:meth:`addBurstFile` without holding them in memory.  Error
+    responses and dropped connections can be injected per route with
+    :py:meth:`injectError`.
+
+    .. code-block:: python
+
+        with apresmock.MockRadar(chirpDuration = 0.01) as radar:
+            api = apreshttp.API(radar.url)
+            api.setKey(radar.apiKey)
+            results = api.radar.trialBurst(wait = True)
+    """
+
+    def __init__(self, apiKey = "18052021", host = "127.0.0.1", port = 0,
+        chirpDuration = 1.0, latency = 0.0, nSamples = 40000, bandwidth = None):
+        """
+        Create a new mock radar (the server is not started)
+
+        :param apiKey: API key required for POST requests
+        :type apiKey: str
+        :param host: interface to listen on
+        :type host: str
+        :param port: port to listen on, or 0 to choose a free port
+        :type port: int
+        :param chirpDuration: seconds taken by each chirp
+        :type chirpDuration: float
+        :param latency: seconds added to the handling of every request
+        :type latency: float
+        :param nSamples: number of ADC samples per chirp
+        :type nSamples: int
+        :param bandwidth: maximum download rate in bytes per second, or `None` for no limit
+        :type bandwidth: float
+        """
+
+        #: API key required for POST requests
+        self.apiKey = apiKey
+        #: Seconds taken by each chirp
+        self.chirpDuration = chirpDuration
+        #: Seconds added to the handling of every request
+        self.latency = latency
+        #: Number of ADC samples per chirp
+        self.nSamples = nSamples
+        #: Maximum download rate in bytes per second (`None` for no limit)
+        self.bandwidth = bandwidth
+
+        #: Radar burst configuration, as returned by radar/config
+        self.config = {
+            "nAttenuators" : 1,
+            "nSubBursts" : 10,
+            "nAverages" : 1,
+            "rfAttn" : [0.0],
+            "afGain" : [-14],
+            "txAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+            "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+            "userData" : ""
+        }
+
+        #: Chirp parameters reported in results and burst headers
+        self.startFrequency = 200000000
+        self.stopFrequency = 400000000
+        self.period = 1
+
+        #: Reported housekeeping values
+        self.batteryVoltage = 12.4
+        self.latitude = 0.0
+        self.longitude = 0.0
+        self.gps = True
+
+        #: Contents of the system config.ini
+        self.configIni = ";apresmock config.ini\n[radar]\n"
+
+        #: Dictionary of :py:class:`MockFile` objects keyed by path
+        self.files = dict()
+
+        #: Log of handled requests as (method, route) tuples
+        self.requests = []
+
+        #: Number of system resets
+        self.resetCount = 0
+
+        #: Close the connection after this many bytes of the next download
+        self.dropDownloadAfter = None
+
+        #: :py:class:`threading.Barrier` waited on by every request
+        #: before it is handled, or `None`.  Sharing a barrier between
+        #: radars checks that requests to them are made concurrently.
+        self.requestBarrier = None
+
+        self.lock = threading.RLock()
+        self.errors = dict()
+        self.burst = None
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+        self.addFile("config.ini", self.configIni.encode("utf-8"))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """Root URL of the running server, i.e. http://127.0.0.1:port"""
+        return "http://{}:{:d}".format(self.host, self.port)
+
+    def start(self):
+        """
+        Start serving requests in a background thread
+        """
+
+        self.server = http.server.ThreadingHTTPServer(
+            (self.host, self.port),
+            self.handlerClass()
+        )
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+        self.thread = threading.Thread(
+            target = self.server.serve_forever,
+            kwargs = {"poll_interval" : 0.05},
+            daemon = True
+        )
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stop the server and wait for the serving thread to finish
+        """
+
+        if self.server != None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+    def addFile(self, path, data = b"", timestamp = None):
+        """
+        Add a file with the given content to the emulated SD card
+
+        :param path: path of the file, i.e. Survey/file.dat
+        :type path: str
+        :param data: file content
+        :type data: bytes
+        :param timestamp: last modified time (defaults to now)
+        :type timestamp: :py:class:`datetime.datetime`
+        :rtype: :py:class:`MockFile`
+        """
+
+        file = MockFile(normalisePath(path), data, timestamp)
+        with self.lock:
+            self.files[file.path] = file
+        return file
+
+    def addBurstFile(self, path, nSubBursts = None, size = None, timestamp = None, **kwargs):
+        """
+        Add a synthetic burst `.dat` file to the emulated SD card
+
+        The file size is set either by `nSubBursts` or approximately
+        by `size` in bytes.  Sample data is generated on demand, so
+        files much larger than memory can be served.  Further keyword
+        arguments override the current radar configuration (see
+        :py:class:`MockBurstFile`).
+
+        :rtype: :py:class:`MockBurstFile`
+        """
+
+        params = self.burstParameters()
+        params.update(kwargs)
+
+        if nSubBursts == None:
+            if size == None:
+                nSubBursts = params["nSubBursts"]
+            else:
+                chirpBytes = params["nSamples"] * 2 * params["nAttenuators"] \
+                    * sum(params["txAntenna"]) * sum(params["rxAntenna"])
+                nSubBursts = max(1, int(math.ceil(size / chirpBytes)))
+        params["nSubBursts"] = nSubBursts
+
+        file = MockBurstFile(normalisePath(path), timestamp = timestamp, **params)
+        with self.lock:
+            self.files[file.path] = file
+        return file
+
+    def removeFile(self, path):
+        """
+        Remove a file from the emulated SD card
+
+        :param path: path of the file, i.e. Survey/file.dat
+        :type path: str
+        """
+
+        with self.lock:
+            del self.files[normalisePath(path)]
+
+    def injectError(self, route, status, message = None, count = 1):
+        """
+        Return an error for the next `count` requests to `route`
+
+        If `status` is `None` the connection is closed without a
+        response, emulating a dropped link.  Otherwise a JSON body
+        with `errorCode` and `errorMessage` keys is returned.
+
+        :param route: API route, i.e. radar/results
+        :type route: str
+        :param status: HTTP status code, or `None` to drop the connection
+        :type status: int
+        :param message: error message
+        :type message: str
+        :param count: number of requests to fail
+        :type count: int
+        """
+
+        with self.lock:
+            self.errors[route] = [status, message or "Injected error", count]
+
+    def requestCount(self, route = None, method = None):
+        """
+        Count the handled requests, optionally filtered by route/method
+        """
+
+        with self.lock:
+            return len([
+                r for r in self.requests
+                if (route == None or r[1] == route) and (method == None or r[0] == method)
+            ])
+
+    def burstParameters(self):
+        """
+        Return the parameters of a burst using the current config
+        """
+
+        with self.lock:
+            return {
+                "nSubBursts" : self.config["nSubBursts"],
+                "nAttenuators" : self.config["nAttenuators"],
+                "nSamples" : self.nSamples,
+                "rfAttn" : list(self.config["rfAttn"]),
+                "afGain" : list(self.config["afGain"]),
+                "txAntenna" : list(self.config["txAntenna"]),
+                "rxAntenna" : list(self.config["rxAntenna"]),
+                "userData" : self.config["userData"],
+                "startFrequency" : self.startFrequency,
+                "stopFrequency" : self.stopFrequency,
+                "period" : self.period
+            }
+
+    ############################################################################
+    # Radar state
+
+    def startBurst(self, type, filename = None):
+        """
+        Start a trial or full burst, returning an error message if busy
+        """
+
+        with self.lock:
+            if self.burst != None and self.burstState()["status"] == "chirping":
+                return "Radar is already performing a burst."
+
+            params = self.burstParameters()
+            nPairs = sum(params["txAntenna"]) * sum(params["rxAntenna"])
+
+            if type == "trial":
+                nChirps = self.config["nAverages"] * params["nAttenuators"] * nPairs
+            else:
+                if filename == None or len(filename) == 0:
+                    filename = datetime.datetime.now().strftime("%Y%m%d_%H-%M-%S") + ".dat"
+                filename = "Survey/" + normalisePath(filename)
+                if filename in self.files:
+                    return "File " + filename + " already exists."
+                nChirps = params["nSubBursts"] * params["nAttenuators"] * nPairs
+
+            self.burst = {
+                "type" : type,
+                "params" : params,
+                "nAverages" : self.config["nAverages"],
+                "nChirps" : nChirps,
+                "start" : time.monotonic(),
+                "chirpDuration" : self.chirpDuration,
+                "filename" : filename,
+                "results" : None
+            }
+
+        return None
+
+    def burstState(self):
+        """
+        Return the radar/results JSON for the current burst
+        """
+
+        with self.lock:
+            if self.burst == None:
+                return {"status" : "idle"}
+
+            burst = self.burst
+            if burst["results"] != None:
+                return burst["results"]
+
+            params = burst["params"]
+            elapsed = time.monotonic() - burst["start"]
+            chirpsDone = int(elapsed / burst["chirpDuration"]) if burst["chirpDuration"] > 0 else burst["nChirps"]
+
+            if chirpsDone < burst["nChirps"]:
+                state = {"status" : "chirping", "type" : burst["type"]}
+                if burst["type"] == "burst":
+                    chirpsPerSubBurst = burst["nChirps"] // params["nSubBursts"]
+                    state["chirpNumber"] = chirpsDone // chirpsPerSubBurst
+                return state
+
+            burst["results"] = self.finishBurst(burst)
+            return burst["results"]
+
+    def finishBurst(self, burst):
+        """
+        Form the results of a completed burst
+        """
+
+        params = burst["params"]
+
+        results = {
+            "status" : "finished",
+            "type" : burst["type"],
+            "nAttenuators" : params["nAttenuators"],
+            "rfAttn" : params["rfAttn"],
+            "afGain" : params["afGain"],
+            "startFrequency" : params["startFrequency"],
+            "stopFrequency" : params["stopFrequency"],
+            "period" : params["period"]
+        }
+
+        if burst["type"] == "trial":
+            chirps = syntheticChirps(0, params["nAttenuators"], params["nSamples"])
+            results["nAverages"] = burst["nAverages"]
+            results["chirp"] = chirps.tolist()
+            results["histogram"] = [
+                numpy.histogram(chirp, bins = 50, range = (0, 65536))[0].tolist()
+                for chirp in chirps
+            ]
+        else:
+            results["nSubBursts"] = params["nSubBursts"]
+            results["filename"] = burst["filename"]
+            self.files[burst["filename"]] = MockBurstFile(burst["filename"], **params)
+
+        return results
+
+    def reset(self):
+        """
+        Emulate a system reset, abandoning any burst in progress
+        """
+
+        with self.lock:
+            self.burst = None
+            self.resetCount += 1
+
+    def updateConfig(self, fields):
+        """
+        Apply radar/config POST fields, returning an error message or `None`
+        """
+
+        with self.lock:
+            config = json.loads(json.dumps(self.config))
+
+            try:
+                if "nAttenuators" in fields:
+                    nAtts = int(float(fields["nAttenuators"]))
+                    if nAtts < 1 or nAtts > 4:
+                        return "nAttenuators should be in the range 1 to 4"
+                    config["rfAttn"] = (config["rfAttn"] + [config["rfAttn"][-1]] * 4)[0:nAtts]
+                    config["afGain"] = (config["afGain"] + [config["afGain"][-1]] * 4)[0:nAtts]
+                    config["nAttenuators"] = nAtts
+
+                for key in ("nSubBursts", "nAverages"):
+                    if key in fields:
+                        value = int(float(fields[key]))
+                        if value < 1:
+                            return key + " should be at least 1"
+                        config[key] = value
+
+                for i in range(config["nAttenuators"]):
+                    key = "rfAttn" + str(i + 1)
+                    if key in fields:
+                        config["rfAttn"][i] = float(fields[key])
+                    key = "afGain" + str(i + 1)
+                    if key in fields:
+                        config["afGain"][i] = int(float(fields[key]))
+
+                for key in ("txAntenna", "rxAntenna"):
+                    if key in fields:
+                        value = [int(v) for v in fields[key].split(",")]
+                        if len(value) != 8 or any(v not in (0, 1) for v in value):
+                            return key + " should be 8 comma separated values of 0 or 1"
+                        config[key] = value
+
+                if "userData" in fields:
+                    config["userData"] = fields["userData"][0:32]
+
+            except ValueError as e:
+                return str(e)
+
+            self.config = config
+            return None
+
+    ############################################################################
+    # HTTP handling
+
+    def handlerClass(self):
+        """
+        Return a request handler class bound to this radar
+        """
+
+        radar = self
+
+        class Handler(MockRequestHandler):
+            pass
+
+        Handler.radar = radar
+        return Handler
+
+    def listDirectory(self, path):
+        """
+        Return the file objects in a directory, or `None` if not found
+        """
+
+        path = normalisePath(path)
+        prefix = path + "/" if len(path) > 0 else ""
+        entries = dict()
+
+        with self.lock:
+            files = list(self.files.values())
+
+        for file in files:
+            if not file.path.startswith(prefix):
+                continue
+            parts = file.path[len(prefix):].split("/")
+            if len(parts) == 1:
+                entries[file.path] = file.describe()
+            else:
+                dirPath = prefix + parts[0]
+                if dirPath not in entries:
+                    entries[dirPath] = {
+                        "name" : parts[0],
+                        "path" : dirPath,
+                        "size" : 0,
+                        "timestamp" : file.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                        "dir" : True
+                    }
+
+        if len(entries) == 0 and len(path) > 0:
+            return None
+
+        return [entries[key] for key in sorted(entries)]
+
+class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Handles requests to a :py:class:`MockRadar`
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    radar = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method):
+
+        radar = self.radar
+        url = urllib.parse.urlparse(self.path)
+        route = url.path[len("/api/"):] if url.path.startswith("/api/") else None
+
+        fields = {k : v[-1] for k, v in urllib.parse.parse_qs(url.query, keep_blank_values = True).items()}
+        uploads = dict()
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            postFields, uploads = parseBody(self.headers.get("Content-Type", ""), body)
+            fields.update(postFields)
+
+        with radar.lock:
+            radar.requests.append((method, route))
+            error = radar.errors.get(route)
+            if error != None:
+                error[2] -= 1
+                if error[2] <= 0:
+                    del radar.errors[route]
+            barrier = radar.requestBarrier
+
+        if barrier != None:
+            barrier.wait()
+
+        if radar.latency > 0:
+            time.sleep(radar.latency)
+
+        if error != None:
+            if error[0] == None:
+                self.close_connection = True
+                self.connection.close()
+                return
+            return self.sendError(error[0], error[1])
+
+        handler = ROUTES.get((method, route))
+        if handler == None:
+            return self.sendError(404, "Route not found")
+
+        if method == "POST" and fields.get("apikey") != radar.apiKey:
+            return self.sendError(401, "Invalid API key")
+
+        handler(self, fields, uploads)
+
+    def sendJSON(self, status, obj, headers = None):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendError(self, status, message):
+        self.sendJSON(status, {"errorCode" : status, "errorMessage" : message})
+
+    def sendText(self, status, text):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendRedirect(self, location):
+        self.send_response(303)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def system_reset(self, fields, uploads):
+        self.radar.reset()
+        self.sendJSON(202, {
+            "message" : "Resetting radar",
+            "time" : datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+
+    def system_status(self, fields, uploads):
+        radar = self.radar
+        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.sendJSON(200, {
+            "batteryVoltage" : radar.batteryVoltage,
+            "timeVAB" : now,
+            "timeGPS" : now if radar.gps else "",
+            "latitude" : radar.latitude if radar.gps else 0,
+            "longitude" : radar.longitude if radar.gps else 0
+        })
+
+    def system_config_get(self, fields, uploads):
+        self.sendText(200, self.radar.configIni)
+
+    def system_config_post(self, fields, uploads):
+        if not "file" in uploads:
+            return self.sendError(400, "No file uploaded")
+        radar = self.radar
+        radar.configIni = uploads["file"].decode("utf-8")
+        radar.addFile("config.ini", uploads["file"])
+        self.sendText(201, radar.configIni)
+
+    def radar_config_get(self, fields, uploads):
+        with self.radar.lock:
+            config = dict(self.radar.config)
+        if fields.get("debug") == "1":
+            config["state"] = 0
+        self.sendJSON(200, config)
+
+    def radar_config_post(self, fields, uploads):
+        error = self.radar.updateConfig(fields)
+        if error != None:
+            return self.sendError(400, error)
+        self.radar_config_get({}, uploads)
+
+    def radar_trial_burst(self, fields, uploads):
+        error = self.radar.startBurst("trial")
+        if error != None:
+            return self.sendError(403, error)
+        self.sendRedirect("/api/radar/results")
+
+    def radar_burst(self, fields, uploads):
+        error = self.radar.startBurst("burst", fields.get("filename"))
+        if error != None:
+            return self.sendError(403, error)
+        self.sendRedirect("/api/radar/results")
+
+    def radar_results(self, fields, uploads):
+        self.sendJSON(200, self.radar.burstState())
+
+    def data_dir(self, fields, uploads):
+        radar = self.radar
+        path = normalisePath(fields.get("path", ""))
+
+        with radar.lock:
+            isFile = path in radar.files
+        if isFile:
+            return self.sendError(403, "Not a directory")
+
+        entries = radar.listDirectory(path)
+        if entries == None:
+            return self.sendError(404, "Path not found")
+
+        index = int(fields.get("index", 0))
+        listSize = int(fields.get("list", 16))
+        page = entries[index:index + listSize]
+
+        self.sendJSON(200, {
+            "path" : path,
+            "length" : len(entries),
+            "index" : index,
+            "list" : listSize,
+            "fileCount" : len(page),
+            "files" : page
+        })
+
+    def data_download(self, fields, uploads):
+        radar = self.radar
+        path = normalisePath(fields.get("path", ""))
+
+        with radar.lock:
+            file = radar.files.get(path)
+            dropAfter = radar.dropDownloadAfter
+            radar.dropDownloadAfter = None
+
+        if file == None:
+            if radar.listDirectory(path) != None:
+                return self.sendError(403, "Cannot download a directory")
+            return self.sendError(404, "File not found")
+
+        start = 0
+        rangeHeader = self.headers.get("Range")
+        if rangeHeader != None and rangeHeader.startswith("bytes="):
+            start = int(rangeHeader[len("bytes="):].split("-")[0])
+            if start >= file.size:
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{:d}".format(file.size))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes {:d}-{:d}/{:d}".format(start, file.size - 1, file.size))
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(file.size - start))
+        self.end_headers()
+
+        chunkSize = 65536
+        offset = start
+        sent = 0
+        while offset < file.size:
+            chunk = file.read(offset, min(chunkSize, file.size - offset))
+            if dropAfter != None and sent + len(chunk) > dropAfter:
+                self.wfile.write(chunk[0:dropAfter - sent])
+                self.wfile.flush()
+                self.close_connection = True
+                self.connection.close()
+                return
+            self.wfile.write(chunk)
+            offset += len(chunk)
+            sent += len(chunk)
+            if radar.bandwidth != None:
+                time.sleep(len(chunk) / radar.bandwidth)
+
+ROUTES = {
+    ("POST", "system/reset") : MockRequestHandler.system_reset,
+    ("GET", "system/housekeeping/status") : MockRequestHandler.system_status,
+    ("GET", "system/housekeeping/config") : MockRequestHandler.system_config_get,
+    ("POST", "system/housekeeping/config") : MockRequestHandler.system_config_post,
+    ("GET", "radar/config") : MockRequestHandler.radar_config_get,
+    ("POST", "radar/config") : MockRequestHandler.radar_config_post,
+    ("POST", "radar/trial-burst") : MockRequestHandler.radar_trial_burst,
+    ("POST", "radar/burst") : MockRequestHandler.radar_burst,
+    ("GET", "radar/results") : MockRequestHandler.radar_results,
+    ("GET", "data") : MockRequestHandler.data_dir,
+    ("GET", "data/download") : MockRequestHandler.data_download,
+}
+
+class MockFile:
+    """
+    File stored on the emulated SD card
+    """
+
+    def __init__(self, path, data = b"", timestamp = None):
+        #: Path of the file, without a leading slash
+        self.path = path
+        #: Last modified time
+        self.timestamp = timestamp or datetime.datetime.now().replace(microsecond = 0)
+        self.data = data
+
+    @property
+    def size(self):
+        """Size of the file in bytes"""
+        return len(self.data)
+
+    def read(self, offset, length):
+        """
+        Read `length` bytes from `offset`
+        """
+
+        return self.data[offset:offset + length]
+
+    def describe(self):
+        """
+        Return the file object JSON used in directory listings
+        """
+
+        return {
+            "name" : self.path.split("/")[-1],
+            "path" : self.path,
+            "size" : self.size,
+            "timestamp" : self.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            "dir" : False
+        }
+
+class MockBurstFile(MockFile):
+    """
+    Synthetic ApRES burst `.dat` file generated on demand
+
+    The file holds a single burst: a text header between
+    `*** Burst Header ***` and `*** End Header ***` lines, followed by
+    nSubBursts x (nTx x nRx) x nAttenuators chirps of nSamples
+    little-endian uint16 ADC samples.  Chirps are ordered by
+    sub-burst, then antenna pair, then attenuator setting.
+    """
+
+    def __init__(self, path, nSubBursts, nAttenuators, nSamples, rfAttn, afGain,
+        txAntenna, rxAntenna, userData = "", startFrequency = 200000000,
+        stopFrequency = 400000000, period = 1, timestamp = None):
+
+        super().__init__(path, timestamp = timestamp)
+
+        self.nSubBursts = nSubBursts
+        self.nAttenuators = nAttenuators
+        self.nSamples = nSamples
+        self.nChirps = nSubBursts * nAttenuators * sum(txAntenna) * sum(rxAntenna)
+
+        self.header = burstHeader(
+            timestamp = self.timestamp,
+            nSubBursts = nSubBursts,
+            nAttenuators = nAttenuators,
+            nSamples = nSamples,
+            rfAttn = rfAttn,
+            afGain = afGain,
+            txAntenna = txAntenna,
+            rxAntenna = rxAntenna,
+            userData = userData,
+            startFrequency = startFrequency,
+            stopFrequency = stopFrequency,
+            period = period
+        )
+
+    @property
+    def size(self):
+        return len(self.header) + self.nChirps * self.nSamples * 2
+
+    def read(self, offset, length):
+
+        end = min(offset + length, self.size)
+        out = b""
+
+        if offset < len(self.header):
+            out = self.header[offset:min(end, len(self.header))]
+            offset = len(self.header)
+
+        if offset < end:
+            # Samples covering the requested byte range of the data
+            dataStart = offset - len(self.header)
+            dataEnd = end - len(self.header)
+            first = dataStart // 2
+            last = (dataEnd + 1) // 2
+            samples = syntheticSamples(first, last - first, self.nSamples)
+            raw = samples.astype("<u2").tobytes()
+            out += raw[dataStart - first * 2:dataEnd - first * 2]
+
+        return out
+
+def burstHeader(timestamp, nSubBursts, nAttenuators, nSamples, rfAttn, afGain,
+    txAntenna, rxAntenna, userData = "", startFrequency = 200000000,
+    stopFrequency = 400000000, period = 1, average = 0):
+    """
+    Return the text header of a burst as bytes
+    """
+
+    lines = [
+        "",
+        "*** Burst Header ***",
+        "Time stamp=" + timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        "SW_Issue=apresmock",
+        "NSubBursts={:d}".format(nSubBursts),
+        "Average={:d}".format(average),
+        "nAttenuators={:d}".format(nAttenuators),
+        "Attenuator1=" + ",".join("{:g}".format(v) for v in rfAttn),
+        "AFGain=" + ",".join("{:d}".format(int(v)) for v in afGain),
+        "TxAnt=" + ",".join(str(v) for v in txAntenna),
+        "RxAnt=" + ",".join(str(v) for v in rxAntenna),
+        "N_ADC_SAMPLES={:d}".format(nSamples),
+        "StartFreq={:d}".format(int(startFrequency)),
+        "StopFreq={:d}".format(int(stopFrequency)),
+        "Period={:g}".format(period),
+        "UserData=" + userData,
+        "*** End Header ***",
+        ""
+    ]
+
+    return "\r\n".join(lines).encode("ascii")
+
+def syntheticSamples(first, count, nSamples):
+    """
+    Return `count` synthetic ADC samples starting at sample `first`
+
+    Samples are numbered continuously across consecutive chirps of
+    `nSamples` samples.  Each chirp is a deramped signal from a few
+    fixed reflectors, with a small phase drift between chirps.
+    """
+
+    index = numpy.arange(first, first + count, dtype = numpy.int64)
+    chirp = index // nSamples
+    t = (index % nSamples) / nSamples
+
+    signal = 0.5 * numpy.sin(2 * numpy.pi * (120 * t + 0.01 * chirp)) \
+           + 0.3 * numpy.sin(2 * numpy.pi * (800 * t + 0.02 * chirp)) \
+           + 0.1 * numpy.sin(2 * numpy.pi * (2500 * t))
+
+    return (32768 + 12000 * signal).astype(numpy.uint16)
+
+def syntheticChirps(firstChirp, nChirps, nSamples):
+    """
+    Return synthetic chirps as an (nChirps, nSamples) uint16 array
+    """
+
+    return syntheticSamples(firstChirp * nSamples, nChirps * nSamples, nSamples) \
+        .reshape(nChirps, nSamples)
+
+def normalisePath(path):
+    """
+    Strip leading and trailing slashes from an SD card path
+    """
+
+    return (path or "").strip("/")
+
+def parseBody(contentType, body):
+    """
+    Parse a POST body into (fields, uploads) dictionaries
+    """
+
+    fields = dict()
+    uploads = dict()
+
+    if contentType.startswith("multipart/form-data"):
+        message = email.parser.BytesParser(policy = email.policy.default).parsebytes(
+            b"Content-Type: " + contentType.encode("ascii") + b"\r\n\r\n" + body
+        )
+        for part in message.iter_parts():
+            name = part.get_param("name", header = "content-disposition")
+            content = part.get_payload(decode = True)
+            if part.get_filename() != None:
+                uploads[name] = content
+            else:
+                fields[name] = content.decode("utf-8")
+    else:
+        for key, value in urllib.parse.parse_qs(body.decode("utf-8"), keep_blank_values = True).items():
+            fields[key] = value[-1]
+
+    return fields, uploads
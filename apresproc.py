@@ -0,0 +1,1067 @@
+# Offline processing of ApRES burst files
+import concurrent.futures
+import datetime
+import mmap
+import os
+import time
+
+import numpy
+
+################################################################################
+# BURST FILES
+################################################################################
+
+class BurstFile:
+    """
+    Memory-mapped reader for ApRES burst `.dat` files
+
+    A burst file holds one or more bursts, each made up of a text
+    header between `*** Burst Header ***` and `*** End Header ***`
+    lines followed by the binary ADC samples of every chirp.  The
+    file is memory mapped and only the headers are parsed on opening,
+    so files much larger than memory open immediately, and samples
+    are only read from disk when they are accessed.
+
+    .. code-block:: python
+
+        with apresproc.BurstFile("Survey/20210526_12-00-00.dat") as dat:
+            burst = dat[0]
+            # Zero-copy view of the ADC counts of every chirp
+            counts = burst.chirps[:, 1, :]    # (sub-burst, attenuator, sample)
+            volts = burst.voltage()
+
+    Arrays returned by :py:class:`Burst` objects are views of the
+    mapped file and remain valid after :py:meth:`close` is called;
+    the mapping is released once they are no longer referenced.
+    """
+
+    #: Line starting each burst header
+    HEADER_START = b"*** Burst Header ***"
+    #: Line ending each burst header
+    HEADER_END = b"*** End Header ***"
+
+    def __init__(self, filename):
+        """
+        Open and memory map a burst file, parsing each burst header
+
+        :param filename: path of the burst file
+        :type filename: str
+        :raises BurstFormatException: if the file does not contain a valid burst
+        """
+
+        #: Path of the burst file
+        self.filename = filename
+
+        with open(filename, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                raise BurstFormatException("Burst file is empty: " + filename)
+            self.map = mmap.mmap(fh.fileno(), 0, access = mmap.ACCESS_READ)
+
+        #: List of :py:class:`Burst` objects in the file
+        self.bursts = self.__readBursts()
+
+        if len(self.bursts) == 0:
+            self.close()
+            raise BurstFormatException("No burst header found in " + filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.bursts)
+
+    def __getitem__(self, index):
+        return self.bursts[index]
+
+    def __iter__(self):
+        return iter(self.bursts)
+
+    def __repr__(self):
+        return "BurstFile({}, {:d} bursts)".format(self.filename, len(self.bursts))
+
+    def close(self):
+        """
+        Release the memory map of the file
+
+        If views of the file are still referenced, the mapping is
+        released when they are garbage collected instead.
+        """
+
+        self.bursts = []
+        if self.map != None:
+            try:
+                self.map.close()
+            except BufferError:
+                # Views still reference the mapping
+                pass
+            self.map = None
+
+    def __readBursts(self):
+        """
+        Parse the header of each burst in the file
+        """
+
+        bursts = []
+        offset = self.map.find(self.HEADER_START)
+
+        while offset >= 0:
+
+            end = self.map.find(self.HEADER_END, offset)
+            if end < 0:
+                break
+
+            # Samples start on the line after the end of the header
+            dataOffset = self.map.find(b"\n", end)
+            if dataOffset < 0:
+                break
+            dataOffset += 1
+
+            header = parseHeader(self.map[offset + len(self.HEADER_START):end])
+            burst = Burst(self.map, header, dataOffset)
+            bursts.append(burst)
+
+            if not burst.complete:
+                break
+
+            offset = self.map.find(self.HEADER_START, burst.dataOffset + burst.dataSize)
+
+        return bursts
+
+class Burst:
+    """
+    Header values and sample data of a single burst
+
+    ADC counts are exposed without copying as :py:attr:`counts`, with
+    shape (sub-burst, antenna pair, attenuator, sample), and
+    :py:attr:`chirps`, with shape (sub-burst, attenuator, sample)
+    where antenna pairs (for MIMO bursts) are folded into the
+    attenuator axis in the order (pair, attenuator).
+
+    If the burst was averaged by the radar (Average=1 or 2 in the
+    header) there is a single "sub-burst" holding the mean, or sum,
+    of all sub-bursts.  If the file is truncated, only the complete
+    sub-bursts are exposed and :py:attr:`complete` is `False`.
+    """
+
+    #: Volts per ADC count
+    VOLTS_PER_COUNT = 2.5 / 65536
+
+    def __init__(self, buffer, header, dataOffset):
+        """
+        :param buffer: buffer holding the burst file
+        :type buffer: :py:class:`mmap.mmap` or bytes
+        :param header: header name-value pairs from :py:func:`parseHeader`
+        :type header: dict
+        :param dataOffset: offset of the first sample in `buffer`
+        :type dataOffset: int
+        :raises BurstFormatException: if a header value is invalid
+        """
+
+        #: Dictionary of the raw header values
+        self.header = header
+        #: Offset of the first sample in the file
+        self.dataOffset = dataOffset
+
+        try:
+            #: Time the burst started
+            self.timestamp = None
+            if "Time stamp" in header:
+                self.timestamp = datetime.datetime.strptime(header["Time stamp"], "%Y-%m-%d %H:%M:%S")
+            #: Number of sub-bursts recorded
+            self.nSubBursts = int(header.get("NSubBursts", 1))
+            #: Averaging mode: 0 for none, 1 for mean or 2 for sum
+            self.average = int(header.get("Average", 0))
+            #: Number of attenuator settings
+            self.nAttenuators = int(header.get("nAttenuators", 1))
+            #: Number of ADC samples per chirp
+            self.nSamples = int(header.get("N_ADC_SAMPLES", 40000))
+            #: RF attenuator settings in dB
+            self.rfAttn = [float(v) for v in header.get("Attenuator1", "0").split(",")][0:self.nAttenuators]
+            #: AF gain settings in dB
+            self.afGain = [int(float(v)) for v in header.get("AFGain", "-14").split(",")][0:self.nAttenuators]
+            #: Enabled transmit antennas
+            self.txAntenna = tuple(int(v) for v in header.get("TxAnt", "1,0,0,0,0,0,0,0").split(","))
+            #: Enabled receive antennas
+            self.rxAntenna = tuple(int(v) for v in header.get("RxAnt", "1,0,0,0,0,0,0,0").split(","))
+            #: Chirp start frequency in Hz
+            self.startFrequency = float(header.get("StartFreq", 2e8))
+            #: Chirp stop frequency in Hz
+            self.stopFrequency = float(header.get("StopFreq", 4e8))
+            #: Chirp period in seconds
+            self.period = float(header.get("Period", 1))
+            #: User data string
+            self.userData = header.get("UserData", "")
+        except ValueError as e:
+            raise BurstFormatException("Invalid burst header value: " + str(e))
+
+        #: Number of transmit/receive antenna pairs
+        self.nPairs = max(1, sum(self.txAntenna) * sum(self.rxAntenna))
+
+        # Averaged bursts store a single (mean or summed) sub-burst
+        nStored = self.nSubBursts if self.average == 0 else 1
+        dtype = numpy.dtype("<u4") if self.average == 2 else numpy.dtype("<u2")
+        chirpSize = self.nPairs * self.nAttenuators * self.nSamples * dtype.itemsize
+
+        available = max(0, len(buffer) - dataOffset)
+        nComplete = min(nStored, available // chirpSize)
+
+        #: Whether all of the sub-bursts are present in the file
+        self.complete = nComplete == nStored
+        #: Size in bytes of the sample data present
+        self.dataSize = nComplete * chirpSize
+
+        #: ADC counts with shape (sub-burst, antenna pair, attenuator, sample)
+        self.counts = numpy.frombuffer(
+            buffer,
+            dtype = dtype,
+            count = nComplete * self.nPairs * self.nAttenuators * self.nSamples,
+            offset = dataOffset
+        ).reshape(nComplete, self.nPairs, self.nAttenuators, self.nSamples)
+
+    def __repr__(self):
+        return "Burst({}, {:d} sub-bursts x {:d} attenuators x {:d} samples)".format(
+            self.timestamp, self.counts.shape[0], self.nAttenuators, self.nSamples
+        )
+
+    @property
+    def chirps(self):
+        """ADC counts with shape (sub-burst, attenuator, sample)"""
+        return self.counts.reshape(self.counts.shape[0], self.nPairs * self.nAttenuators, self.nSamples)
+
+    def voltage(self, subBursts = slice(None), dtype = numpy.float64):
+        """
+        Return chirps converted to volts
+
+        Unlike :py:attr:`chirps` the returned array is a copy, so
+        large bursts should be converted a few sub-bursts at a time.
+        Summed bursts (Average=2) are divided by the number of
+        sub-bursts.
+
+        :param subBursts: index or slice of the sub-bursts to convert
+        :type subBursts: int or slice
+        :param dtype: floating point type of the returned array
+        :type dtype: :py:class:`numpy.dtype`
+        :return: array with shape (sub-burst, attenuator, sample), or (attenuator, sample) for an integer index
+        :rtype: :py:class:`numpy.ndarray`
+        """
+
+        scale = self.VOLTS_PER_COUNT
+        if self.average == 2:
+            scale /= self.nSubBursts
+
+        dtype = numpy.dtype(dtype)
+        return self.chirps[subBursts].astype(dtype) * dtype.type(scale)
+
+def parseHeader(text):
+    """
+    Parse the name=value lines of a burst header into a dictionary
+
+    :param text: header text between the start and end lines
+    :type text: bytes
+    :rtype: dict
+    """
+
+    header = dict()
+    for line in text.decode("ascii", errors = "replace").splitlines():
+        if "=" in line:
+            name, value = line.split("=", 1)
+            header[name.strip()] = value.strip()
+    return header
+
+################################################################################
+# RANGE PROCESSING
+################################################################################
+
+class RangeProcessor:
+    """
+    Vectorised conversion of deramped chirps to complex range profiles
+
+    Chirps are processed along their last axis, so a whole burst, or
+    the attenuator settings of a trial burst, are converted in a
+    single call:
+
+    .. code-block:: python
+
+        results = api.radar.results()
+        profile = apresproc.RangeProcessor.fromResults(results).process(results.chirp)
+        plt.plot(profile.range, profile.decibels.T)
+
+    Each chirp has its mean removed, is windowed, zero padded by a
+    factor `pad` and rotated so that the centre of the chirp is the
+    phase reference, then Fourier transformed.  The spectrum is
+    scaled so that a sinusoid of amplitude `A` at the centre of a
+    range bin has amplitude `A`, and (if `referencePhase` is set)
+    multiplied by the conjugate of the expected phase of a reflector
+    at the centre of each bin, so that :py:attr:`RangeProfile.phase`
+    gives the phase offset of reflectors within their bin, following
+    Brennan et al. (2014).
+
+    The window, range and reference phase are computed once when the
+    processor is created, so a processor should be reused for chirps
+    with the same parameters.
+    """
+
+    #: Speed of light in a vacuum in m/s
+    SPEED_OF_LIGHT = 299792458.0
+    #: Relative permittivity of ice
+    ICE_PERMITTIVITY = 3.18
+
+    #: Window functions available by name
+    WINDOWS = {
+        "blackman" : numpy.blackman,
+        "hamming" : numpy.hamming,
+        "hanning" : numpy.hanning,
+        "bartlett" : numpy.bartlett,
+        "rectangular" : numpy.ones
+    }
+
+    def __init__(self, nSamples, startFrequency = 2e8, stopFrequency = 4e8, period = 1,
+        window = "blackman", pad = 2, maxRange = None, permittivity = ICE_PERMITTIVITY,
+        referencePhase = True, dtype = numpy.float64):
+        """
+        :param nSamples: number of ADC samples per chirp
+        :type nSamples: int
+        :param startFrequency: chirp start frequency in Hz
+        :type startFrequency: float
+        :param stopFrequency: chirp stop frequency in Hz
+        :type stopFrequency: float
+        :param period: chirp period in seconds
+        :type period: float
+        :param window: name of a window in :py:attr:`WINDOWS`, an array of `nSamples` weights or `None` for no window
+        :type window: str or array_like
+        :param pad: zero padding factor, at least 1
+        :type pad: int
+        :param maxRange: if not `None`, only range bins up to this range in metres are returned
+        :type maxRange: float
+        :param permittivity: relative permittivity of the medium
+        :type permittivity: float
+        :param referencePhase: whether to correct the phase to the centre of each range bin
+        :type referencePhase: bool
+        :param dtype: floating point type used for processing, `numpy.float32` or `numpy.float64`
+        :type dtype: :py:class:`numpy.dtype`
+        :raises ValueError: if a parameter is invalid
+        """
+
+        self.dtype = numpy.dtype(dtype)
+        if not self.dtype in (numpy.float32, numpy.float64):
+            raise ValueError("dtype should be numpy.float32 or numpy.float64")
+
+        #: Complex type of the range spectrum
+        self.complexDtype = numpy.result_type(self.dtype, numpy.complex64)
+
+        if int(nSamples) < 2:
+            raise ValueError("nSamples should be at least 2")
+        if int(pad) < 1:
+            raise ValueError("pad should be at least 1")
+        if stopFrequency == startFrequency:
+            raise ValueError("startFrequency and stopFrequency should differ")
+        if period <= 0:
+            raise ValueError("period should be positive")
+        if permittivity <= 0:
+            raise ValueError("permittivity should be positive")
+
+        #: Number of ADC samples per chirp
+        self.nSamples = int(nSamples)
+        #: Zero padding factor
+        self.pad = int(pad)
+        #: Length of the padded chirp
+        self.nFFT = self.nSamples * self.pad
+        #: Chirp start frequency in Hz
+        self.startFrequency = float(startFrequency)
+        #: Chirp stop frequency in Hz
+        self.stopFrequency = float(stopFrequency)
+        #: Chirp bandwidth in Hz
+        self.bandwidth = self.stopFrequency - self.startFrequency
+        #: Chirp centre frequency in Hz
+        self.centreFrequency = (self.startFrequency + self.stopFrequency) / 2
+        #: Chirp period in seconds
+        self.period = float(period)
+        #: Relative permittivity of the medium
+        self.permittivity = float(permittivity)
+
+        # Window weights
+        if window is None:
+            window = numpy.ones(self.nSamples)
+        elif isinstance(window, str):
+            if not window in self.WINDOWS:
+                raise ValueError("Unknown window '{}', expected one of {}".format(window, ", ".join(self.WINDOWS)))
+            window = self.WINDOWS[window](self.nSamples)
+        else:
+            window = numpy.asarray(window, dtype = numpy.float64)
+            if window.shape != (self.nSamples,):
+                raise ValueError("window should have nSamples weights")
+
+        # Scale so a sinusoid of amplitude A has amplitude A in the spectrum
+        #: Window weights, including the spectrum scale factor
+        self.window = (window * (2 / numpy.sum(window))).astype(self.dtype)
+
+        # Keep the bins below Nyquist, up to maxRange if given
+        nBins = self.nFFT // 2
+        binSpacing = self.SPEED_OF_LIGHT / (2 * abs(self.bandwidth) * self.pad * numpy.sqrt(self.permittivity))
+        if maxRange != None:
+            nBins = min(nBins, int(numpy.floor(maxRange / binSpacing)) + 1)
+
+        #: Number of range bins returned
+        self.nBins = nBins
+        #: Range of the centre of each bin in metres
+        self.range = numpy.arange(nBins) * binSpacing
+
+        #: Phase correction applied to each bin, or `None`
+        self.reference = None
+        if referencePhase:
+            # Two-way travel time of a reflector at the centre of each bin
+            tau = numpy.arange(nBins) / (abs(self.bandwidth) * self.pad)
+            rate = 2 * numpy.pi * self.bandwidth / self.period
+            phase = 2 * numpy.pi * self.centreFrequency * tau - rate * tau ** 2 / 2
+            self.reference = numpy.exp(-1j * phase).astype(self.complexDtype)
+
+    @classmethod
+    def fromResults(cls, results, **kwargs):
+        """
+        Create a processor for the chirps of trial burst results
+
+        :param results: trial burst results
+        :type results: :py:class:`apreshttp.Radar.Results`
+        :param kwargs: further arguments to :py:meth:`__init__`
+        :rtype: :py:class:`RangeProcessor`
+        """
+
+        return cls(
+            results.chirp.shape[-1],
+            startFrequency = results.startFrequency,
+            stopFrequency = results.stopFrequency,
+            period = results.period,
+            **kwargs
+        )
+
+    @classmethod
+    def fromBurst(cls, burst, **kwargs):
+        """
+        Create a processor for the chirps of a burst from a burst file
+
+        :param burst: burst read from a burst file
+        :type burst: :py:class:`Burst`
+        :param kwargs: further arguments to :py:meth:`__init__`
+        :rtype: :py:class:`RangeProcessor`
+        """
+
+        return cls(
+            burst.nSamples,
+            startFrequency = burst.startFrequency,
+            stopFrequency = burst.stopFrequency,
+            period = burst.period,
+            **kwargs
+        )
+
+    def process(self, chirps):
+        """
+        Convert chirps to range profiles
+
+        :param chirps: chirp voltages, or ADC counts, with samples along the last axis
+        :type chirps: array_like with shape (..., nSamples)
+        :return: range profiles with shape (..., nBins)
+        :rtype: :py:class:`RangeProfile`
+        :raises ValueError: if the chirps do not have nSamples samples
+        """
+
+        return RangeProfile(self.range, self.spectrum(chirps))
+
+    def spectrum(self, chirps):
+        """
+        Return the complex range spectrum of chirps
+
+        :param chirps: chirp voltages, or ADC counts, with samples along the last axis
+        :type chirps: array_like with shape (..., nSamples)
+        :return: complex spectrum with shape (..., nBins)
+        :rtype: :py:class:`numpy.ndarray`
+        :raises ValueError: if the chirps do not have nSamples samples
+        """
+
+        chirps = numpy.asarray(chirps)
+        if chirps.ndim == 0 or chirps.shape[-1] != self.nSamples:
+            raise ValueError("chirps should have {:d} samples along the last axis".format(self.nSamples))
+
+        # Remove the mean of each chirp and apply the window
+        chirps = chirps.astype(self.dtype)
+        chirps -= chirps.mean(axis = -1, keepdims = True, dtype = self.dtype)
+        chirps *= self.window
+
+        # Pad with zeros, with the centre of the chirp as the first sample
+        half = self.nSamples // 2
+        padded = numpy.zeros(chirps.shape[:-1] + (self.nFFT,), dtype = self.dtype)
+        padded[..., 0:self.nSamples - half] = chirps[..., half:]
+        padded[..., self.nFFT - half:] = chirps[..., 0:half]
+        del chirps
+
+        spectrum = numpy.fft.rfft(padded, axis = -1)[..., 0:self.nBins]
+        spectrum = spectrum.astype(self.complexDtype, copy = False)
+
+        if self.reference is not None:
+            spectrum *= self.reference
+
+        return spectrum
+
+class RangeProfile:
+    """
+    Complex range profiles returned by :py:meth:`RangeProcessor.process`
+
+    The leading axes of :py:attr:`spectrum` match those of the
+    processed chirps, for example (sub-burst, attenuator, bin) for the
+    chirps of a burst.
+    """
+
+    def __init__(self, range, spectrum):
+
+        #: Range of each bin in metres
+        self.range = range
+        #: Complex spectrum with range bins along the last axis
+        self.spectrum = spectrum
+
+    def __repr__(self):
+        return "RangeProfile({}, {:.1f} m)".format(self.spectrum.shape, self.range[-1])
+
+    @property
+    def amplitude(self):
+        """Amplitude of each range bin"""
+        return numpy.abs(self.spectrum)
+
+    @property
+    def phase(self):
+        """Phase of each range bin in radians"""
+        return numpy.angle(self.spectrum)
+
+    @property
+    def decibels(self):
+        """Power of each range bin in dB, relative to an amplitude of 1"""
+        with numpy.errstate(divide = "ignore"):
+            return 20 * numpy.log10(self.amplitude)
+
+    def mean(self, axis = 0):
+        """
+        Return the coherent (complex) mean of profiles over an axis
+
+        :param axis: axis to average over
+        :type axis: int
+        :rtype: :py:class:`RangeProfile`
+        """
+
+        return RangeProfile(self.range, self.spectrum.mean(axis = axis))
+
+################################################################################
+# BATCH PROCESSING
+################################################################################
+
+class BatchProcessor:
+    """
+    Range process many burst files across a pool of processes
+
+    Every sub-burst of every burst is decoded and range processed by
+    a :py:class:`RangeProcessor`, and the spectra are written by the
+    worker processes directly into a memory-mapped `.npy` file with
+    shape (sub-burst, attenuator, bin), so results are never pickled
+    back to the parent process.
+
+    .. code-block:: python
+
+        sync = api.data.sync("Survey", "bursts")
+        batch = apresproc.BatchProcessor(maxRange = 2000)
+        result = batch.process(sync, "profiles.npy")
+        for i, entry in enumerate(result.bursts):
+            profile = result.profile(i)
+            print(entry.timestamp, profile.amplitude.mean(axis = 0).max())
+
+    The rows of the output belonging to each burst are recorded in
+    :py:attr:`BatchResult.bursts`.  All bursts must have the same
+    number of samples, attenuators and chirp parameters as the first
+    burst (or the given processor); other bursts are recorded in
+    :py:attr:`BatchResult.errors` and skipped.
+    """
+
+    def __init__(self, maxWorkers = None, blockSize = 16, extension = ".dat", **kwargs):
+        """
+        :param maxWorkers: number of worker processes, or `None` for the number of CPUs
+        :type maxWorkers: int
+        :param blockSize: number of sub-bursts converted to volts and processed at once by a worker
+        :type blockSize: int
+        :param extension: only files with this extension are processed, or `None` for all files
+        :type extension: str
+        :param kwargs: arguments to :py:meth:`RangeProcessor.fromBurst` used when no processor is given to :py:meth:`process`
+        """
+
+        #: Number of worker processes
+        self.maxWorkers = maxWorkers if maxWorkers != None else (os.cpu_count() or 1)
+        #: Number of sub-bursts processed at once by a worker
+        self.blockSize = max(1, int(blockSize))
+        #: Extension of the files to process
+        self.extension = extension
+        #: Arguments of the :py:class:`RangeProcessor` created for the first burst
+        self.processorArgs = kwargs
+
+    def files(self, source):
+        """
+        Return the burst files to process from a source
+
+        :param source: files to process, as described in :py:func:`burstFiles`
+        :return: sorted list of filenames
+        :rtype: list
+        """
+
+        return burstFiles(source, self.extension)
+
+    def process(self, source, output, processor = None):
+        """
+        Range process every burst in the source files into `output`
+
+        :param source: files to process, as described in :py:func:`burstFiles`
+        :param output: filename of the `.npy` output file, which is overwritten
+        :type output: str
+        :param processor: processor to use, or `None` to create one from the first burst
+        :type processor: :py:class:`RangeProcessor`
+        :rtype: :py:class:`BatchResult`
+        """
+
+        result = BatchResult()
+
+        # Read the headers of every burst to plan the output rows
+        nRows = 0
+        nChannels = None
+        for filename in self.files(source):
+            try:
+                with BurstFile(filename) as dat:
+                    for index, burst in enumerate(dat):
+
+                        if processor == None:
+                            processor = RangeProcessor.fromBurst(burst, **self.processorArgs)
+                        if nChannels == None:
+                            nChannels = burst.chirps.shape[1]
+
+                        if (burst.nSamples != processor.nSamples
+                            or burst.chirps.shape[1] != nChannels
+                            or burst.startFrequency != processor.startFrequency
+                            or burst.stopFrequency != processor.stopFrequency
+                            or burst.period != processor.period):
+                            result.errors["{}[{:d}]".format(filename, index)] = BurstFormatException(
+                                "Burst parameters differ from the first burst"
+                            )
+                            continue
+
+                        nSubBursts = burst.chirps.shape[0]
+                        if nSubBursts == 0:
+                            continue
+
+                        result.bursts.append(BatchResult.Entry(filename, index, burst.timestamp, nRows, nRows + nSubBursts))
+                        nRows += nSubBursts
+
+            except (OSError, BurstFormatException) as e:
+                result.errors[filename] = e
+
+        if nRows == 0:
+            result.finish()
+            return result
+
+        result.range = processor.range
+        result.filename = output
+
+        data = numpy.lib.format.open_memmap(output, mode = "w+",
+            dtype = processor.complexDtype, shape = (nRows, nChannels, processor.nBins))
+        del data
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers = min(self.maxWorkers, len(result.bursts)),
+            initializer = BatchProcessor.Worker.initialise,
+            initargs = (processor, output, self.blockSize)
+        ) as executor:
+
+            futures = {
+                executor.submit(BatchProcessor.Worker.process, entry.filename, entry.index, entry.start) : entry
+                for entry in result.bursts
+            }
+
+            for future in concurrent.futures.as_completed(futures):
+                entry = futures[future]
+                try:
+                    future.result()
+                    entry.processed = True
+                except Exception as e:
+                    result.errors["{}[{:d}]".format(entry.filename, entry.index)] = e
+
+        result.output = numpy.load(output, mmap_mode = "r")
+        result.finish()
+        return result
+
+    class Worker:
+        """
+        State and task of a worker process of :py:class:`BatchProcessor`
+        """
+
+        #: Range processor of this process
+        processor = None
+        #: Memory-mapped output array of this process
+        output = None
+        #: Number of sub-bursts processed at once
+        blockSize = 16
+
+        @classmethod
+        def initialise(cls, processor, output, blockSize):
+            cls.processor = processor
+            cls.output = numpy.load(output, mmap_mode = "r+")
+            cls.blockSize = blockSize
+
+        @classmethod
+        def process(cls, filename, index, row):
+            """
+            Process a burst into the output rows starting at `row`
+            """
+
+            with BurstFile(filename) as dat:
+                burst = dat[index]
+                nSubBursts = burst.chirps.shape[0]
+                for start in range(0, nSubBursts, cls.blockSize):
+                    stop = min(nSubBursts, start + cls.blockSize)
+                    cls.output[row + start:row + stop] = cls.processor.spectrum(
+                        burst.voltage(slice(start, stop), cls.processor.dtype)
+                    )
+                del burst
+
+            cls.output.flush()
+            return nSubBursts
+
+class BatchResult:
+    """
+    Output of :py:meth:`BatchProcessor.process`
+    """
+
+    def __init__(self):
+        #: Memory-mapped spectra with shape (sub-burst, attenuator, bin), or `None` if there were no bursts
+        self.output = None
+        #: Filename of the output array
+        self.filename = None
+        #: Range of each bin in metres
+        self.range = None
+        #: List of :py:class:`BatchResult.Entry` objects, one per burst
+        self.bursts = []
+        #: Dictionary of exceptions keyed by filename, or filename[burst]
+        self.errors = dict()
+        #: Time processing started, from :py:func:`time.monotonic`
+        self.startTime = time.monotonic()
+        #: Seconds taken to process the bursts
+        self.elapsed = None
+
+    def __repr__(self):
+        return "BatchResult({:d} bursts, {:d} errors in {:.3f}s)".format(
+            len(self.bursts), len(self.errors), self.elapsed or 0
+        )
+
+    @property
+    def ok(self):
+        """`True` if every burst was processed"""
+        return len(self.errors) == 0
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self.startTime
+
+    def profile(self, index):
+        """
+        Return the range profiles of the sub-bursts of a burst
+
+        :param index: index of the burst in :py:attr:`bursts`
+        :type index: int
+        :return: profiles with shape (sub-burst, attenuator, bin)
+        :rtype: :py:class:`RangeProfile`
+        """
+
+        entry = self.bursts[index]
+        return RangeProfile(self.range, self.output[entry.start:entry.stop])
+
+    class Entry:
+        """
+        Location of a burst in the output array
+        """
+
+        def __init__(self, filename, index, timestamp, start, stop):
+            #: Burst file name
+            self.filename = filename
+            #: Index of the burst in the file
+            self.index = index
+            #: Time the burst started
+            self.timestamp = timestamp
+            #: First row of the burst in the output
+            self.start = start
+            #: Row after the last row of the burst in the output
+            self.stop = stop
+            #: Whether the burst was processed without error
+            self.processed = False
+
+        def __repr__(self):
+            return "BatchResult.Entry({}[{:d}], rows {:d}:{:d})".format(self.filename, self.index, self.start, self.stop)
+
+################################################################################
+# STACKING
+################################################################################
+
+class Stacker:
+    """
+    Streaming weighted mean of chirps in constant memory
+
+    Blocks of chirps with shape (chirp, attenuator, sample) are added
+    one at a time with :py:meth:`add`, and only the running weight,
+    mean and sum of squared deviations of each attenuator and sample
+    are kept, so any number of chirps can be stacked.  Blocks are
+    merged using the pairwise update of Chan et al. (1979), which
+    remains accurate over very many chirps.
+
+    For a robust mean, a second pass is made with a `reference`
+    stacker from a first pass over the same chirps, and samples more
+    than `clip` standard deviations from the reference mean are
+    excluded.  :py:func:`stackBursts` makes both passes over a set
+    of burst files.
+    """
+
+    def __init__(self, clip = None, reference = None):
+        """
+        :param clip: number of reference standard deviations beyond which samples are excluded, or `None`
+        :type clip: float
+        :param reference: stacker holding the mean and standard deviation of a previous pass, required if `clip` is given
+        :type reference: :py:class:`Stacker`
+        :raises ValueError: if `clip` is given without a `reference`
+        """
+
+        if clip != None and reference == None:
+            raise ValueError("A reference stacker is required to clip samples")
+
+        #: Number of standard deviations beyond which samples are excluded
+        self.clip = clip
+        #: Stacker of a previous pass used for clipping
+        self.reference = reference
+        #: Number of chirps included for each attenuator and sample
+        self.count = None
+        #: Sum of weights for each attenuator and sample
+        self.weight = None
+        #: Number of samples excluded by clipping for each attenuator and sample
+        self.rejected = None
+        #: Number of bursts added with :py:func:`stackBursts`
+        self.nBursts = 0
+
+        self.__mean = None
+        self.__m2 = None
+
+    def __repr__(self):
+        if self.count is None:
+            return "Stacker(empty)"
+        return "Stacker({:d} chirps x {:d} attenuators x {:d} samples)".format(
+            int(self.count.max()), self.count.shape[0], self.count.shape[1]
+        )
+
+    @property
+    def mean(self):
+        """Weighted mean chirp with shape (attenuator, sample)"""
+        if self.__mean is None:
+            return None
+        with numpy.errstate(invalid = "ignore"):
+            return numpy.where(self.weight > 0, self.__mean, numpy.nan)
+
+    @property
+    def variance(self):
+        """Weighted variance of the chirps with shape (attenuator, sample)"""
+        if self.__m2 is None:
+            return None
+        with numpy.errstate(invalid = "ignore", divide = "ignore"):
+            return numpy.where(self.weight > 0, self.__m2 / self.weight, numpy.nan)
+
+    @property
+    def std(self):
+        """Weighted standard deviation of the chirps with shape (attenuator, sample)"""
+        variance = self.variance
+        return None if variance is None else numpy.sqrt(variance)
+
+    def add(self, chirps, weight = 1.0):
+        """
+        Add a block of chirps to the stack
+
+        :param chirps: chirps with shape (chirp, attenuator, sample), or a single (attenuator, sample) chirp
+        :type chirps: array_like
+        :param weight: weight of each chirp, broadcastable to shape (chirp, attenuator)
+        :type weight: float or array_like
+        :raises ValueError: if the chirps do not match those already added
+        """
+
+        chirps = numpy.asarray(chirps, dtype = numpy.float64)
+        if chirps.ndim == 2:
+            chirps = chirps[numpy.newaxis]
+        if chirps.ndim != 3:
+            raise ValueError("chirps should have shape (chirp, attenuator, sample)")
+
+        if self.__mean is None:
+            shape = chirps.shape[1:]
+            self.count = numpy.zeros(shape, dtype = numpy.int64)
+            self.rejected = numpy.zeros(shape, dtype = numpy.int64)
+            self.weight = numpy.zeros(shape)
+            self.__mean = numpy.zeros(shape)
+            self.__m2 = numpy.zeros(shape)
+        elif chirps.shape[1:] != self.count.shape:
+            raise ValueError("chirps with shape {} do not match the stack shape {}".format(chirps.shape[1:], self.count.shape))
+
+        weights = numpy.broadcast_to(
+            numpy.asarray(weight, dtype = numpy.float64)[..., numpy.newaxis],
+            chirps.shape
+        )
+
+        if self.clip != None:
+            keep = numpy.abs(chirps - self.reference.mean) <= self.clip * self.reference.std
+            self.rejected += chirps.shape[0] - keep.sum(axis = 0)
+            weights = numpy.where(keep, weights, 0.0)
+            self.count += keep.sum(axis = 0)
+        else:
+            self.count += chirps.shape[0]
+
+        # Statistics of the block
+        blockWeight = weights.sum(axis = 0)
+        with numpy.errstate(invalid = "ignore", divide = "ignore"):
+            blockMean = numpy.where(blockWeight > 0, (weights * chirps).sum(axis = 0) / blockWeight, 0.0)
+        blockM2 = (weights * (chirps - blockMean) ** 2).sum(axis = 0)
+
+        # Merge with the running statistics
+        total = self.weight + blockWeight
+        delta = blockMean - self.__mean
+        with numpy.errstate(invalid = "ignore", divide = "ignore"):
+            fraction = numpy.where(total > 0, blockWeight / total, 0.0)
+        self.__mean += delta * fraction
+        self.__m2 += blockM2 + delta ** 2 * self.weight * fraction
+        self.weight = total
+
+    def stack(self, blocks):
+        """
+        Add every block of chirps from an iterable, such as :py:func:`chirpBlocks`
+
+        Items may be arrays of chirps, or (burst, chirps) pairs as
+        produced by :py:func:`chirpBlocks`, in which case bursts
+        averaged by the radar count as `NSubBursts` chirps.
+
+        :param blocks: iterable of chirp blocks
+        :return: this stacker
+        :rtype: :py:class:`Stacker`
+        """
+
+        lastBurst = None
+        for block in blocks:
+            if isinstance(block, tuple):
+                burst, chirps = block
+                self.add(chirps, burst.nSubBursts if burst.average != 0 else 1.0)
+                if burst is not lastBurst:
+                    self.nBursts += 1
+                    lastBurst = burst
+            else:
+                self.add(block)
+        return self
+
+def burstFiles(source, extension = ".dat"):
+    """
+    Return the burst files found in a source
+
+    :param source: a directory, which is searched recursively, a
+        filename, a list of filenames, or the result of
+        :py:meth:`apreshttp.Data.downloadMany` or
+        :py:meth:`apreshttp.Data.sync`
+    :param extension: only files with this extension are returned, or `None` for all files
+    :type extension: str
+    :return: sorted list of filenames
+    :rtype: list
+    """
+
+    # Results of a sync or download step
+    if hasattr(source, "summary"):
+        source = source.summary
+        if source == None:
+            return []
+    if hasattr(source, "completed"):
+        source = list(source.completed.values())
+
+    if isinstance(source, (str, os.PathLike)):
+        if os.path.isdir(source):
+            filenames = []
+            for root, dirs, names in os.walk(source):
+                filenames.extend(os.path.join(root, name) for name in names)
+        else:
+            filenames = [source]
+    else:
+        filenames = list(source)
+
+    filenames = [os.fspath(filename) for filename in filenames]
+    if extension != None:
+        filenames = [f for f in filenames if f.lower().endswith(extension.lower())]
+    return sorted(filenames)
+
+def chirpBlocks(filenames, blockSize = 16, errors = None):
+    """
+    Generate blocks of chirps, in volts, from burst files
+
+    Files are opened one at a time and at most `blockSize`
+    sub-bursts are converted to volts at once, so memory use does
+    not depend on the size or number of files.
+
+    :param filenames: burst files to read
+    :type filenames: iterable of str
+    :param blockSize: maximum number of sub-bursts in each block
+    :type blockSize: int
+    :param errors: if a dictionary, files which cannot be read are recorded in it, keyed by filename, and skipped
+    :type errors: dict
+    :return: generator of (burst, chirps) pairs, with chirps of shape (sub-burst, attenuator, sample)
+    :rtype: generator
+    :raises BurstFormatException: if a file is not a valid burst file and `errors` is `None`
+    """
+
+    blockSize = max(1, int(blockSize))
+
+    for filename in filenames:
+        try:
+            dat = BurstFile(filename)
+        except (OSError, BurstFormatException) as e:
+            if errors == None:
+                raise
+            errors[filename] = e
+            continue
+
+        with dat:
+            for burst in dat:
+                nSubBursts = burst.chirps.shape[0]
+                for start in range(0, nSubBursts, blockSize):
+                    yield burst, burst.voltage(slice(start, min(nSubBursts, start + blockSize)))
+
+def stackBursts(source, clip = None, blockSize = 16, extension = ".dat", errors = None):
+    """
+    Stack every sub-burst of a set of burst files
+
+    .. code-block:: python
+
+        stack = apresproc.stackBursts("bursts/2021-05", clip = 3)
+        profile = apresproc.RangeProcessor(stack.mean.shape[-1]).process(stack.mean)
+
+    :param source: files to stack, as described in :py:func:`burstFiles`
+    :param clip: if given, the files are read a second time to exclude samples more than `clip` standard deviations from the mean
+    :type clip: float
+    :param blockSize: maximum number of sub-bursts read at once
+    :type blockSize: int
+    :param extension: only files with this extension are stacked, or `None` for all files
+    :type extension: str
+    :param errors: if a dictionary, files which cannot be read are recorded in it and skipped
+    :type errors: dict
+    :rtype: :py:class:`Stacker`
+    :raises ValueError: if the bursts do not all have the same number of attenuators and samples
+    """
+
+    filenames = burstFiles(source, extension)
+    stacker = Stacker().stack(chirpBlocks(filenames, blockSize, errors))
+
+    if clip != None and stacker.count is not None:
+        stacker = Stacker(clip, stacker).stack(chirpBlocks(filenames, blockSize, errors))
+
+    return stacker
+
+################################################################################
+# Exceptions
+
+class BurstFormatException(Exception):
+    pass
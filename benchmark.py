@@ -0,0 +1,321 @@
+# Benchmark apreshttp client hot paths against the apresmock server
+#
+# Usage:
+#   python benchmark.py [--output results.json] [--compare baseline.json]
+#
+# Results are written as JSON so that runs from different versions can
+# be compared with --compare.
+import apreshttp
+import apresmock
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+API_KEY = "18052021"
+
+def summarise(samples):
+    """
+    Return summary statistics of a list of durations in seconds
+    """
+
+    samples = sorted(samples)
+    return {
+        "n" : len(samples),
+        "mean" : statistics.mean(samples),
+        "median" : statistics.median(samples),
+        "p95" : samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        "min" : samples[0],
+        "max" : samples[-1]
+    }
+
+def timeit(func, repeat):
+    """
+    Call `func` `repeat` times and return the durations in seconds
+    """
+
+    durations = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def newAPI(radar):
+    api = apreshttp.API(radar.url)
+    api.setKey(API_KEY)
+    return api
+
+################################################################################
+# BENCHMARKS
+################################################################################
+
+def benchRequestLatency(args):
+    """
+    Round trip time of small GET and POST requests
+    """
+
+    with apresmock.MockRadar(apiKey = API_KEY) as radar:
+        with newAPI(radar) as api:
+            # Warm up the connection pool
+            api.system.housekeeping.status()
+
+            return {
+                "status_get" : summarise(timeit(api.system.housekeeping.status, args.repeat)),
+                "config_get" : summarise(timeit(api.radar.config.get, args.repeat)),
+                "config_set" : summarise(timeit(
+                    lambda: api.radar.config.postRequest("radar/config", {"userData" : "bench"}),
+                    args.repeat
+                ))
+            }
+
+def benchPolling(args):
+    """
+    Time of a trialBurst -> results cycle beyond the chirping time
+    """
+
+    chirpDuration = args.chirp_duration
+    nAverages = 10
+
+    with apresmock.MockRadar(apiKey = API_KEY, chirpDuration = chirpDuration, nSamples = args.samples) as radar:
+        with newAPI(radar) as api:
+            api.radar.config.set(nAverages = nAverages)
+            api.pollingStrategy = apreshttp.AdaptivePolling(chirpDuration = chirpDuration)
+
+            burstTime = nAverages * chirpDuration
+            overheads = []
+            polls = []
+
+            for i in range(args.polling_repeat):
+                nPolls = radar.requestCount("radar/results")
+                start = time.perf_counter()
+                api.radar.trialBurst()
+                api.radar.results()
+                overheads.append(time.perf_counter() - start - burstTime)
+                polls.append(radar.requestCount("radar/results") - nPolls)
+
+            return {
+                "burst_seconds" : burstTime,
+                "overhead" : summarise(overheads),
+                "polls_per_burst" : statistics.mean(polls),
+                "routes" : api.latency.summary()
+            }
+
+def benchResultsParse(args):
+    """
+    Cost of decoding and parsing 4-attenuator trial results per ADC sample
+
+    Decoding is timed with each available JSON decoder.
+    """
+
+    with apresmock.MockRadar(apiKey = API_KEY, chirpDuration = 0, nSamples = args.samples) as radar:
+        with newAPI(radar) as api:
+            api.radar.config.set(nAtts = 4, rfAttnSet = [0, 10, 20, 30], afGainSet = [-14, -14, -4, 6])
+            api.radar.trialBurst()
+            api.radar.results()
+            response = api.radar.getRequest("radar/results")
+
+    decoders = {"json" : json.loads}
+    if apreshttp.orjson != None:
+        decoders["orjson"] = apreshttp.orjson.loads
+
+    def decode():
+        # Discard the body decoded by the previous request
+        del response.parsedJSON
+        api.radar.readJSON(response)
+
+    nSamples = 4 * args.samples
+    results = {
+        "samples" : nSamples,
+        "response_bytes" : len(response.content),
+        "default_decoder" : [name for name, decoder in decoders.items() if decoder == api.jsonDecoder][0],
+        "decode" : dict()
+    }
+
+    defaultDecoder = api.jsonDecoder
+    for name, decoder in decoders.items():
+        api.jsonDecoder = decoder
+        results["decode"][name] = summarise(timeit(decode, args.repeat))
+    api.jsonDecoder = defaultDecoder
+    decode()
+
+    resultsDurations = timeit(lambda: apreshttp.Radar.Results(response), args.repeat)
+    results["results"] = summarise(resultsDurations)
+    results["seconds_per_sample"] = (results["decode"][results["default_decoder"]]["median"]
+        + statistics.median(resultsDurations)) / nSamples
+
+    return results
+
+def benchDirectoryWalk(args):
+    """
+    Throughput of walking a directory tree, in files per second
+    """
+
+    with apresmock.MockRadar(apiKey = API_KEY) as radar:
+        nDirs = 10
+        for d in range(nDirs):
+            for f in range(args.walk_files // nDirs):
+                radar.addFile("Survey/{:02d}/{:04d}.dat".format(d, f), b"\0" * 64)
+
+        with newAPI(radar) as api:
+            results = dict()
+            for prefetch in (False, True):
+                nFiles = 0
+                durations = []
+                for i in range(args.walk_repeat):
+                    start = time.perf_counter()
+                    nFiles = len(list(api.data.walk(prefetch = prefetch)))
+                    durations.append(time.perf_counter() - start)
+                results["prefetch" if prefetch else "sequential"] = {
+                    "files" : nFiles,
+                    "walk" : summarise(durations),
+                    "files_per_second" : nFiles / statistics.median(durations)
+                }
+            return results
+
+def benchDownload(args):
+    """
+    Download throughput in MB/s
+    """
+
+    with apresmock.MockRadar(apiKey = API_KEY) as radar:
+        # Burst data is generated on demand, so the file is never held
+        # in memory
+        size = radar.addBurstFile("Survey/large.dat", size = int(args.download_mb * 1e6)).size
+
+        with newAPI(radar) as api, tempfile.TemporaryDirectory() as tmpdir:
+            durations = []
+            for i in range(args.download_repeat):
+                start = time.perf_counter()
+                filename = api.data.download("Survey/large.dat", tmpdir, size = size)
+                durations.append(time.perf_counter() - start)
+                os.remove(filename)
+
+    return {
+        "bytes" : size,
+        "download" : summarise(durations),
+        "mb_per_second" : size / 1e6 / statistics.median(durations)
+    }
+
+BENCHMARKS = {
+    "request_latency" : benchRequestLatency,
+    "polling" : benchPolling,
+    "results_parse" : benchResultsParse,
+    "directory_walk" : benchDirectoryWalk,
+    "download" : benchDownload
+}
+
+################################################################################
+# REPORTING
+################################################################################
+
+def gitRevision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd = os.path.dirname(os.path.abspath(__file__)),
+            stderr = subprocess.DEVNULL
+        ).decode("ascii").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def headlineFigures(results):
+    """
+    Return the key figure of each benchmark as (name, value, unit, higherIsBetter)
+    """
+
+    figures = []
+    if "request_latency" in results:
+        figures.append(("request_latency.status_get", results["request_latency"]["status_get"]["median"] * 1e3, "ms", False))
+        figures.append(("request_latency.config_get", results["request_latency"]["config_get"]["median"] * 1e3, "ms", False))
+    if "polling" in results:
+        figures.append(("polling.overhead", results["polling"]["overhead"]["median"] * 1e3, "ms", False))
+        figures.append(("polling.polls_per_burst", results["polling"]["polls_per_burst"], "", False))
+    if "results_parse" in results:
+        figures.append(("results_parse.seconds_per_sample", results["results_parse"]["seconds_per_sample"] * 1e9, "ns", False))
+        for name, stats in results["results_parse"].get("decode", dict()).items():
+            figures.append(("results_parse.decode." + name, stats["median"] * 1e3, "ms", False))
+    if "directory_walk" in results:
+        for key in results["directory_walk"]:
+            figures.append(("directory_walk." + key, results["directory_walk"][key]["files_per_second"], "files/s", True))
+    if "download" in results:
+        figures.append(("download.mb_per_second", results["download"]["mb_per_second"], "MB/s", True))
+    return figures
+
+def report(output, baseline = None):
+    """
+    Print headline figures, compared with a baseline run if given
+    """
+
+    current = headlineFigures(output["results"])
+    previous = dict()
+    if baseline != None:
+        previous = {name : value for name, value, unit, higher in headlineFigures(baseline["results"])}
+
+    for name, value, unit, higherIsBetter in current:
+        line = "{:<36s} {:>12.3f} {:<8s}".format(name, value, unit)
+        if name in previous and previous[name] != 0:
+            change = (value - previous[name]) / previous[name] * 100
+            better = (change > 0) == higherIsBetter
+            line += " {:+8.1f}% {}".format(change, "better" if better else "worse")
+        print(line, file = sys.stderr)
+
+def main(argv = None):
+
+    parser = argparse.ArgumentParser(description = "Benchmark apreshttp against a mock radar")
+    parser.add_argument("benchmarks", nargs = "*",
+        help = "benchmarks to run, from {} (default: all)".format(", ".join(BENCHMARKS)))
+    parser.add_argument("--output", "-o", help = "write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", "-c", help = "JSON results of a previous run to compare against")
+    parser.add_argument("--label", help = "label stored with the results, i.e. a version name")
+    parser.add_argument("--repeat", type = int, default = 50, help = "repeats of request and parse benchmarks")
+    parser.add_argument("--samples", type = int, default = 40000, help = "ADC samples per chirp")
+    parser.add_argument("--chirp-duration", type = float, default = 0.05, help = "mock chirp duration in seconds")
+    parser.add_argument("--polling-repeat", type = int, default = 5, help = "trial bursts to time")
+    parser.add_argument("--walk-files", type = int, default = 500, help = "files in the walked tree")
+    parser.add_argument("--walk-repeat", type = int, default = 3, help = "repeats of the directory walk")
+    parser.add_argument("--download-mb", type = float, default = 500, help = "approximate size of the downloaded file in MB")
+    parser.add_argument("--download-repeat", type = int, default = 3, help = "repeats of the download")
+    args = parser.parse_args(argv)
+
+    names = args.benchmarks or list(BENCHMARKS)
+    for name in names:
+        if not name in BENCHMARKS:
+            parser.error("unknown benchmark '{}'".format(name))
+
+    output = {
+        "label" : args.label,
+        "revision" : gitRevision(),
+        "timestamp" : datetime.datetime.now().isoformat(timespec = "seconds"),
+        "python" : platform.python_version(),
+        "platform" : platform.platform(),
+        "parameters" : {k : v for k, v in vars(args).items() if k not in ("benchmarks", "output", "compare", "label")},
+        "results" : dict()
+    }
+
+    for name in names:
+        print("Running {}...".format(name), file = sys.stderr)
+        output["results"][name] = BENCHMARKS[name](args)
+
+    baseline = None
+    if args.compare != None:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+    report(output, baseline)
+
+    if args.output != None:
+        with open(args.output, "w") as fh:
+            json.dump(output, fh, indent = 2)
+    else:
+        json.dump(output, sys.stdout, indent = 2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,10 @@ from .context import apreshttp
 
 import os
 import datetime
+import json
 import pytest
 import random
+import requests
 import time
 
 API_ROOT = "http://radar.localnet"
@@ -58,4 +60,312 @@ def test_data_download():
 
     finally:
         if os.path.isfile(filename):
-            os.remove(filename)
\ No newline at end of file
+            os.remove(filename)
+def test_data_download_stream(tmp_path):
+
+    api = apreshttp.API(API_ROOT)
+    card = FakeCard(api, {"Survey/a.dat" : bytes(range(256)) * 40})
+
+    # The file is written in chunks and renamed into place
+    api.data.download("Survey/a.dat", str(tmp_path), chunkSize = 1000)
+    with open(str(tmp_path / "a.dat"), "rb") as fh:
+        assert fh.read() == card.files["Survey/a.dat"]
+    assert not os.path.exists(str(tmp_path / "a.dat.part"))
+
+    # An interrupted download leaves neither the file nor a partial file
+    card.failAfter = 5000
+    with pytest.raises(requests.exceptions.ConnectionError):
+        api.data.download("Survey/a.dat", str(tmp_path / "b.dat"), chunkSize = 1000)
+    assert os.listdir(str(tmp_path)) == ["a.dat"]
+
+def test_data_download_resume(tmp_path):
+
+    api = apreshttp.API(API_ROOT)
+    content = bytes(range(256)) * 40
+    card = FakeCard(api, {"Survey/a.dat" : content})
+    filename = str(tmp_path / "a.dat")
+
+    # An interrupted download keeps its partial file when resuming
+    card.failAfter = 4000
+    with pytest.raises(requests.exceptions.ConnectionError):
+        api.data.download("Survey/a.dat", str(tmp_path), chunkSize = 1000, resume = True)
+    assert os.path.getsize(filename + ".part") == 4000
+
+    # Only the missing bytes are requested
+    card.failAfter = None
+    assert api.data.download("Survey/a.dat", str(tmp_path), resume = True, size = len(content)) == filename
+    assert card.requests[-1][2] == {"Range" : "bytes=4000-"}
+    with open(filename, "rb") as fh:
+        assert fh.read() == content
+
+    # A complete file is not downloaded again
+    nRequests = len(card.requests)
+    api.data.download("Survey/a.dat", str(tmp_path), resume = True, size = len(content))
+    assert len(card.requests) == nRequests
+
+    # A radar ignoring the Range header restarts the download
+    os.remove(filename)
+    with open(filename + ".part", "wb") as fh:
+        fh.write(b"x" * 100)
+    card.ranges = False
+    api.data.download("Survey/a.dat", str(tmp_path), resume = True)
+    with open(filename, "rb") as fh:
+        assert fh.read() == content
+
+    # A radar returning a different range restarts the download
+    os.remove(filename)
+    with open(filename + ".part", "wb") as fh:
+        fh.write(content[:100])
+    card.ranges = True
+    card.rangeStart = 10
+    api.data.download("Survey/a.dat", str(tmp_path), resume = True)
+    assert card.requests[-2][2] == {"Range" : "bytes=100-"}
+    assert not card.requests[-1][2]
+    with open(filename, "rb") as fh:
+        assert fh.read() == content
+
+    # An existing file is only resumed if the expected size is known
+    card.rangeStart = None
+    with open(filename, "wb") as fh:
+        fh.write(b"old")
+    api.data.download("Survey/a.dat", str(tmp_path), resume = True)
+    assert not card.requests[-1][2]
+    with open(filename, "rb") as fh:
+        assert fh.read() == content
+
+    # The downloaded size is checked
+    with pytest.raises(apreshttp.IncompleteDownloadException):
+        api.data.download("Survey/a.dat", str(tmp_path / "c.dat"), size = len(content) + 1)
+    with pytest.raises(apreshttp.IncompleteDownloadException):
+        api.data.download("Survey/a.dat", str(tmp_path / "d.dat"), size = len(content) + 1.0)
+
+def test_data_download_many(tmp_path):
+
+    api = apreshttp.API(API_ROOT)
+    api.wait = 0
+    card = FakeCard(api, {
+        "Survey/a.dat" : b"a" * 3000,
+        "Survey/b.dat" : b"b" * 2000,
+        "Survey/c.dat" : b"c" * 1000
+    })
+
+    # b.dat is dropped twice and c.dat is dropped more often than retried
+    card.failures = {"Survey/b.dat" : 2, "Survey/c.dat" : 5}
+    progress = []
+    listing = api.data.dir("Survey")
+    summary = api.data.downloadMany(
+        listing.files + ["Survey/missing.dat"], str(tmp_path),
+        maxWorkers = 2, retries = 2, chunkSize = 500,
+        progressCallback = lambda s: progress.append(s.bytesDownloaded)
+    )
+
+    assert sorted(summary.completed) == ["Survey/a.dat", "Survey/b.dat"]
+    assert sorted(summary.failures) == ["Survey/c.dat", "Survey/missing.dat"]
+    assert isinstance(summary.failures["Survey/c.dat"], requests.exceptions.ConnectionError)
+    assert summary.numRemaining == 0 and summary.endTime != None
+    with open(str(tmp_path / "b.dat"), "rb") as fh:
+        assert fh.read() == card.files["Survey/b.dat"]
+
+    # Each file is retried at most `retries` times
+    attempts = [r[1]["path"] for r in card.requests if r[0] == "data/download"]
+    assert attempts.count("Survey/b.dat") == 3 and attempts.count("Survey/c.dat") == 3
+
+    # Progress is reported as chunks are written
+    assert len(progress) > 0 and progress == sorted(progress)
+    assert progress[-1] == summary.bytesDownloaded
+
+    # Files with the same name are not downloaded over each other
+    card.files["Other/a.dat"] = b"A" * 3000
+    clashes = str(tmp_path / "clashes")
+    summary = api.data.downloadMany(["Survey/a.dat", "Other/a.dat"], clashes)
+    assert summary.completed == {"Survey/a.dat" : os.path.join(clashes, "a.dat")}
+    assert isinstance(summary.failures["Other/a.dat"], FileExistsError)
+    with open(os.path.join(clashes, "a.dat"), "rb") as fh:
+        assert fh.read() == card.files["Survey/a.dat"]
+
+    # ...unless the directory tree is kept
+    summary = api.data.downloadMany(["Survey/a.dat", "Other/a.dat"], clashes, keepTree = True)
+    assert len(summary.completed) == 2 and len(summary.failures) == 0
+
+    # The destination must be a directory
+    with pytest.raises(FileExistsError):
+        api.data.downloadMany(["Survey/a.dat"], os.path.join(clashes, "a.dat"))
+
+    with pytest.raises(ValueError):
+        api.data.downloadMany([], maxWorkers = 0)
+
+def test_data_sync(tmp_path):
+
+    api = apreshttp.API(API_ROOT)
+    api.wait = 0
+    card = FakeCard(api, {
+        "config.ini" : b"[radar]",
+        "Survey/a.dat" : b"a" * 100,
+        "Survey/day2/b.dat" : b"b" * 200
+    })
+    mirror = str(tmp_path / "mirror")
+
+    # Nothing is downloaded in a dry run
+    result = api.data.sync("Survey", mirror, dryRun = True)
+    assert sorted(f.path for f in result.toDownload) == ["Survey/a.dat", "Survey/day2/b.dat"]
+    assert result.summary == None and not os.path.exists(mirror)
+
+    # The directory tree is recreated beneath the mirror
+    result = api.data.sync("Survey", mirror)
+    assert len(result.summary.completed) == 2
+    with open(os.path.join(mirror, "Survey", "day2", "b.dat"), "rb") as fh:
+        assert fh.read() == card.files["Survey/day2/b.dat"]
+
+    # Only new, changed or locally removed files are downloaded again
+    card.files["Survey/c.dat"] = b"c" * 10
+    card.files["Survey/a.dat"] = b"A" * 50
+    card.timestamps["Survey/a.dat"] = "2021-05-27 12:00:00"
+    os.remove(os.path.join(mirror, "Survey", "day2", "b.dat"))
+    result = api.data.sync("Survey", mirror)
+    assert sorted(result.summary.completed) == ["Survey/a.dat", "Survey/c.dat", "Survey/day2/b.dat"]
+    with open(os.path.join(mirror, "Survey", "a.dat"), "rb") as fh:
+        assert fh.read() == card.files["Survey/a.dat"]
+
+    result = api.data.sync("Survey", mirror, dryRun = True)
+    assert len(result.toDownload) == 0 and len(result.upToDate) == 3
+
+    # Files removed from the ApRES are pruned from the manifest
+    manifestName = os.path.join(mirror, apreshttp.Data.Manifest.DEFAULT_NAME)
+    del card.files["Survey/c.dat"]
+    api.data.sync("Survey", mirror)
+    with open(manifestName) as fh:
+        assert sorted(json.load(fh)) == ["Survey/a.dat", "Survey/day2/b.dat"]
+
+    # Paths may not escape the mirror
+    assert api.data.localPath("/Survey//./a.dat", mirror) == os.path.join(mirror, "Survey", "a.dat")
+    for path in ("Survey/../../a.dat", "..", "/"):
+        with pytest.raises(ValueError):
+            api.data.localPath(path, mirror)
+    summary = api.data.downloadMany(["Survey/../../a.dat"], mirror, keepTree = True)
+    assert isinstance(summary.failures["Survey/../../a.dat"], ValueError)
+
+def test_data_walk():
+
+    api = apreshttp.API(API_ROOT)
+    files = {"Survey/{:02d}.dat".format(i) : b"x" for i in range(5)}
+    files.update({"Survey/day{:d}/{:02d}.dat".format(d, i) : b"y" for d in range(3) for i in range(3)})
+    card = FakeCard(api, files)
+
+    for prefetch in (False, True):
+        del card.requests[:]
+        paths = [file.path for file in api.data.walk("Survey", listSize = 2, prefetch = prefetch)]
+        assert sorted(paths) == sorted(files)
+        # Survey has 8 objects in 4 pages, and each day 3 files in 2 pages
+        assert len(card.requests) == 4 + 3 * 2
+
+    paths = [file.path for file in api.data.walk("Survey", recursive = False, listSize = 3)]
+    assert paths == ["Survey/{:02d}.dat".format(i) for i in range(5)]
+
+    with pytest.raises(ValueError):
+        next(api.data.walk(listSize = 0))
+    with pytest.raises(apreshttp.NotFoundException):
+        list(api.data.walk("Missing"))
+
+class FakeResponse:
+    """Minimal stand-in for a (streamed) response"""
+
+    def __init__(self, status_code, content = b"", headers = None, failAfter = None):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8", errors = "replace")
+        self.headers = headers or dict()
+        self.failAfter = failAfter
+        self.url = ""
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunkSize):
+        for start in range(0, len(self.content), chunkSize):
+            if self.failAfter != None and start >= self.failAfter:
+                raise requests.exceptions.ConnectionError("Connection dropped")
+            yield self.content[start:start + chunkSize]
+
+    def close(self):
+        pass
+
+class FakeCard:
+    """Serves data and data/download requests from a dictionary of files"""
+
+    TIMESTAMP = "2021-05-26 12:00:00"
+
+    def __init__(self, api, files):
+        #: Dictionary of file contents keyed by path
+        self.files = files
+        #: Dictionary of timestamps keyed by path, defaulting to TIMESTAMP
+        self.timestamps = dict()
+        #: (route, parameters, headers) of each request
+        self.requests = []
+        #: Drop downloads after this many bytes
+        self.failAfter = None
+        #: Whether Range headers are honoured
+        self.ranges = True
+        #: Start of ranged responses, if not the requested byte
+        self.rangeStart = None
+        #: Number of times to drop the download of each path before any data
+        self.failures = dict()
+        api.data.getRequest = self.getRequest
+
+    def getRequest(self, url, data_obj = None, *args, **kwargs):
+
+        self.requests.append((url, data_obj, kwargs.get("headers")))
+
+        if url == "data/download":
+            if not data_obj["path"] in self.files:
+                return FakeResponse(404)
+            content = self.files[data_obj["path"]]
+            failAfter = self.failAfter
+            if self.failures.get(data_obj["path"], 0) > 0:
+                self.failures[data_obj["path"]] -= 1
+                failAfter = 0
+            rangeHeader = (kwargs.get("headers") or dict()).get("Range")
+            if rangeHeader != None and self.ranges:
+                start = int(rangeHeader[6:-1])
+                if start >= len(content):
+                    return FakeResponse(416)
+                if self.rangeStart != None:
+                    start = self.rangeStart
+                return FakeResponse(206, content[start:], {
+                    "Content-Range" : "bytes {:d}-{:d}/{:d}".format(start, len(content) - 1, len(content))
+                }, failAfter)
+            return FakeResponse(200, content, {"Content-Length" : str(len(content))}, failAfter)
+
+        elif url == "data":
+            entries = self.list(data_obj["path"].strip("/"))
+            if entries == None:
+                return FakeResponse(404)
+            page = entries[data_obj["index"]:data_obj["index"] + data_obj["list"]]
+            return FakeResponse(200, json.dumps({
+                "path" : data_obj["path"],
+                "length" : len(entries),
+                "index" : data_obj["index"],
+                "list" : data_obj["list"],
+                "fileCount" : len(page),
+                "files" : page
+            }).encode())
+
+        return FakeResponse(404)
+
+    def list(self, path):
+        prefix = path + "/" if len(path) > 0 else ""
+        entries = dict()
+        for filePath in sorted(self.files):
+            if not filePath.startswith(prefix):
+                continue
+            parts = filePath[len(prefix):].split("/")
+            entryPath = prefix + parts[0]
+            entries[entryPath] = {
+                "name" : parts[0],
+                "path" : entryPath,
+                "size" : len(self.files[filePath]) if len(parts) == 1 else 0,
+                "timestamp" : self.timestamps.get(filePath, self.TIMESTAMP),
+                "dir" : len(parts) > 1
+            }
+        if len(entries) == 0 and len(path) > 0:
+            return None
+        return [entries[key] for key in sorted(entries)]
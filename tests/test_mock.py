@@ -0,0 +1,549 @@
+from .context import apreshttp, apresmock
+
+import asyncio
+import concurrent.futures
+import datetime
+import json
+import math
+import os
+import numpy
+import pytest
+import requests
+import socket
+import threading
+import time
+
+API_KEY = "18052021"
+
+@pytest.fixture
+def radar():
+    with apresmock.MockRadar(apiKey = API_KEY, chirpDuration = 0.001, nSamples = 1000) as radar:
+        yield radar
+
+@pytest.fixture
+def api(radar):
+    api = apreshttp.API(radar.url)
+    api.setKey(API_KEY)
+    api.resultsInterval = 0.05
+    api.pollingStrategy = apreshttp.AdaptivePolling(chirpDuration = 0.001, minInterval = 0.01)
+    yield api
+    api.close()
+
+def test_mock_system(api, radar):
+
+    status = api.system.housekeeping.status()
+    assert status.batteryVoltage == radar.batteryVoltage
+
+    message = api.system.reset()
+    assert isinstance(message, apreshttp.System.ResetMessage)
+    assert radar.resetCount == 1
+
+    # POST requests are refused without the API key
+    api.setKey("invalid")
+    with pytest.raises(apreshttp.InvalidAPIKeyException):
+        api.system.reset()
+
+def test_mock_radar_config(api, radar):
+
+    config = api.radar.config.get()
+    assert config.nAttenuators == 1
+
+    api.radar.config.set(nAtts = 2, rfAttnSet = [10, 20], afGainSet = [-4, 6])
+    assert radar.config["rfAttn"] == [10.0, 20.0]
+    assert radar.config["afGain"] == [-4, 6]
+
+    # A stale config is read again before attenuator values are validated
+    other = apreshttp.API(radar.url)
+    other.setKey(API_KEY)
+    other.radar.config.set(nAtts = 3, rfAttnSet = [0, 0, 0], afGainSet = [-4, -4, -4])
+    other.close()
+    nReads = radar.requestCount("radar/config", "GET")
+    api.radar.config.set(rfAttnSet = [1, 2, 3])
+    assert radar.requestCount("radar/config", "GET") == nReads + 1
+    assert radar.config["rfAttn"] == [1.0, 2.0, 3.0]
+
+    # Bad configuration is rejected with a 400 error
+    radar.injectError("radar/config", 400, "Bad config")
+    with pytest.raises(apreshttp.BadResponseException):
+        api.radar.config.set(nBursts = 5)
+
+def test_mock_trial_burst(api, radar):
+
+    radar.chirpDuration = 0.02
+    api.radar.config.set(nAtts = 2, nAverages = 5, rfAttnSet = [10, 20], afGainSet = [-4, 6])
+    api.radar.trialBurst()
+
+    # A second burst is refused while chirping
+    with pytest.raises(apreshttp.RadarBusyException):
+        api.radar.trialBurst()
+
+    results = api.radar.results()
+    assert results.chirp.shape == (2, radar.nSamples)
+    assert results.histogram.shape == (2, 50)
+
+def test_mock_burst(api, radar):
+
+    api.radar.config.set(nBursts = 20)
+
+    api.radar.burst("test.dat")
+    results = api.radar.results()
+    assert results.filename == "Survey/test.dat"
+    assert "Survey/test.dat" in radar.files
+
+    # Existing files cannot be overwritten
+    with pytest.raises(apreshttp.RadarBusyException):
+        api.radar.burst("test.dat")
+
+def test_mock_data(api, radar, tmp_path):
+
+    radar.addFile("Survey/a.txt", b"a" * 1000)
+    burstFile = radar.addBurstFile("Survey/b.dat", size = 1000000)
+
+    listing = api.data.dir("Survey", listSize = 1)
+    assert listing.numObjectsInDir == 2
+    assert listing.numObjectsInList == 1
+
+    names = sorted(file.name for file in api.data.walk())
+    assert names == ["a.txt", "b.dat", "config.ini"]
+
+    with pytest.raises(apreshttp.NotFoundException):
+        api.data.dir("Missing")
+
+    # Download is interrupted and then resumed
+    radar.dropDownloadAfter = 300000
+    with pytest.raises((requests.exceptions.RequestException, apreshttp.IncompleteDownloadException)):
+        api.data.download("Survey/b.dat", str(tmp_path), size = burstFile.size)
+    filename = api.data.download("Survey/b.dat", str(tmp_path), resume = True, size = burstFile.size)
+    with open(filename, "rb") as fh:
+        assert fh.read() == burstFile.read(0, burstFile.size)
+
+    # Synchronise the whole card, then check nothing is left to do
+    result = api.data.sync(dst_path = str(tmp_path / "sync"))
+    assert result.summary.numRemaining == 0
+    assert os.path.isfile(str(tmp_path / "sync" / "Survey" / "a.txt"))
+    result = api.data.sync(dst_path = str(tmp_path / "sync"), dryRun = True)
+    assert len(result.toDownload) == 0
+
+def test_mock_burst_file():
+
+    burstFile = apresmock.MockBurstFile("b.dat", nSubBursts = 3, nAttenuators = 2,
+        nSamples = 100, rfAttn = [0, 10], afGain = [-14, -4],
+        txAntenna = [1, 0, 0, 0, 0, 0, 0, 0], rxAntenna = [1, 0, 0, 0, 0, 0, 0, 0])
+
+    content = burstFile.read(0, burstFile.size)
+    assert len(content) == burstFile.size
+    assert b"*** End Header ***" in content
+
+    # Reads at odd offsets match the complete file
+    assert burstFile.read(len(burstFile.header) + 1, 7) == content[len(burstFile.header) + 1:len(burstFile.header) + 8]
+
+    samples = numpy.frombuffer(content[len(burstFile.header):], dtype = "<u2")
+    assert numpy.array_equal(samples.reshape(6, 100), apresmock.syntheticChirps(0, 6, 100))
+
+def test_mock_async(radar, tmp_path):
+
+    pytest.importorskip("aiohttp")
+    burstFile = radar.addBurstFile("Survey/a.dat", size = 200000)
+    slowFile = radar.addBurstFile("Survey/slow.dat", size = 600000)
+    decoded = []
+
+    def decoder(content):
+        decoded.append(len(content))
+        return json.loads(content)
+
+    async def run():
+        async with apreshttp.AsyncAPI(radar.url) as api:
+            api.setKey(API_KEY)
+            api.jsonDecoder = decoder
+            api.pollingStrategy = apreshttp.AdaptivePolling(chirpDuration = 0.001, minInterval = 0.01)
+            results = await api.radar.trialBurst()
+            listing = await api.data.dir()
+            filename = await api.data.download("Survey/a.dat", str(tmp_path), chunkSize = 4096)
+
+            # A download may take longer than the timeout, which only
+            # limits connecting and each read
+            api.timeout = 0.5
+            radar.bandwidth = 400000
+            slow = await api.data.download("Survey/slow.dat", str(tmp_path), size = slowFile.size)
+            radar.bandwidth = None
+            return results, listing, filename, slow
+
+    results, listing, filename, slow = asyncio.run(run())
+    assert results.chirp.shape == (1, radar.nSamples)
+    assert len(listing.files) == 1
+    assert os.path.getsize(slow) == slowFile.size
+    with open(filename, "rb") as fh:
+        assert fh.read() == burstFile.read(0, burstFile.size)
+
+    # Response bodies are decoded with the API decoder
+    assert len(decoded) >= 3
+
+def test_mock_instrumentation(api, radar, monkeypatch):
+
+    api.retryPolicy = None
+    events = []
+    api.addInstrument(events.append)
+
+    api.system.housekeeping.status()
+    api.system.housekeeping.status()
+    api.radar.config.get()
+
+    radar.injectError("data", None)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        api.data.dir()
+
+    assert [e.route for e in events] == ["system/housekeeping/status", "system/housekeeping/status", "radar/config", "data"]
+
+    # First request opens a connection which is then reused
+    assert events[0].newConnection and events[0].connectTime > 0
+    assert not events[1].newConnection and events[1].connectTime == 0
+    assert events[0].status == 200 and events[0].responseBytes > 0
+    assert events[0].totalTime >= events[0].waitTime + events[0].transferTime
+
+    assert events[3].status == None
+    assert isinstance(events[3].error, requests.exceptions.ConnectionError)
+
+    summary = api.latency.summary()
+    assert summary["system/housekeeping/status"]["count"] == 2
+    assert summary["data"]["errors"] == 1
+    assert api.latency.histogram("radar/config").percentile(50) <= api.latency.histogram("radar/config").max
+
+    api.removeInstrument(events.append)
+
+    # Timing leaves address resolution to urllib3, so a host with
+    # several addresses is resolved once and each address is tried
+    lookups = []
+    getaddrinfo = socket.getaddrinfo
+    def lookup(host, port, *args, **kwargs):
+        lookups.append(host)
+        if host == "radar.invalid":
+            return getaddrinfo("127.0.0.2", port, *args, **kwargs) + getaddrinfo("127.0.0.1", port, *args, **kwargs)
+        return getaddrinfo(host, port, *args, **kwargs)
+    monkeypatch.setattr(socket, "getaddrinfo", lookup)
+
+    other = apreshttp.API(radar.url.replace("127.0.0.1", "radar.invalid"))
+    other.system.housekeeping.status()
+    other.close()
+    assert lookups.count("radar.invalid") == 1
+    assert other.transport.connectionTiming.newConnection
+    api.system.housekeeping.status()
+    assert len(events) == 4
+
+    # Histograms are returned as snapshots
+    histogram = api.latency.histogram("radar/config")
+    api.radar.config.get()
+    assert histogram.count == 1 and api.latency.histogram("radar/config").count == 2
+    assert api.latency.histogram("missing") == None
+
+    with pytest.raises(TypeError):
+        api.addInstrument(None)
+
+def test_latency_histogram():
+
+    hist = apreshttp.LatencyHistogram()
+    assert hist.percentile(50) == None
+
+    for ms in range(1, 101):
+        hist.add(ms / 1000)
+
+    assert hist.count == 100
+    assert hist.min == 0.001 and hist.max == 0.1
+    assert math.isclose(hist.mean, 0.0505)
+    assert hist.percentile(50) == 0.064
+    assert hist.percentile(100) == 0.1
+
+def test_mock_parse_once(api, radar):
+
+    api.radar.trialBurst()
+    api.radar.results()
+    api.radar.config.get()
+    # Reuse the cached config, so only the results are requested
+    api.configCacheTTL = math.inf
+
+    decoded = []
+    decoder = api.jsonDecoder
+    api.jsonDecoder = lambda body: decoded.append(len(body)) or decoder(body)
+
+    # Each body is decoded once, by validation, and shared with readers
+    results = api.radar.results()
+    assert len(decoded) == 1
+    assert results.chirp.shape == (1, radar.nSamples)
+
+    api.system.housekeeping.status()
+    api.data.dir()
+    assert len(decoded) == 3
+
+def test_mock_json_decoder(api, radar):
+
+    # The stdlib decoder gives the same results as the default decoder
+    api.radar.trialBurst()
+    results = api.radar.results()
+    api.jsonDecoder = apreshttp.json.loads
+    assert numpy.array_equal(api.radar.results().chirp, results.chirp)
+
+    if apreshttp.orjson != None:
+        assert apreshttp.API(radar.url).jsonDecoder == apreshttp.orjson.loads
+
+def test_mock_fleet(tmp_path):
+
+    radars = [apresmock.MockRadar(apiKey = API_KEY, chirpDuration = 0.001, nSamples = 100) for i in range(4)]
+    for radar in radars:
+        radar.start()
+    radars[0].addFile("Survey/a.dat", b"a" * 100)
+
+    with apreshttp.Fleet(maxWorkers = 4) as fleet:
+        for radar in radars:
+            api = apreshttp.API(radar.url)
+            api.setKey(API_KEY)
+            api.pollingStrategy = apreshttp.AdaptivePolling(chirpDuration = 0.001, minInterval = 0.01)
+            fleet.add(api)
+
+        assert len(fleet) == 4
+        with pytest.raises(KeyError):
+            fleet.add(apreshttp.API(radars[0].url))
+
+        # Requests to each radar run concurrently, so all of them
+        # arrive before any is handled
+        barrier = threading.Barrier(len(radars), timeout = 5)
+        for radar in radars:
+            radar.requestBarrier = barrier
+        radars[1].injectError("system/housekeeping/status", 500, "Broken")
+        status = fleet.status()
+        for radar in radars:
+            radar.requestBarrier = None
+        assert not barrier.broken
+        assert len(status.results) == 3
+        assert isinstance(status.errors[radars[1].url[7:]], apreshttp.InternalRadarErrorException)
+        assert not status.ok
+
+        assert fleet.setConfig(nBursts = 2).ok
+        assert all(radar.config["nSubBursts"] == 2 for radar in radars)
+
+        # The config of each radar is read once before the bursts
+        nReads = [radar.requestCount("radar/config", "GET") for radar in radars]
+        results = fleet.burst("fleet.dat")
+        assert results.ok
+        assert [radar.requestCount("radar/config", "GET") - n for radar, n in zip(radars, nReads)] == [1] * 4
+        assert all("Survey/fleet.dat" in radar.files for radar in radars)
+
+        synced = fleet.sync("Survey", str(tmp_path))
+        assert synced.ok
+        assert os.path.isfile(os.path.join(str(tmp_path), radars[0].url[7:].replace(":", "_"), "Survey", "a.dat"))
+
+    for radar in radars:
+        radar.stop()
+
+def test_mock_results_future(api, radar, monkeypatch):
+
+    api.radar.trialBurst()
+    future = api.radar.results(wait = False)
+    assert isinstance(future, concurrent.futures.Future)
+    results = future.result(timeout = 5)
+    assert future.done() and not future.cancelled()
+    assert results.chirp.shape == (1, radar.nSamples)
+
+    # Callbacks are still called, and burst passes them through
+    received = []
+    future = api.radar.burst("future.dat", callback = received.append, wait = False)
+    assert future.result(timeout = 5) is received[0]
+
+    # Exceptions are passed to the caller
+    radar.reset()
+    future = api.radar.results(wait = False)
+    with pytest.raises(apreshttp.NoChirpStartedException):
+        future.result(timeout = 5)
+
+    # Cancelling stops the poll loop, so a single worker is freed
+    # for the next task long before the results would time out
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+    monkeypatch.setattr(apreshttp.Radar, "resultsExecutor", executor)
+    polled = threading.Event()
+    radar.chirpDuration = 10
+    api.radar.trialBurst()
+    future = api.radar.results(wait = False, updateCallback = lambda response: polled.set())
+    assert polled.wait(timeout = 5)
+    assert future.cancel()
+    assert future.cancelled()
+    executor.submit(lambda: None).result(timeout = 5)
+    executor.shutdown()
+
+def test_mock_thread_safety(api, radar, tmp_path):
+
+    radar.addBurstFile("Survey/big.dat", size = 2000000)
+    api.configCacheTTL = 0.05
+
+    def poll(i):
+        for j in range(20):
+            api.system.housekeeping.status()
+            config = api.radar.config.get(api.configCacheTTL)
+            assert len(config.rfAttn) == config.nAttenuators
+
+    def setConfig(i):
+        for j in range(10):
+            api.radar.config.set(nAtts = 1 + j % 2, rfAttnSet = [5.0] * (1 + j % 2), afGainSet = [-4] * (1 + j % 2))
+
+    def download(i):
+        return api.data.download("Survey/big.dat", str(tmp_path / str(i)))
+
+    for i in range(4):
+        os.mkdir(str(tmp_path / str(i)))
+
+    # Status polling, config updates and downloads share one API
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 8) as pool:
+        futures = [pool.submit(poll, i) for i in range(4)]
+        futures += [pool.submit(setConfig, 0)]
+        futures += [pool.submit(download, i) for i in range(4)]
+        for future in futures:
+            future.result()
+
+    assert api.requestCount == radar.requestCount()
+    assert sum(hist.count for hist in api.latency.histograms.values()) == api.requestCount
+
+def test_mock_retry(api, radar):
+
+    events = []
+    api.addInstrument(events.append)
+    api.retryPolicy = apreshttp.RetryPolicy(retries = 2, backoff = 0.01)
+
+    # GET requests are retried after dropped connections and 503s
+    radar.injectError("system/housekeeping/status", None, count = 2)
+    api.system.housekeeping.status()
+    assert [e.retries for e in events] == [0, 1, 2]
+    assert events[-1].status == 200
+
+    radar.injectError("radar/config", 503, "Busy", count = 3)
+    with pytest.raises(apreshttp.RadarBusyException):
+        api.radar.config.get()
+
+    # POST requests which may have reached the radar are not retried
+    radar.injectError("system/reset", None)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        api.system.reset()
+    assert radar.requestCount("system/reset") == 1
+
+    policy = apreshttp.RetryPolicy()
+    refused = requests.exceptions.ConnectionError(
+        apreshttp.urllib3.exceptions.MaxRetryError(None, "/", apreshttp.urllib3.exceptions.NewConnectionError(None, "refused"))
+    )
+    assert policy.shouldRetry("POST", 0, exception = refused)
+    assert not policy.shouldRetry("POST", 0, exception = requests.exceptions.ReadTimeout())
+    assert policy.shouldRetry("GET", 1, exception = requests.exceptions.ReadTimeout())
+    assert not policy.shouldRetry("GET", 2, exception = requests.exceptions.ReadTimeout())
+    assert not policy.shouldRetry("POST", 0, status = 503)
+    assert 0.25 <= policy.delay(0) <= 0.5
+    assert policy.delay(10) <= policy.maxBackoff
+    assert policy.delay(0, "3") == 3
+
+def test_circuit_breaker(tmp_path, monkeypatch):
+
+    api = apreshttp.API("127.0.0.1:9")
+    api.retryPolicy = None
+    api.circuitBreaker = apreshttp.CircuitBreaker(failureThreshold = 2, resetTimeout = 0.2)
+
+    for i in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            api.system.housekeeping.status()
+    assert api.circuitBreaker.state == apreshttp.CircuitBreaker.OPEN
+
+    # Requests fail fast while the breaker is open
+    with pytest.raises(apreshttp.CircuitOpenException):
+        api.system.housekeeping.status()
+
+    # After the reset timeout one trial request is made
+    time.sleep(0.2)
+    with pytest.raises(requests.exceptions.ConnectionError) as e:
+        api.system.housekeeping.status()
+    assert not isinstance(e.value, apreshttp.CircuitOpenException)
+    assert api.circuitBreaker.state == apreshttp.CircuitBreaker.OPEN
+
+    # Downloads are not retried while the breaker is open
+    sleeps = []
+    monkeypatch.setattr(apreshttp.time, "sleep", sleeps.append)
+    summary = api.data.downloadMany(["Survey/a.dat"], str(tmp_path), retries = 2)
+    assert isinstance(summary.failures["Survey/a.dat"], apreshttp.CircuitOpenException)
+    assert len(sleeps) == 0
+    monkeypatch.undo()
+
+    # A trial which ends without a connection outcome does not leave
+    # the breaker half-open
+    def fail(event):
+        raise RuntimeError("Instrument failed")
+    api.addInstrument(fail)
+    time.sleep(0.2)
+    with pytest.raises(RuntimeError):
+        api.system.housekeeping.status()
+    assert api.circuitBreaker.state == apreshttp.CircuitBreaker.OPEN
+    api.removeInstrument(fail)
+    with pytest.raises(requests.exceptions.ConnectionError) as e:
+        api.system.housekeeping.status()
+    assert not isinstance(e.value, apreshttp.CircuitOpenException)
+
+    api.circuitBreaker.reset()
+    assert api.circuitBreaker.state == apreshttp.CircuitBreaker.CLOSED
+
+    # Only failures to connect or respond open the breaker
+    def invalid(event):
+        raise requests.exceptions.InvalidHeader("Bad header")
+    api.addInstrument(invalid)
+    for i in range(2):
+        with pytest.raises(requests.exceptions.InvalidHeader):
+            api.system.housekeeping.status()
+    assert api.circuitBreaker.state == apreshttp.CircuitBreaker.CLOSED
+    assert api.circuitBreaker.failures == 0
+
+def test_mock_catalog(api, radar, tmp_path):
+
+    catalog = apreshttp.Catalog(str(tmp_path / "catalog.db"))
+    api.catalog = catalog
+    start = time.time()
+
+    api.system.housekeeping.status()
+    api.radar.config.set(nAtts = 2, rfAttnSet = [0, 10], afGainSet = [-14, -4])
+    api.radar.trialBurst()
+    trial = api.radar.results()
+    api.radar.burst("catalog.dat")
+    api.radar.results()
+
+    assert catalog.radars() == [api.root]
+    assert catalog.status(api.root)[0]["batteryVoltage"] == radar.batteryVoltage
+    assert catalog.config(api.root)[-1]["rfAttn"] == [0, 10]
+
+    results = catalog.results(api.root, start = start, type = "trial")
+    assert len(results) == 1
+    assert numpy.allclose(results[0]["chirpMean"], trial.chirp.mean(axis = 1))
+    assert [row["filename"] for row in catalog.bursts(api.root)] == ["Survey/catalog.dat"]
+    assert len(catalog.results(api.root, end = start)) == 0
+
+    # Index the card, then download the missing bursts from the index
+    radar.addBurstFile("Survey/day1/a.dat", size = 1000)
+    radar.addBurstFile("Survey/day2/b.dat", size = 1000)
+    list(api.data.walk())
+    assert len(catalog.files(api.root, "Survey")) == 3
+    assert [row["path"] for row in catalog.files(api.root, "Survey/day1")] == ["Survey/day1/a.dat"]
+
+    api.data.download("Survey/day1/a.dat", str(tmp_path))
+    missing = catalog.notDownloaded(api.root, "Survey", extension = ".dat")
+    assert [row["path"] for row in missing] == ["Survey/catalog.dat", "Survey/day2/b.dat"]
+    assert catalog.downloads(api.root)[0]["filename"] == os.path.join(str(tmp_path), "a.dat")
+
+    # Modification times may be given as datetimes or epoch seconds
+    modified = datetime.datetime.strptime(catalog.files(api.root, "Survey/day1")[0]["modified"], catalog.TIME_FORMAT)
+    assert len(catalog.files(api.root, "Survey", start = modified - datetime.timedelta(seconds = 1))) == 3
+    assert len(catalog.files(api.root, "Survey", start = modified.timestamp() - 1)) == 3
+    assert len(catalog.files(api.root, "Survey", end = modified.timestamp() - 1)) == 0
+
+    # The catalog persists between sessions
+    catalog.close()
+    with apreshttp.Catalog(str(tmp_path / "catalog.db")) as catalog:
+        assert len(catalog.notDownloaded(api.root)) == 3
+
+        # Files deleted from the card leave the index when it is re-listed,
+        # including directories removed as a whole
+        api.catalog = catalog
+        radar.removeFile("Survey/day2/b.dat")
+        api.data.dir("Survey", listSize = 1)
+        assert len(catalog.files(api.root, "Survey", directories = True)) == 5
+        api.data.dir("Survey")
+        assert [row["path"] for row in catalog.files(api.root, "Survey", directories = True)] == \
+            ["Survey/catalog.dat", "Survey/day1", "Survey/day1/a.dat"]
+        assert [row["path"] for row in catalog.notDownloaded(api.root, "Survey")] == ["Survey/catalog.dat"]
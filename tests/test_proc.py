@@ -0,0 +1,283 @@
+from .context import apresmock, apresproc
+
+import datetime
+import numpy
+import os
+import pytest
+import struct
+
+def writeBurst(filename, **kwargs):
+    params = {
+        "nSubBursts" : 3,
+        "nAttenuators" : 2,
+        "nSamples" : 100,
+        "rfAttn" : [0, 10],
+        "afGain" : [-14, -4],
+        "txAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+        "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0]
+    }
+    params.update(kwargs)
+    burst = apresmock.MockBurstFile("burst.dat", **params)
+    content = burst.read(0, burst.size)
+    with open(filename, "wb") as fh:
+        fh.write(content)
+    return content
+
+def test_burst_file(tmp_path):
+
+    filename = str(tmp_path / "burst.dat")
+    writeBurst(filename, userData = "test")
+
+    with apresproc.BurstFile(filename) as dat:
+        assert len(dat) == 1
+        burst = dat[0]
+        assert burst.complete
+        assert burst.nSubBursts == 3 and burst.nAttenuators == 2 and burst.nSamples == 100
+        assert burst.rfAttn == [0.0, 10.0] and burst.afGain == [-14, -4]
+        assert burst.userData == "test"
+        assert burst.startFrequency == 2e8 and burst.stopFrequency == 4e8
+
+        # Chirps are zero-copy views of the mapped file
+        assert burst.chirps.shape == (3, 2, 100)
+        assert not burst.chirps.flags.owndata
+        expected = apresmock.syntheticChirps(0, 6, 100).reshape(3, 2, 100)
+        assert numpy.array_equal(burst.chirps, expected)
+
+        volts = burst.voltage(1)
+        assert volts.shape == (2, 100)
+        assert numpy.allclose(volts, expected[1] * 2.5 / 65536)
+
+    # Views remain valid after closing
+    assert numpy.array_equal(burst.chirps, expected)
+
+def test_burst_file_hand_built(tmp_path):
+
+    # Header and samples written independently of apresmock, with the
+    # radar's CRLF line endings, a summed (Average=2) MIMO burst and
+    # 2 x 2 antenna pairs ordered by transmit then receive antenna
+    header = b"\r\n".join([
+        b"*** Burst Header ***",
+        b"Time stamp=2021-05-26 12:34:56",
+        b"RMB_Issue=1c",
+        b"SW_Issue=101",
+        b"NSubBursts=4",
+        b"Average=2",
+        b"nAttenuators=2",
+        b"Attenuator1=10,20",
+        b"AFGain=-4,6",
+        b"TxAnt=1,0,1,0,0,0,0,0",
+        b"RxAnt=0,1,0,0,0,0,1,0",
+        b"N_ADC_SAMPLES=5",
+        b"StartFreq=2E8",
+        b"StopFreq=4E8",
+        b"Period=1",
+        b"UserData=hand built",
+        b"*** End Header ***",
+        b""
+    ])
+
+    # Sample s of attenuator a of pair p is 100000 + 1000 p + 100 a + s,
+    # beyond the range of the uint16 samples of unaveraged bursts
+    values = [
+        100000 + 1000 * pair + 100 * att + sample
+        for pair in range(4) for att in range(2) for sample in range(5)
+    ]
+    filename = str(tmp_path / "hand.dat")
+    with open(filename, "wb") as fh:
+        fh.write(header + struct.pack("<{:d}I".format(len(values)), *values))
+
+    with apresproc.BurstFile(filename) as dat:
+        assert len(dat) == 1
+        burst = dat[0]
+        assert burst.complete
+        assert burst.timestamp == datetime.datetime(2021, 5, 26, 12, 34, 56)
+        assert burst.nSubBursts == 4 and burst.average == 2
+        assert burst.rfAttn == [10.0, 20.0] and burst.afGain == [-4, 6]
+        assert burst.txAntenna == (1, 0, 1, 0, 0, 0, 0, 0)
+        assert burst.nPairs == 4 and burst.userData == "hand built"
+
+        # A single summed sub-burst of uint32 samples
+        assert burst.counts.dtype == numpy.dtype("<u4")
+        assert burst.counts.shape == (1, 4, 2, 5)
+        for pair in range(4):
+            for att in range(2):
+                assert list(burst.counts[0, pair, att]) == [100000 + 1000 * pair + 100 * att + s for s in range(5)]
+
+        # Pairs are folded into the attenuator axis as (pair, attenuator)
+        assert burst.chirps.shape == (1, 8, 5)
+        assert burst.chirps[0, 3, 4] == 100000 + 1000 * 1 + 100 * 1 + 4
+
+        # Sums are divided by the number of sub-bursts
+        assert burst.voltage(0)[0, 0] == pytest.approx(100000 / 4 * 2.5 / 65536)
+
+def test_burst_file_multiple(tmp_path):
+
+    filename = str(tmp_path / "bursts.dat")
+    first = writeBurst(filename)
+    second = writeBurst(filename, nSubBursts = 2, nAttenuators = 1, rfAttn = [5], afGain = [6])
+
+    # Two complete bursts followed by a truncated one
+    with open(filename, "wb") as fh:
+        fh.write(first + second + second[0:len(second) - 50])
+
+    with apresproc.BurstFile(filename) as dat:
+        assert len(dat) == 3
+        assert dat[0].chirps.shape == (3, 2, 100)
+        assert dat[1].chirps.shape == (2, 1, 100)
+        assert dat[1].afGain == [6]
+        assert not dat[2].complete
+        assert dat[2].chirps.shape == (1, 1, 100)
+
+def test_burst_file_invalid(tmp_path):
+
+    filename = str(tmp_path / "empty.dat")
+    open(filename, "wb").close()
+    with pytest.raises(apresproc.BurstFormatException):
+        apresproc.BurstFile(filename)
+
+    with open(filename, "wb") as fh:
+        fh.write(b"not a burst")
+    with pytest.raises(apresproc.BurstFormatException):
+        apresproc.BurstFile(filename)
+
+def test_range_processor():
+
+    nSamples = 1000
+    processor = apresproc.RangeProcessor(nSamples, startFrequency = 2e8, stopFrequency = 4e8, period = 1, pad = 4)
+    assert processor.nBins == 2000
+    # Bins are c / (2 B p sqrt(er)) apart
+    assert numpy.isclose(processor.range[1], 299792458.0 / (2 * 2e8 * 4 * numpy.sqrt(3.18)))
+
+    # Sinusoids at 50 and 200 cycles per chirp, in a batch of chirps
+    t = numpy.arange(nSamples) / nSamples
+    amplitudes = numpy.array([[0.5], [1.0], [2.0]])
+    chirps = 1.2 + amplitudes * numpy.sin(2 * numpy.pi * 50 * t) + 0.1 * numpy.sin(2 * numpy.pi * 200 * t)
+    chirps = numpy.stack([chirps, chirps])
+
+    profile = processor.process(chirps)
+    assert profile.spectrum.shape == (2, 3, 2000)
+    assert numpy.argmax(profile.amplitude[0, 0]) == 200
+    assert numpy.allclose(profile.amplitude[..., 200], amplitudes[:, 0], rtol = 1e-3)
+    assert numpy.allclose(profile.amplitude[..., 800], 0.1, rtol = 1e-3)
+    # The DC offset is removed
+    assert profile.amplitude[0, 0, 0] < 1e-6
+
+    # Batch processing matches processing each chirp
+    assert numpy.allclose(processor.process(chirps[1, 2]).spectrum, profile.spectrum[1, 2])
+    assert profile.mean().spectrum.shape == (3, 2000)
+
+    single = apresproc.RangeProcessor(nSamples, pad = 4, maxRange = 100, dtype = numpy.float32)
+    cropped = single.process(chirps)
+    assert cropped.spectrum.dtype == numpy.complex64
+    assert cropped.range[-1] <= 100 and cropped.spectrum.shape[-1] == len(cropped.range)
+    assert numpy.allclose(cropped.spectrum, profile.spectrum[..., 0:single.nBins], atol = 1e-4)
+
+    with pytest.raises(ValueError):
+        processor.process(chirps[..., 1:])
+    with pytest.raises(ValueError):
+        apresproc.RangeProcessor(nSamples, window = "unknown")
+
+def test_range_processor_burst(tmp_path):
+
+    filename = str(tmp_path / "burst.dat")
+    writeBurst(filename, nSamples = 1000)
+
+    with apresproc.BurstFile(filename) as dat:
+        burst = dat[0]
+        processor = apresproc.RangeProcessor.fromBurst(burst)
+        assert processor.nSamples == 1000 and processor.bandwidth == 2e8
+
+        profile = processor.process(burst.voltage())
+        assert profile.spectrum.shape == (3, 2, 1000)
+        # The strongest synthetic reflector is at 120 cycles per chirp
+        assert numpy.all(numpy.argmax(profile.amplitude, axis = -1) == 240)
+        # ADC counts give the same profile up to the voltage scale
+        counts = processor.process(burst.chirps)
+        assert numpy.allclose(counts.spectrum * burst.VOLTS_PER_COUNT, profile.spectrum)
+
+def test_batch_processor(tmp_path):
+
+    burstDir = tmp_path / "bursts"
+    (burstDir / "day2").mkdir(parents = True)
+    writeBurst(str(burstDir / "a.dat"), nSamples = 1000)
+    writeBurst(str(burstDir / "day2" / "b.dat"), nSamples = 1000, nSubBursts = 2)
+    # Mismatched and invalid files are recorded as errors
+    writeBurst(str(burstDir / "day2" / "c.dat"), nSamples = 500)
+    (burstDir / "d.dat").write_bytes(b"not a burst")
+    (burstDir / "notes.txt").write_text("ignored")
+
+    output = str(tmp_path / "profiles.npy")
+    batch = apresproc.BatchProcessor(maxWorkers = 2, blockSize = 2, maxRange = 500)
+    result = batch.process(str(burstDir), output)
+
+    assert [os.path.basename(entry.filename) for entry in result.bursts] == ["a.dat", "b.dat"]
+    assert all(entry.processed for entry in result.bursts)
+    assert len(result.errors) == 2 and not result.ok
+    assert result.output.shape == (5, 2, len(result.range))
+
+    # Output matches processing each burst in this process
+    with apresproc.BurstFile(str(burstDir / "a.dat")) as dat:
+        processor = apresproc.RangeProcessor.fromBurst(dat[0], maxRange = 500)
+        expected = processor.spectrum(dat[0].voltage())
+    assert numpy.allclose(result.profile(0).spectrum, expected)
+    assert result.profile(1).spectrum.shape == (2, 2, len(result.range))
+    assert numpy.array_equal(numpy.load(output), result.output)
+
+    # The summary of a download step can be processed
+    class Summary:
+        completed = {"Survey/a.dat" : str(burstDir / "a.dat")}
+    result = batch.process(Summary(), output)
+    assert result.ok and result.output.shape == (3, 2, len(result.range))
+
+def test_stacker():
+
+    rng = numpy.random.default_rng(1)
+    # Uniform noise never exceeds 3 standard deviations
+    chirps = 1.25 + 0.1 * rng.uniform(-1, 1, (50, 2, 100))
+    weights = rng.uniform(0.5, 2, (50, 2))
+
+    stacker = apresproc.Stacker()
+    for start in range(0, 50, 7):
+        stacker.add(chirps[start:start + 7], weights[start:start + 7])
+
+    expected = numpy.average(chirps, axis = 0, weights = numpy.broadcast_to(weights[..., None], chirps.shape))
+    assert numpy.allclose(stacker.mean, expected)
+    variance = numpy.average((chirps - expected) ** 2, axis = 0, weights = numpy.broadcast_to(weights[..., None], chirps.shape))
+    assert numpy.allclose(stacker.variance, variance)
+    assert numpy.all(stacker.count == 50)
+
+    # An outlier is excluded by clipping against a first pass
+    chirps[10, 1, 20] = 100
+    reference = apresproc.Stacker().stack(iter(chirps))
+    robust = apresproc.Stacker(clip = 3, reference = reference).stack(iter(chirps))
+    assert robust.rejected[1, 20] == 1 and robust.rejected.sum() == 1
+    assert robust.count[1, 20] == 49
+    assert numpy.isclose(robust.mean[1, 20], numpy.delete(chirps[:, 1, 20], 10).mean())
+
+    with pytest.raises(ValueError):
+        stacker.add(chirps[:, :, 1:])
+    with pytest.raises(ValueError):
+        apresproc.Stacker(clip = 3)
+
+def test_stack_bursts(tmp_path):
+
+    writeBurst(str(tmp_path / "a.dat"), nSubBursts = 5)
+    writeBurst(str(tmp_path / "b.dat"), nSubBursts = 3)
+    (tmp_path / "c.dat").write_bytes(b"not a burst")
+
+    errors = dict()
+    stacker = apresproc.stackBursts(str(tmp_path), blockSize = 2, errors = errors)
+    assert list(errors) == [str(tmp_path / "c.dat")]
+    assert stacker.nBursts == 2 and numpy.all(stacker.count == 8)
+
+    counts = numpy.concatenate([
+        apresmock.syntheticChirps(0, 10, 100).reshape(5, 2, 100),
+        apresmock.syntheticChirps(0, 6, 100).reshape(3, 2, 100)
+    ])
+    assert numpy.allclose(stacker.mean, counts.mean(axis = 0) * 2.5 / 65536)
+
+    robust = apresproc.stackBursts(str(tmp_path), clip = 3, errors = errors)
+    assert robust.reference.nBursts == 2 and robust.mean.shape == (2, 100)
+
+    with pytest.raises(apresproc.BurstFormatException):
+        apresproc.stackBursts(str(tmp_path))
@@ -3,7 +3,10 @@ from .context import apreshttp
 
 import os
 import datetime
+import json
+import math
 import matplotlib.pyplot as plt
+import numpy
 import pytest
 import random
 import time
@@ -135,6 +138,168 @@ def test_radar_config_set():
     with pytest.raises(ValueError):
         api.radar.config.set(txAnt=[0,0,0,0,0,0,0,0])
 
+def test_radar_results_arrays():
+
+    trial = {
+        "type" : "trial",
+        "nAttenuators" : 2,
+        "nAverages" : 1,
+        "startFrequency" : 2e8,
+        "stopFrequency" : 4e8,
+        "period" : 1,
+        "histogram" : [[1] * 50, [2] * 50],
+        "chirp" : [[0, 32768, 65535, 16384], [1, 2, 3, 4]]
+    }
+
+    results = apreshttp.Radar.Results(JSONResponse(trial))
+
+    # Chirp and histogram should be (nAttenuators, nSamples) arrays
+    assert isinstance(results.chirp, numpy.ndarray)
+    assert results.chirp.shape == (2, 4)
+    assert results.histogram.shape == (2, 50)
+    assert results.chirp.dtype == numpy.float64
+
+    # Values should match the original per-sample scaling
+    for at in range(len(trial["chirp"])):
+        for i, v in enumerate(trial["chirp"][at]):
+            assert results.chirp[at][i] == pytest.approx(v / 65536 * 2.5)
+
+    results = apreshttp.Radar.Results(JSONResponse(trial), numpy.float32)
+    assert results.chirp.dtype == numpy.float32
+
+    with pytest.raises(ValueError):
+        apreshttp.Radar.Results(JSONResponse(trial), numpy.int32)
+
+    # Radar decodes the body with the API decoder
+    api = apreshttp.API(API_ROOT)
+    decoded = []
+    api.jsonDecoder = lambda body: decoded.append(len(body)) or json.loads(body)
+    response = JSONResponse(trial)
+    response.json = None
+    assert api.radar.readResults(response).chirp.shape == (2, 4)
+    assert len(decoded) == 1
+
+    trial["chirp"] = [[0, 1], [0]]
+    with pytest.raises(apreshttp.BadResponseException):
+        apreshttp.Radar.Results(JSONResponse(trial))
+
+def test_radar_polling_strategy():
+
+    fixed = apreshttp.PollingStrategy(interval = 2)
+    assert fixed.interval(10, 0) == 2
+    assert fixed.timeout(10, 30) == 50
+
+    adaptive = apreshttp.AdaptivePolling(chirpDuration = 1, minInterval = 0.1, maxInterval = 10, fraction = 0.5)
+
+    # Sparse at the start of a long burst, dense near the expected end
+    assert adaptive.interval(100, 0) == 10
+    assert adaptive.interval(100, 60) > adaptive.interval(100, 95)
+    assert adaptive.interval(100, 99.9) == 0.1
+
+    # Progress from the radar refines the estimate (2 s per chirp)
+    assert adaptive.estimate(100, 20, 10) == pytest.approx(200)
+    assert adaptive.interval(100, 190, 95) == pytest.approx(5)
+
+    # Back off once the results are overdue
+    assert adaptive.interval(10, 14) == pytest.approx(2)
+
+    with pytest.raises(ValueError):
+        apreshttp.AdaptivePolling(minInterval = 0)
+
+    # Expected chirps depend on the type of burst started
+    api = apreshttp.API(API_ROOT)
+    api.radar.config.readResponse(JSONResponse({
+        "nSubBursts" : 10, "nAttenuators" : 2, "nAverages" : 3,
+        "rfAttn" : [0, 0], "afGain" : [-14, -14], "userData" : "",
+        "txAntenna" : [1, 1, 0, 0, 0, 0, 0, 0],
+        "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0]
+    }))
+    api.radar.burstType = "trial"
+    assert api.radar.expectedChirps() == 2 * 3 * 2
+    api.radar.burstType = "burst"
+    assert api.radar.expectedChirps() == 2 * 10 * 2
+
+    # The fixed resultsInterval is used unless a strategy is set
+    assert api.pollingStrategy == None
+    api.resultsInterval = 7
+    assert api.radar.pollInterval(10, 0, JSONResponse({"status" : "chirping"})) == 7
+
+    # Progress is reported in chirps for trial bursts and in
+    # sub-bursts for full bursts
+    progress = []
+    class RecordingPolling(apreshttp.PollingStrategy):
+        def interval(self, nChirps, elapsed, chirpNumber = None):
+            progress.append(chirpNumber)
+            return 0
+    api.pollingStrategy = RecordingPolling()
+    response = JSONResponse({"status" : "chirping", "chirpNumber" : 3})
+    api.radar.burstType = "trial"
+    api.radar.pollInterval(api.radar.expectedChirps(), 1, response)
+    api.radar.burstType = "burst"
+    api.radar.pollInterval(api.radar.expectedChirps(), 1, response)
+    api.radar.burstType = None
+    api.radar.pollInterval(api.radar.expectedChirps(), 1, response)
+    assert progress == [3, 3 * 4, None]
+
+def test_radar_config_cache():
+
+    api = apreshttp.API(API_ROOT)
+    config = api.radar.config
+    assert not config.isFresh(5)
+
+    config.readResponse(JSONResponse({
+        "nSubBursts" : 10, "nAttenuators" : 1, "nAverages" : 3,
+        "rfAttn" : [0], "afGain" : [-14], "userData" : "",
+        "txAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+        "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0]
+    }))
+
+    # A fresh cache is returned without a request
+    assert config.isFresh(5)
+    assert config.get(maxAge = math.inf) is config
+    assert not config.isFresh(0)
+
+    config.invalidate()
+    assert not config.isFresh(math.inf)
+
+    # The cache is opt-in
+    config.readResponse(JSONResponse({
+        "nSubBursts" : 10, "nAttenuators" : 1, "nAverages" : 3,
+        "rfAttn" : [0], "afGain" : [-14], "userData" : "",
+        "txAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+        "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0]
+    }))
+    assert api.configCacheTTL == 0
+    assert not config.isFresh(api.configCacheTTL)
+
+def test_radar_config_set_diff():
+
+    api = apreshttp.API(API_ROOT)
+    api.configCacheTTL = math.inf
+    config = api.radar.config
+    config.readResponse(JSONResponse({
+        "nSubBursts" : 10, "nAttenuators" : 2, "nAverages" : 3,
+        "rfAttn" : [0, 10], "afGain" : [-14, -14], "userData" : "",
+        "txAntenna" : [1, 0, 0, 0, 0, 0, 0, 0],
+        "rxAntenna" : [1, 0, 0, 0, 0, 0, 0, 0]
+    }))
+
+    # Reasserting the current config makes no request
+    assert config.set(
+        nAtts = 2, nBursts = 10, rfAttnSet = [0, 10], afGainSet = [-14, -14],
+        txAnt = (1, 0, 0, 0, 0, 0, 0, 0), userData = ""
+    ) is config
+
+    # Only changed values are sent
+    data_obj, valid_rf, valid_af = config.setData(nAtts = 2, rfAttnSet = [0, 12])
+    assert config.changedFields(data_obj) == {"rfAttn2" : 12}
+
+    # All attenuator values are sent when nAttenuators changes
+    data_obj, valid_rf, valid_af = config.setData(nAtts = 3, rfAttnSet = [0, 10, 3])
+    assert config.changedFields(data_obj) == {
+        "nAttenuators" : 3, "rfAttn1" : 0, "rfAttn2" : 10, "rfAttn3" : 3
+    }
+
 def test_radar_trial_burst():
 
     # Create an API instance
@@ -169,6 +334,17 @@ def test_radar_trial_burst_callback():
 
     # tcallback.plot()
 
+class JSONResponse:
+    """Minimal stand-in for a response carrying a JSON body"""
+
+    def __init__(self, body):
+        self.body = body
+        self.text = str(body)
+        self.content = json.dumps(body).encode("utf-8")
+
+    def json(self):
+        return self.body
+
 class TestCallback:
 
     def __init__(self):
@@ -36,6 +36,53 @@ def test_apichild_object():
     TEST_URL = "system/housekeeping/status"
     assert apiChild.formCompleteURL(TEST_URL) == (API_ROOT + "/api/" + TEST_URL)
 
+def test_api_transport():
+
+    # Check that a default transport is created and shared by children
+    api = apreshttp.API(API_ROOT)
+    assert isinstance(api.transport, apreshttp.Transport)
+    assert api.system.api.transport is api.transport
+    assert api.system.housekeeping.config.api.transport is api.transport
+    assert api.radar.config.api.transport is api.transport
+
+    # Check pool settings are applied to the mounted adapter
+    transport = apreshttp.Transport(poolConnections = 2, poolMaxSize = 8)
+    api = apreshttp.API(API_ROOT, transport)
+    adapter = api.transport.session.get_adapter(API_ROOT)
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 8
+
+    # Closing releases the session, which is reopened on demand
+    with api:
+        pass
+    assert api.transport.session == None
+    api.transport.open()
+    assert api.transport.session != None
+    api.close()
+
+    with pytest.raises(ValueError):
+        apreshttp.Transport(poolMaxSize = 0)
+
+    with pytest.raises(TypeError):
+        apreshttp.API(API_ROOT, transport = "invalid")
+
+def test_async_api_object():
+
+    pytest.importorskip("aiohttp")
+
+    # Check the asyncio API mirrors the API hierarchy
+    api = apreshttp.AsyncAPI(API_ROOT[7:])
+    assert api.root == API_ROOT
+    assert isinstance(api.transport, apreshttp.AsyncTransport)
+    assert isinstance(api.system, apreshttp.System)
+    assert isinstance(api.system.housekeeping, apreshttp.AsyncSystem.Housekeeping)
+    assert isinstance(api.radar.config, apreshttp.AsyncRadar.Config)
+    assert isinstance(api.data, apreshttp.AsyncData)
+    assert api.data.formCompleteURL("data") == API_ROOT + "/api/data"
+
+    with pytest.raises(TypeError):
+        apreshttp.AsyncAPI(API_ROOT, transport = apreshttp.Transport())
+
 def test_system_reset():
 
     # Create API instance